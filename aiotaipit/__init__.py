@@ -8,35 +8,153 @@ try:
 except PackageNotFoundError:
     __version__ = "unknown"
 
+from .aggregate import ReadingColumns, TaipitConsumptionAggregator
+from .anomaly import AnomalyType, TaipitAnomaly, TaipitAnomalyDetector
 from .api import TaipitApi
+from .backfill import TaipitBackfill, TaipitBackfillProgress
 from .auth import AbstractTaipitAuth, SimpleTaipitAuth
+from .breaker import CircuitState, TaipitCircuitBreaker
+from .cache import TaipitReadCache
+from .clock import TaipitServerClock
+from .collector import TaipitShardedCollector, shard_meter_ids
+from .const import PRIORITY_BULK, PRIORITY_INTERACTIVE
+from .dispatcher import TaipitPriorityDispatcher, taipit_priority
+from .enrich import TaipitEnrichedMeter, TaipitEnricher
 from .exceptions import (
     TaipitApiError,
     TaipitAuthError,
     TaipitAuthInvalidClient,
     TaipitAuthInvalidGrant,
+    TaipitCircuitOpenError,
+    TaipitDeadlineExceeded,
     TaipitError,
     TaipitInvalidTokenResponse,
+    TaipitTimeoutError,
     TaipitTokenAcquireFailed,
     TaipitTokenError,
     TaipitTokenRefreshFailed,
 )
-from .helpers import get_model_name, get_region_name
+from .export import (
+    AbstractExportWriter,
+    CsvExportWriter,
+    NdjsonExportWriter,
+    ParquetExportWriter,
+    async_export_meters,
+    async_export_readings,
+)
+from .hedging import TaipitHedgingPolicy
+from .helpers import (
+    async_merge_settings,
+    get_model_ids,
+    get_model_name,
+    get_model_names,
+    get_region_id,
+    get_region_name,
+    get_region_names,
+    merge_settings,
+)
+from .hub import (
+    MeterEventType,
+    OverflowPolicy,
+    TaipitMeterEvent,
+    TaipitMeterHub,
+    TaipitSubscription,
+)
+from .incremental import (
+    AbstractReadingsStore,
+    MemoryReadingsStore,
+    TaipitIncrementalReadings,
+)
+from .limiter import TaipitAdaptiveLimiter
+from .payload import TaipitPayloadLogger
+from .reference import TaipitReferenceData
+from .registry import TaipitMeterRegistry
+from .server import TaipitServer, async_serve
+from .sync import TaipitSyncApi
+from .timeouts import get_remaining_time, taipit_deadline
+from .transport import (
+    AbstractTaipitTransport,
+    AiohttpTransport,
+    HttpxTransport,
+    MemoryTransport,
+    RecordingTransport,
+    ReplayTransport,
+    TaipitResponse,
+)
 
 __all__ = [
+    "AbstractExportWriter",
+    "AbstractReadingsStore",
     "AbstractTaipitAuth",
+    "AbstractTaipitTransport",
+    "AiohttpTransport",
+    "AnomalyType",
+    "CircuitState",
+    "CsvExportWriter",
+    "HttpxTransport",
+    "MemoryReadingsStore",
+    "MemoryTransport",
+    "MeterEventType",
+    "NdjsonExportWriter",
+    "OverflowPolicy",
+    "PRIORITY_BULK",
+    "PRIORITY_INTERACTIVE",
+    "ParquetExportWriter",
+    "ReadingColumns",
+    "RecordingTransport",
+    "ReplayTransport",
     "SimpleTaipitAuth",
+    "TaipitAdaptiveLimiter",
+    "TaipitAnomaly",
+    "TaipitAnomalyDetector",
     "TaipitApi",
     "TaipitApiError",
     "TaipitAuthError",
     "TaipitAuthInvalidClient",
     "TaipitAuthInvalidGrant",
+    "TaipitBackfill",
+    "TaipitBackfillProgress",
+    "TaipitCircuitBreaker",
+    "TaipitCircuitOpenError",
+    "TaipitConsumptionAggregator",
+    "TaipitDeadlineExceeded",
+    "TaipitEnrichedMeter",
+    "TaipitEnricher",
     "TaipitError",
+    "TaipitHedgingPolicy",
+    "TaipitIncrementalReadings",
     "TaipitInvalidTokenResponse",
+    "TaipitMeterEvent",
+    "TaipitMeterHub",
+    "TaipitMeterRegistry",
+    "TaipitPayloadLogger",
+    "TaipitPriorityDispatcher",
+    "TaipitReadCache",
+    "TaipitReferenceData",
+    "TaipitResponse",
+    "TaipitServer",
+    "TaipitServerClock",
+    "TaipitShardedCollector",
+    "TaipitSubscription",
+    "TaipitSyncApi",
+    "TaipitTimeoutError",
     "TaipitTokenAcquireFailed",
     "TaipitTokenError",
     "TaipitTokenRefreshFailed",
     "__version__",
+    "async_export_meters",
+    "async_export_readings",
+    "async_merge_settings",
+    "async_serve",
+    "get_model_ids",
     "get_model_name",
+    "get_model_names",
+    "get_remaining_time",
+    "get_region_id",
     "get_region_name",
+    "get_region_names",
+    "merge_settings",
+    "shard_meter_ids",
+    "taipit_deadline",
+    "taipit_priority",
 ]
@@ -0,0 +1,230 @@
+"""Incremental consumption aggregation over meter readings."""
+from __future__ import annotations
+
+import datetime
+import math
+from array import array
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from .const import (
+    CONF_DATE,
+    CONF_ECOMETER_DATA,
+    CONF_ID,
+    CONF_LAST_READING,
+    ENERGY_FIELDS,
+)
+from .helpers import get_region_name
+
+_NAN = math.nan
+
+
+def _to_float(value: Any) -> float:
+    """Convert a reading value to float, NaN if missing."""
+    if value is None:
+        return _NAN
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return _NAN
+
+
+class ReadingColumns:
+    """Cumulative energy readings of many meters in columnar form.
+
+    `days` holds proleptic Gregorian ordinals; `values` holds one column per
+    field of `ENERGY_FIELDS`, NaN where the field is missing.
+    """
+
+    __slots__ = ("meter_ids", "days", "values", "_day_cache")
+
+    def __init__(self) -> None:
+        """Initialize empty columns."""
+        self.meter_ids = array("q")
+        self.days = array("l")
+        self.values: tuple[array[float], ...] = tuple(
+            array("d") for _ in ENERGY_FIELDS
+        )
+        self._day_cache: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        """Return the number of readings."""
+        return len(self.meter_ids)
+
+    def append(self, meter_id: int, day: int, values: Sequence[float]) -> None:
+        """Append one reading."""
+        self.meter_ids.append(meter_id)
+        self.days.append(day)
+        for column, value in zip(self.values, values):
+            column.append(value)
+
+    def _day(self, value: Any) -> int:
+        """Return the day ordinal of a reading date ("YYYY-MM-DD...")."""
+        key = str(value)[:10]
+        day = self._day_cache.get(key)
+        if day is None:
+            day = datetime.date.fromisoformat(key).toordinal()
+            self._day_cache[key] = day
+        return day
+
+    def extend_readings(
+        self, meter_id: int, readings: Iterable[dict[str, Any]]
+    ) -> None:
+        """Append readings of one meter (e.g. `readings` of `bmd/all`)."""
+        for reading in readings:
+            self.append(
+                meter_id,
+                self._day(reading[CONF_DATE]),
+                [_to_float(reading.get(field)) for field in ENERGY_FIELDS],
+            )
+
+
+class _MeterState:
+    """Last cumulative values and totals of one meter."""
+
+    __slots__ = ("last_day", "last", "totals", "daily", "region_id")
+
+    def __init__(self) -> None:
+        self.last_day = 0
+        self.last = [_NAN] * len(ENERGY_FIELDS)
+        self.totals = [0.0] * len(ENERGY_FIELDS)
+        self.daily: dict[int, list[float]] = {}
+        self.region_id: int | None = None
+
+
+class TaipitConsumptionAggregator:
+    """Per-day, per-tariff and per-region consumption from cumulative readings.
+
+    Each batch is processed in one pass and only updates the aggregates:
+    consumption is the difference to the last known reading of the meter,
+    so history is never recomputed. Readings older than the last processed
+    day of the meter are ignored. A decreasing counter is treated as a
+    reset: it contributes no consumption and becomes the new baseline.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty aggregates."""
+        self._meters: dict[int, _MeterState] = {}
+        self._regions: dict[int | None, list[float]] = {}
+        self.skipped = 0
+
+    def _state(self, meter_id: int) -> _MeterState:
+        """Return the state of the meter, creating it if needed."""
+        state = self._meters.get(meter_id)
+        if state is None:
+            state = self._meters[meter_id] = _MeterState()
+        return state
+
+    def set_meter_region(self, meter_id: int, region_id: int | None) -> None:
+        """Assign the meter to a region for regional rollups."""
+        self._state(meter_id).region_id = region_id
+
+    def update(self, columns: ReadingColumns) -> None:
+        """Add a batch of readings sorted by date within each meter."""
+        regions = self._regions
+        meter_ids = columns.meter_ids
+        days = columns.days
+        values = columns.values
+        fields = range(len(values))
+        state = _MeterState()
+        state_id: int | None = None
+        region: list[float] = []
+        for i in range(len(meter_ids)):
+            meter_id = meter_ids[i]
+            if meter_id != state_id:
+                state = self._state(meter_id)
+                state_id = meter_id
+                region = regions.get(state.region_id)
+                if region is None:
+                    region = regions[state.region_id] = [0.0] * len(values)
+            day = days[i]
+            if day < state.last_day:
+                self.skipped += 1
+                continue
+            state.last_day = day
+            daily = state.daily.get(day)
+            if daily is None:
+                daily = state.daily[day] = [0.0] * len(values)
+            last = state.last
+            totals = state.totals
+            for k in fields:
+                value = values[k][i]
+                if value != value:
+                    continue
+                previous = last[k]
+                last[k] = value
+                if previous != previous or value < previous:
+                    continue
+                delta = value - previous
+                daily[k] += delta
+                totals[k] += delta
+                region[k] += delta
+
+    def update_readings(
+        self, meter_id: int, readings: Iterable[dict[str, Any]]
+    ) -> None:
+        """Add readings of one meter (e.g. `readings` of `bmd/all`)."""
+        columns = ReadingColumns()
+        columns.extend_readings(
+            meter_id, sorted(readings, key=lambda reading: str(reading[CONF_DATE]))
+        )
+        self.update(columns)
+
+    def update_meters(
+        self,
+        meters: Iterable[dict[str, Any]],
+        day: datetime.date | None = None,
+    ) -> None:
+        """Add last readings from `async_get_meters()`.
+
+        The reading date is used if present, otherwise `day` (today).
+        """
+        columns = ReadingColumns()
+        default_day = (day or datetime.date.today()).toordinal()
+        for meter in meters:
+            reading = (meter.get(CONF_ECOMETER_DATA) or {}).get(CONF_LAST_READING)
+            if not reading:
+                continue
+            columns.append(
+                meter[CONF_ID],
+                columns._day(reading[CONF_DATE])
+                if reading.get(CONF_DATE)
+                else default_day,
+                [_to_float(reading.get(field)) for field in ENERGY_FIELDS],
+            )
+        self.update(columns)
+
+    def get_daily(self, meter_id: int) -> dict[datetime.date, dict[str, float]]:
+        """Return per-day consumption of the meter."""
+        state = self._meters.get(meter_id)
+        if state is None:
+            return {}
+        return {
+            datetime.date.fromordinal(day): dict(zip(ENERGY_FIELDS, daily))
+            for day, daily in sorted(state.daily.items())
+        }
+
+    def get_tariff_totals(self, meter_id: int | None = None) -> dict[str, float]:
+        """Return total consumption per tariff of a meter or of all meters."""
+        if meter_id is not None:
+            state = self._meters.get(meter_id)
+            if state is None:
+                return dict.fromkeys(ENERGY_FIELDS, 0.0)
+            return dict(zip(ENERGY_FIELDS, state.totals))
+        result = [0.0] * len(ENERGY_FIELDS)
+        for region in self._regions.values():
+            for k, value in enumerate(region):
+                result[k] += value
+        return dict(zip(ENERGY_FIELDS, result))
+
+    def get_region_totals(self) -> dict[str | None, dict[str, float]]:
+        """Return consumption per tariff for each region name.
+
+        Meters without a region are reported under None.
+        """
+        return {
+            get_region_name(region_id) if region_id is not None else None: dict(
+                zip(ENERGY_FIELDS, totals)
+            )
+            for region_id, totals in self._regions.items()
+        }
@@ -0,0 +1,214 @@
+"""Streaming anomaly and gap detection over meter readings."""
+from __future__ import annotations
+
+import datetime
+import math
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any
+
+from .const import (
+    ANOMALY_EWMA_ALPHA,
+    ANOMALY_GAP_SEC,
+    ANOMALY_MIN_SAMPLES,
+    ANOMALY_SPIKE_FACTOR,
+    CONF_DATE,
+    CONF_ECOMETER_DATA,
+    CONF_ENERGY_A,
+    CONF_ID,
+    CONF_LAST_READING,
+)
+
+
+def parse_reading_time(value: Any) -> float:
+    """Return a reading date ("YYYY-MM-DD[ HH:MM:SS]") as UTC timestamp."""
+    moment = datetime.datetime.fromisoformat(str(value))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=datetime.UTC)
+    return moment.timestamp()
+
+
+class AnomalyType(StrEnum):
+    """Type of detected anomaly."""
+
+    GAP = "gap"
+    STOPPED = "stopped"
+    RESET = "reset"
+    SPIKE = "spike"
+
+
+@dataclass(frozen=True, slots=True)
+class TaipitAnomaly:
+    """Detected anomaly of a meter."""
+
+    meter_id: int
+    type: AnomalyType
+    timestamp: float
+    value: float | None = None
+    expected: float | None = None
+
+
+class _MeterTrack:
+    """Constant-size state of one meter."""
+
+    __slots__ = ("last_value", "last_ts", "rate", "rate_var", "samples", "stopped")
+
+    def __init__(self, value: float, timestamp: float) -> None:
+        self.last_value = value
+        self.last_ts = timestamp
+        self.rate = 0.0
+        self.rate_var = 0.0
+        self.samples = 0
+        self.stopped = False
+
+
+class TaipitAnomalyDetector:
+    """Detect gaps, counter resets and consumption spikes as readings arrive.
+
+    Per meter only the last value and timestamp and the EWMA (and variance)
+    of the consumption rate are kept, so each reading costs O(1):
+
+    - `gap`: a reading arrives more than `gap_sec` after the previous one;
+    - `stopped`: `check_stopped()` found no readings for `gap_sec`;
+    - `reset`: the cumulative counter decreased;
+    - `spike`: the rate since the previous reading exceeds the EWMA by
+      more than `spike_factor` standard deviations (after `min_samples`).
+    """
+
+    def __init__(
+        self,
+        *,
+        field: str = CONF_ENERGY_A,
+        gap_sec: float = ANOMALY_GAP_SEC,
+        alpha: float = ANOMALY_EWMA_ALPHA,
+        spike_factor: float = ANOMALY_SPIKE_FACTOR,
+        min_samples: int = ANOMALY_MIN_SAMPLES,
+    ) -> None:
+        """Initialize the detector."""
+        self._field = field
+        self._gap_sec = gap_sec
+        self._alpha = alpha
+        self._spike_factor = spike_factor
+        self._min_samples = min_samples
+        self._tracks: dict[int, _MeterTrack] = {}
+
+    def add_reading(
+        self, meter_id: int, timestamp: float, value: float
+    ) -> list[TaipitAnomaly]:
+        """Process one cumulative reading, return detected anomalies."""
+        track = self._tracks.get(meter_id)
+        if track is None:
+            self._tracks[meter_id] = _MeterTrack(value, timestamp)
+            return []
+        elapsed = timestamp - track.last_ts
+        if elapsed <= 0:
+            return []
+
+        events: list[TaipitAnomaly] = []
+        track.stopped = False
+        if elapsed > self._gap_sec:
+            events.append(
+                TaipitAnomaly(meter_id, AnomalyType.GAP, timestamp, value, elapsed)
+            )
+        if value < track.last_value:
+            events.append(
+                TaipitAnomaly(
+                    meter_id, AnomalyType.RESET, timestamp, value, track.last_value
+                )
+            )
+        else:
+            rate = (value - track.last_value) / elapsed
+            if track.samples >= self._min_samples:
+                std = max(math.sqrt(track.rate_var), abs(track.rate) * 0.1)
+                if rate - track.rate > self._spike_factor * std:
+                    events.append(
+                        TaipitAnomaly(
+                            meter_id,
+                            AnomalyType.SPIKE,
+                            timestamp,
+                            value,
+                            track.last_value + track.rate * elapsed,
+                        )
+                    )
+            if track.samples:
+                diff = rate - track.rate
+                increment = self._alpha * diff
+                track.rate += increment
+                track.rate_var = (1 - self._alpha) * (track.rate_var + diff * increment)
+            else:
+                track.rate = rate
+            track.samples += 1
+
+        track.last_value = value
+        track.last_ts = timestamp
+        return events
+
+    def add_readings(
+        self, meter_id: int, readings: Iterable[dict[str, Any]]
+    ) -> list[TaipitAnomaly]:
+        """Process readings of one meter (e.g. `readings` of `bmd/all`)."""
+        events: list[TaipitAnomaly] = []
+        points = sorted(
+            (parse_reading_time(reading[CONF_DATE]), float(reading[self._field]))
+            for reading in readings
+            if reading.get(self._field) is not None
+        )
+        for timestamp, value in points:
+            events.extend(self.add_reading(meter_id, timestamp, value))
+        return events
+
+    def add_meters(
+        self, meters: Iterable[dict[str, Any]], timestamp: float | None = None
+    ) -> list[TaipitAnomaly]:
+        """Process last readings from `async_get_meters()`.
+
+        The reading date is used if present, otherwise `timestamp` (now).
+        An undated reading equal to the last value is the same reading seen
+        again and is ignored, so idle polls neither refresh the meter for
+        `check_stopped()` nor add zero-rate samples.
+        """
+        now = time.time() if timestamp is None else timestamp
+        events: list[TaipitAnomaly] = []
+        for meter in meters:
+            reading = (meter.get(CONF_ECOMETER_DATA) or {}).get(CONF_LAST_READING)
+            if not reading or reading.get(self._field) is None:
+                continue
+            value = float(reading[self._field])
+            if reading.get(CONF_DATE):
+                reading_ts = parse_reading_time(reading[CONF_DATE])
+            else:
+                track = self._tracks.get(meter[CONF_ID])
+                if track is not None and track.last_value == value:
+                    continue
+                reading_ts = now
+            events.extend(self.add_reading(meter[CONF_ID], reading_ts, value))
+        return events
+
+    def backfill(
+        self, history: Iterable[tuple[int, Iterable[dict[str, Any]]]]
+    ) -> list[TaipitAnomaly]:
+        """Feed stored history as (meter_id, readings) pairs."""
+        events: list[TaipitAnomaly] = []
+        for meter_id, readings in history:
+            events.extend(self.add_readings(meter_id, readings))
+        return events
+
+    def check_stopped(self, now: float | None = None) -> list[TaipitAnomaly]:
+        """Report meters without readings for `gap_sec`, once per outage."""
+        now = time.time() if now is None else now
+        events: list[TaipitAnomaly] = []
+        for meter_id, track in self._tracks.items():
+            if not track.stopped and now - track.last_ts > self._gap_sec:
+                track.stopped = True
+                events.append(
+                    TaipitAnomaly(
+                        meter_id,
+                        AnomalyType.STOPPED,
+                        now,
+                        track.last_value,
+                        now - track.last_ts,
+                    )
+                )
+        return events
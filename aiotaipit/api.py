@@ -1,9 +1,12 @@
 """Taipit API wrapper."""
 from __future__ import annotations
 
+import asyncio
+import time
 from typing import Any
 
 from .auth import AbstractTaipitAuth
+from .cache import TaipitReadCache, make_key
 from .const import (
     DEFAULT_API_URL,
     GET_ENTRIES,
@@ -11,28 +14,74 @@ from .const import (
     PARAM_ID,
     PARAM_SECTIONS,
     SECTIONS_ALL,
+    SETTINGS_CACHE_TTL,
+    WARM_UP_CONNECTIONS,
 )
+from .exceptions import TaipitApiError
+from .helpers import merge_settings
+from .transport import TaipitResponse
+
+_MISSING: Any = object()
 
 
 class TaipitApi:
-    """Class to communicate with the Taipit API."""
+    """Class to communicate with the Taipit API.
+
+    With `cache` set, `async_get()` reads are served from the
+    stale-while-revalidate `TaipitReadCache`. Settings are cached per
+    section for `settings_ttl` seconds (0 disables it).
+    """
 
     def __init__(
         self,
         auth: AbstractTaipitAuth,
         *,
         api_url: str = DEFAULT_API_URL,
+        cache: TaipitReadCache | None = None,
+        settings_ttl: float = SETTINGS_CACHE_TTL,
     ) -> None:
         """Initialize the API and store the auth."""
         self._auth = auth
         self._api_url = api_url
+        self._cache = cache
+        self._settings_ttl = settings_ttl
+        self._settings: dict[str, tuple[float, Any]] = {}
+        self._settings_inflight: dict[str, asyncio.Future[Any]] = {}
 
     async def async_get(
         self, url: str, **kwargs: Any
     ) -> dict[str, Any] | list[dict[str, Any]]:
         """Make async get request to api endpoint."""
+        if self._cache is not None:
+            return await self._cache.async_get(
+                make_key(url, kwargs.get("params")),
+                lambda: self._auth.request("GET", f"{self._api_url}/{url}", **kwargs),
+            )
         return await self._auth.request("GET", f"{self._api_url}/{url}", **kwargs)
 
+    async def async_get_raw(self, url: str, **kwargs: Any) -> TaipitResponse:
+        """Make async get request to api endpoint, return the raw response."""
+        return await self._auth.request_raw(
+            "GET", f"{self._api_url}/{url}", **kwargs
+        )
+
+    async def async_warm_up(
+        self, connections: int = WARM_UP_CONNECTIONS
+    ) -> dict[str, Any]:
+        """Prepare the client to serve requests at full speed.
+
+        Gets a valid token, opens `connections` keep-alive connections and
+        prefetches settings (merged into the reference lookups) and meters,
+        all concurrently. Return the prefetched `settings` and `meters`.
+        """
+        _, settings, meters = await asyncio.gather(
+            self._auth.async_warm_up(connections),
+            self.async_get_settings(),
+            self.async_get_meters(),
+        )
+        merge_settings(settings)
+        return {"settings": settings, "meters": meters}
+
     async def async_get_meters(self) -> list[dict[str, Any]]:
         """Get all meters and short info."""
         return await self.async_get("meter/list-all")
@@ -64,12 +113,77 @@ class TaipitApi:
         )
 
     async def async_get_settings(
-        self, sections: tuple[str, ...] = SECTIONS_ALL
+        self, sections: tuple[str, ...] = SECTIONS_ALL, *, refresh: bool = False
     ) -> dict[str, Any]:
-        """Get settings."""
-        return await self.async_get(
-            "config/settings", params={PARAM_SECTIONS: ",".join(sections)}
-        )
+        """Get settings.
+
+        Sections are cached separately, so only the sections missing from
+        the cache (or all with `refresh`) are fetched, in one request.
+        Sections absent from the response are left out of the result.
+        """
+        now = time.monotonic()
+        result: dict[str, Any] = {}
+        pending: dict[str, asyncio.Future[Any]] = {}
+        missing: list[str] = []
+        for section in dict.fromkeys(sections):
+            cached = self._settings.get(section)
+            if not refresh and cached is not None and cached[0] > now:
+                result[section] = cached[1]
+            elif not refresh and section in self._settings_inflight:
+                pending[section] = self._settings_inflight[section]
+            else:
+                missing.append(section)
+
+        if missing:
+            fetched = await self._async_fetch_settings(missing)
+            result.update(fetched)
+        for section, future in pending.items():
+            value = await asyncio.shield(future)
+            if value is not _MISSING:
+                result[section] = value
+        return {section: result[section] for section in sections if section in result}
+
+    async def _async_fetch_settings(self, sections: list[str]) -> dict[str, Any]:
+        """Fetch settings sections in one request and cache them.
+
+        The request bypasses the read cache, so `refresh` always reaches the
+        network.
+        """
+        loop = asyncio.get_running_loop()
+        futures = {section: loop.create_future() for section in sections}
+        self._settings_inflight.update(futures)
+        try:
+            settings = await self._auth.request(
+                "GET",
+                f"{self._api_url}/config/settings",
+                params={PARAM_SECTIONS: ",".join(sections)},
+            )
+            if not isinstance(settings, dict):
+                raise TaipitApiError(
+                    f"Invalid settings response: {type(settings).__name__}"
+                )
+        except BaseException as err:
+            for future in futures.values():
+                if isinstance(err, Exception):
+                    future.set_exception(err)
+                    future.exception()
+                else:
+                    future.cancel()
+            raise
+        finally:
+            for section, future in futures.items():
+                if self._settings_inflight.get(section) is future:
+                    del self._settings_inflight[section]
+
+        expires_at = time.monotonic() + self._settings_ttl
+        for section, future in futures.items():
+            if section in settings:
+                if self._settings_ttl > 0:
+                    self._settings[section] = (expires_at, settings[section])
+                future.set_result(settings[section])
+            else:
+                future.set_result(_MISSING)
+        return settings
 
     async def async_get_tariff(self, meter_id: int) -> dict[str, Any]:
         """Get tariff for meter. Available only for meter owner."""
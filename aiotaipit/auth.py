@@ -4,11 +4,14 @@ from __future__ import annotations
 import asyncio
 import time
 from abc import ABC, abstractmethod
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
+from contextlib import nullcontext
 from typing import Any
 
-from aiohttp import ClientError, ClientSession
+from aiohttp import ClientError, ClientSession, ClientTimeout
 
+from .breaker import TaipitCircuitBreaker
+from .clock import TaipitServerClock
 from .const import (
     CLOCK_OUT_OF_SYNC_MAX_SEC,
     DEFAULT_BASE_URL,
@@ -16,17 +19,37 @@ from .const import (
     DEFAULT_CLIENT_SECRET,
     DEFAULT_TOKEN_URL,
     LOGGER,
+    TOKEN_EXPIRY_MARGIN_SEC,
     TOKEN_REQUIRED_FIELDS,
+    WARM_UP_CONNECTIONS,
 )
+from .dispatcher import TaipitPriorityDispatcher
 from .exceptions import (
     TaipitApiError,
     TaipitAuthError,
     TaipitAuthInvalidClient,
     TaipitAuthInvalidGrant,
+    TaipitCircuitOpenError,
+    TaipitDeadlineExceeded,
     TaipitInvalidTokenResponse,
+    TaipitTimeoutError,
     TaipitTokenAcquireFailed,
     TaipitTokenRefreshFailed,
 )
+from .hedging import TaipitHedgingPolicy
+from .payload import TaipitPayloadLogger
+from .timeouts import (
+    async_within_deadline,
+    check_deadline,
+    limit_timeout,
+    select_timeout,
+)
+from .transport import (
+    AbstractTaipitTransport,
+    AiohttpTransport,
+    TaipitResponse,
+    raise_for_status,
+)
 
 
 class AbstractTaipitAuth(ABC):
@@ -34,41 +57,150 @@ class AbstractTaipitAuth(ABC):
 
     def __init__(
         self,
-        session: ClientSession,
+        session: ClientSession | None,
         *,
         base_url: str = DEFAULT_BASE_URL,
+        timeout: ClientTimeout | None = None,
+        endpoint_timeouts: Mapping[str, ClientTimeout] | None = None,
+        circuit_breaker: TaipitCircuitBreaker | None = None,
+        dispatcher: TaipitPriorityDispatcher | None = None,
+        payload_logger: TaipitPayloadLogger | None = None,
+        transport: AbstractTaipitTransport | None = None,
+        hedging: TaipitHedgingPolicy | None = None,
+        clock: TaipitServerClock | None = None,
     ) -> None:
-        """Initialize the auth."""
-        self._session = session
+        """Initialize the auth.
+
+        `timeout` is used for all requests, `endpoint_timeouts` overrides it
+        for URLs starting with the given prefix (e.g. "api/bmd/all").
+        Without them the session timeout applies. With `dispatcher`,
+        requests wait for a slot of their priority class. `payload_logger`
+        controls debug logging of responses. Requests are sent through
+        `transport`, by default an `AiohttpTransport` over `session`.
+        With `hedging`, slow GET requests are duplicated. `clock` tracks
+        the server clock offset from response `Date` headers.
+        """
+        if transport is None:
+            if session is None:
+                raise ValueError("Either session or transport is required")
+            transport = AiohttpTransport(session)
+        self._transport = transport
         self._base_url = base_url
+        self._timeout = timeout
+        self._endpoint_timeouts = dict(endpoint_timeouts or {})
+        self._circuit_breaker = circuit_breaker
+        self._dispatcher = dispatcher
+        self._payload_logger = payload_logger or TaipitPayloadLogger()
+        self._hedging = hedging
+        self._clock = clock or TaipitServerClock()
+        # Monotonic expiry of the token from our own token request
+        self._token_deadline: tuple[dict[str, Any], float] | None = None
+
+    @staticmethod
+    def _guard(breaker: TaipitCircuitBreaker | None) -> Any:
+        """Return the circuit breaker guard, or a no-op context."""
+        return breaker.async_guard() if breaker is not None else nullcontext()
+
+    def _slot(self, priority: str | None) -> Any:
+        """Return the dispatcher slot, or a no-op context."""
+        if self._dispatcher is None:
+            return nullcontext()
+        return self._dispatcher.async_slot(priority)
+
+    def _get_timeout(self, url: str) -> ClientTimeout | None:
+        """Return the timeout for the URL, limited by the current deadline."""
+        return limit_timeout(
+            select_timeout(url, self._timeout, self._endpoint_timeouts)
+        )
+
+    def _is_expired_token(self, token: dict[str, Any]) -> bool:
+        """Check if token is expired.
+
+        A token from our own token request expires by the monotonic clock,
+        a saved one by `server_expires_at` against the estimated server
+        time, other tokens by `expires_at` against the local clock.
+        """
+        if self._token_deadline is not None and self._token_deadline[0] is token:
+            deadline = self._token_deadline[1]
+            return time.monotonic() + TOKEN_EXPIRY_MARGIN_SEC >= deadline
+        if "server_expires_at" in token:
+            return (
+                float(token["server_expires_at"])
+                < self._clock.now() + self._clock.get_expiry_margin()
+            )
+        if "expires_at" in token:
+            return float(token["expires_at"]) < time.time() + CLOCK_OUT_OF_SYNC_MAX_SEC
+        return False
 
     @abstractmethod
     async def async_get_access_token(self) -> str:
         """Return a valid access token."""
 
-    async def request(self, method: str, url: str, **kwargs: Any) -> Any:
-        """Make a request with token authorization."""
-        _url = f"{self._base_url}/{url}"
+    async def async_warm_up(self, connections: int = WARM_UP_CONNECTIONS) -> int:
+        """Get a valid token and open keep-alive connections concurrently.
+
+        Return the number of connections opened.
+        """
+        _, opened = await asyncio.gather(
+            self.async_get_access_token(),
+            self._transport.async_warm_up(self._base_url, connections),
+        )
+        return opened
+
+    async def request_raw(
+        self, method: str, url: str, **kwargs: Any
+    ) -> TaipitResponse:
+        """Make a request with token authorization, return the raw response.
+
+        `priority` selects the dispatcher priority class of the request.
+        """
+        priority: str | None = kwargs.pop("priority", None)
+        check_deadline()
         if "headers" not in kwargs:
             kwargs["headers"] = {}
         access_token = await self.async_get_access_token()
         kwargs["headers"]["Authorization"] = f"Bearer {access_token}"
 
-        LOGGER.debug("Request %s %s", method, url)
+        if self._hedging is not None and self._hedging.applies(method, url):
+            return await self._hedging.async_run(
+                lambda: self._async_send(method, url, priority, dict(kwargs))
+            )
+        return await self._async_send(method, url, priority, kwargs)
+
+    async def _async_send(
+        self, method: str, url: str, priority: str | None, kwargs: dict[str, Any]
+    ) -> TaipitResponse:
+        """Send an authorized request through the dispatcher and breaker."""
+        _url = f"{self._base_url}/{url}"
+        async with self._slot(priority):
+            if (timeout := self._get_timeout(url)) is not None:
+                kwargs.setdefault("timeout", timeout)
 
-        try:
-            async with self._session.request(
-                method, _url, **kwargs, raise_for_status=True
-            ) as resp:
-                data = await resp.json()
-                LOGGER.debug(
-                    "Response status=%s, data=%s",
-                    resp.status,
-                    data,
-                )
-        except ClientError as err:
-            raise TaipitApiError(str(err)) from err
+            LOGGER.debug("Request %s %s", method, url)
 
+            try:
+                async with self._guard(self._circuit_breaker):
+                    sent_at = time.time()
+                    response = await self._transport.async_request(
+                        method, _url, **kwargs
+                    )
+                    self._clock.observe(response.headers, sent_at, time.time())
+                    raise_for_status(method, _url, response)
+            except TimeoutError as err:
+                raise TaipitTimeoutError(
+                    f"Request {method} {url} timed out"
+                ) from err
+            except ClientError as err:
+                raise TaipitApiError(str(err)) from err
+
+        return response
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> Any:
+        """Make a request with token authorization."""
+        response = await self.request_raw(method, url, **kwargs)
+        data = response.json()
+        if self._payload_logger.is_enabled():
+            self._payload_logger.log_response(method, url, response, data)
         return data
 
 
@@ -79,7 +211,7 @@ class SimpleTaipitAuth(AbstractTaipitAuth):
         self,
         username: str,
         password: str,
-        session: ClientSession,
+        session: ClientSession | None,
         *,
         client_id: str = DEFAULT_CLIENT_ID,
         client_secret: str = DEFAULT_CLIENT_SECRET,
@@ -87,8 +219,29 @@ class SimpleTaipitAuth(AbstractTaipitAuth):
         token_url: str = DEFAULT_TOKEN_URL,
         token: dict[str, Any] | None = None,
         token_update_callback: Callable[[dict[str, Any]], None] | None = None,
+        timeout: ClientTimeout | None = None,
+        endpoint_timeouts: Mapping[str, ClientTimeout] | None = None,
+        circuit_breaker: TaipitCircuitBreaker | None = None,
+        token_circuit_breaker: TaipitCircuitBreaker | None = None,
+        dispatcher: TaipitPriorityDispatcher | None = None,
+        payload_logger: TaipitPayloadLogger | None = None,
+        transport: AbstractTaipitTransport | None = None,
+        hedging: TaipitHedgingPolicy | None = None,
+        clock: TaipitServerClock | None = None,
     ) -> None:
-        super().__init__(session, base_url=base_url)
+        super().__init__(
+            session,
+            base_url=base_url,
+            timeout=timeout,
+            endpoint_timeouts=endpoint_timeouts,
+            circuit_breaker=circuit_breaker,
+            dispatcher=dispatcher,
+            payload_logger=payload_logger,
+            transport=transport,
+            hedging=hedging,
+            clock=clock,
+        )
+        self._token_circuit_breaker = token_circuit_breaker
         self._username = username
         self._password = password
         self._client_id = client_id
@@ -104,12 +257,22 @@ class SimpleTaipitAuth(AbstractTaipitAuth):
         data["client_id"] = self._client_id
         data["client_secret"] = self._client_secret
 
+        kwargs: dict[str, Any] = {}
+        if (timeout := self._get_timeout(self._token_url)) is not None:
+            kwargs["timeout"] = timeout
+
         LOGGER.debug("Token request grant_type=%s", data.get("grant_type"))
 
         try:
-            async with self._session.get(_url, params=data) as resp:
+            async with self._guard(self._token_circuit_breaker):
+                sent_mono = time.monotonic()
+                sent_at = time.time()
+                resp = await self._transport.async_request(
+                    "GET", _url, params=data, **kwargs
+                )
+                self._clock.observe(resp.headers, sent_at, time.time())
                 if resp.status == 400:
-                    error_info = await resp.json()
+                    error_info = resp.json()
                     if error_info["error"] == "invalid_grant":
                         raise TaipitAuthInvalidGrant(
                             error_info.get("error_description")
@@ -119,11 +282,13 @@ class SimpleTaipitAuth(AbstractTaipitAuth):
                             error_info.get("error_description")
                         )
                     raise TaipitAuthError(error_info.get("error_description"))
-                resp.raise_for_status()
+                raise_for_status("GET", _url, resp)
 
-                new_token: dict[str, Any] = await resp.json()
+                new_token: dict[str, Any] = resp.json()
         except (TaipitAuthError, TaipitInvalidTokenResponse):
             raise
+        except TimeoutError as err:
+            raise TaipitTimeoutError("Token request timed out") from err
         except ClientError as err:
             raise TaipitApiError(str(err)) from err
 
@@ -131,7 +296,10 @@ class SimpleTaipitAuth(AbstractTaipitAuth):
             raise TaipitInvalidTokenResponse
 
         new_token["expires_in"] = int(new_token["expires_in"])
-        new_token["expires_at"] = time.time() + new_token["expires_in"]
+        # Counted from sending the request, in local and in server time
+        new_token["expires_at"] = sent_at + new_token["expires_in"]
+        new_token["server_expires_at"] = new_token["expires_at"] + self._clock.offset
+        self._token_deadline = (new_token, sent_mono + new_token["expires_in"])
 
         LOGGER.debug(
             "Token acquired, expires_in=%s",
@@ -141,7 +309,11 @@ class SimpleTaipitAuth(AbstractTaipitAuth):
         return new_token
 
     def _fire_token_update(self, token: dict[str, Any]) -> None:
-        """Notify caller about token changes."""
+        """Notify caller about token changes.
+
+        `expires_at` of the token is in local time, `server_expires_at` in
+        the estimated server time.
+        """
         if self._token_update_callback is not None:
             self._token_update_callback(token)
 
@@ -154,7 +326,12 @@ class SimpleTaipitAuth(AbstractTaipitAuth):
                     "refresh_token": token["refresh_token"],
                 }
             )
-        except (TaipitAuthInvalidGrant, TaipitAuthInvalidClient):
+        except (
+            TaipitAuthInvalidGrant,
+            TaipitAuthInvalidClient,
+            TaipitCircuitOpenError,
+            TaipitDeadlineExceeded,
+        ):
             raise
         except Exception as exc:
             raise TaipitTokenRefreshFailed from exc
@@ -171,7 +348,12 @@ class SimpleTaipitAuth(AbstractTaipitAuth):
                     "password": self._password,
                 }
             )
-        except (TaipitAuthInvalidGrant, TaipitAuthInvalidClient):
+        except (
+            TaipitAuthInvalidGrant,
+            TaipitAuthInvalidClient,
+            TaipitCircuitOpenError,
+            TaipitDeadlineExceeded,
+        ):
             raise
         except Exception as exc:
             raise TaipitTokenAcquireFailed from exc
@@ -183,19 +365,10 @@ class SimpleTaipitAuth(AbstractTaipitAuth):
         """Check if token is valid and contains all required fields."""
         return TOKEN_REQUIRED_FIELDS <= token.keys()
 
-    @staticmethod
-    def _is_expired_token(token: dict[str, Any]) -> bool:
-        """Check if token is expired."""
-        if "expires_at" in token:
-            return (
-                float(token["expires_at"])
-                < time.time() + CLOCK_OUT_OF_SYNC_MAX_SEC
-            )
-        return False
-
     async def async_get_access_token(self) -> str:
         """Get access token."""
-        async with self._lock:
+        await async_within_deadline(self._lock.acquire())
+        try:
             if self._is_valid_token(self._token):
                 if self._is_expired_token(self._token):
                     self._token = await self._async_refresh_token(self._token)
@@ -203,5 +376,12 @@ class SimpleTaipitAuth(AbstractTaipitAuth):
             else:
                 self._token = await self._async_new_token()
                 self._fire_token_update(self._token)
+        finally:
+            self._lock.release()
 
         return self._token["access_token"]
+
+    async def async_get_token(self) -> dict[str, Any]:
+        """Return a copy of the valid token, acquiring or refreshing it."""
+        await self.async_get_access_token()
+        return dict(self._token)
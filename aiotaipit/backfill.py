@@ -0,0 +1,248 @@
+"""Resumable backfill of readings history with checkpoints."""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .api import TaipitApi
+from .const import (
+    BACKFILL_CHECKPOINT_INTERVAL,
+    BACKFILL_REPORT_INTERVAL,
+    CONF_DATE,
+    CONF_READINGS,
+    DEFAULT_CONCURRENCY,
+    EXPORT_CHUNK_SIZE,
+    LOGGER,
+)
+from .exceptions import TaipitError
+from .export import AbstractExportWriter, iter_reading_rows
+from .limiter import TaipitAdaptiveLimiter
+
+
+@dataclass(frozen=True, slots=True)
+class TaipitBackfillProgress:
+    """Progress of a backfill run."""
+
+    total: int
+    completed: int
+    failed: int
+    rows: int
+    elapsed: float
+    meters_per_sec: float
+    rows_per_sec: float
+    eta: float | None
+
+
+class TaipitBackfill:
+    """Backfill readings history of many meters, resumable after a crash.
+
+    Meters are fetched by `concurrency` workers (or as allowed by
+    `limiter`) and their readings written to `writer`. Every
+    `checkpoint_interval` seconds, and every `chunk_size` rows, the rows
+    are flushed and the completed meter IDs with their last reading date
+    are written atomically to `checkpoint_path`. A new run with the same
+    checkpoint skips completed meters; open the writer in append mode to
+    continue the same output. Readings of meters in progress during a
+    crash may be written twice. Failed meters are logged and retried by
+    the next run. Progress with throughput and ETA is logged and passed
+    to `progress_callback` every `report_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        api: TaipitApi,
+        writer: AbstractExportWriter,
+        checkpoint_path: str | Path,
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        limiter: TaipitAdaptiveLimiter | None = None,
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+        checkpoint_interval: float = BACKFILL_CHECKPOINT_INTERVAL,
+        report_interval: float = BACKFILL_REPORT_INTERVAL,
+        progress_callback: Callable[[TaipitBackfillProgress], None] | None = None,
+    ) -> None:
+        """Initialize the backfill."""
+        self._api = api
+        self._writer = writer
+        self._checkpoint_path = Path(checkpoint_path)
+        self._concurrency = concurrency
+        self._limiter = limiter
+        self._chunk_size = chunk_size
+        self._checkpoint_interval = checkpoint_interval
+        self._report_interval = report_interval
+        self._progress_callback = progress_callback
+        # meter ID -> last reading date of completed meters
+        self._last_dates: dict[int, str | None] = {}
+        self._rows: list[dict[str, Any]] = []
+        self._pending: dict[int, str | None] = {}
+        self._flush_lock = asyncio.Lock()
+        self._total = 0
+        self._resumed = 0
+        self._done = 0
+        self._failed = 0
+        self._written = 0
+        self._started = 0.0
+
+    @property
+    def last_dates(self) -> dict[int, str | None]:
+        """Return the last reading date of each completed meter."""
+        return dict(self._last_dates)
+
+    def load_checkpoint(self) -> dict[int, str | None]:
+        """Read the checkpoint file, return completed meters."""
+        try:
+            with self._checkpoint_path.open(encoding="utf-8") as f:
+                checkpoint: dict[str, Any] = json.load(f)
+        except FileNotFoundError:
+            return {}
+        return {int(key): value for key, value in checkpoint["last_dates"].items()}
+
+    def _write_checkpoint(self) -> None:
+        """Write the checkpoint file atomically."""
+        path = self._checkpoint_path
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump({"updated_at": time.time(), "last_dates": self._last_dates}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _flush_sync(
+        self, rows: list[dict[str, Any]], completed: dict[int, str | None]
+    ) -> None:
+        """Write rows, then mark their meters completed in the checkpoint."""
+        if rows:
+            self._writer.write_rows(rows)
+        self._writer.flush()
+        self._last_dates.update(completed)
+        self._write_checkpoint()
+
+    async def _async_flush(self) -> None:
+        """Flush buffered rows and write the checkpoint.
+
+        A cancelled caller still waits for the write to finish, so the next
+        flush never runs concurrently with it.
+        """
+        async with self._flush_lock:
+            rows, self._rows = self._rows, []
+            completed, self._pending = self._pending, {}
+            flush = asyncio.ensure_future(
+                asyncio.to_thread(self._flush_sync, rows, completed)
+            )
+            try:
+                await asyncio.shield(flush)
+            except asyncio.CancelledError:
+                await flush
+                self._written += len(rows)
+                raise
+            self._written += len(rows)
+
+    def get_progress(self) -> TaipitBackfillProgress:
+        """Return the current progress."""
+        elapsed = time.monotonic() - self._started
+        done = self._done
+        rows = self._written + len(self._rows)
+        meters_per_sec = done / elapsed if elapsed > 0 else 0.0
+        remaining = self._total - self._resumed - done - self._failed
+        return TaipitBackfillProgress(
+            total=self._total,
+            completed=self._resumed + done,
+            failed=self._failed,
+            rows=rows,
+            elapsed=elapsed,
+            meters_per_sec=meters_per_sec,
+            rows_per_sec=rows / elapsed if elapsed > 0 else 0.0,
+            eta=remaining / meters_per_sec if meters_per_sec > 0 else None,
+        )
+
+    def _report(self, progress: TaipitBackfillProgress) -> None:
+        """Log the progress and pass it to the callback."""
+        LOGGER.info(
+            "Backfill %s/%s meters, %s failed, %.1f meters/s, %.0f rows/s, ETA %s",
+            progress.completed,
+            progress.total,
+            progress.failed,
+            progress.meters_per_sec,
+            progress.rows_per_sec,
+            "unknown" if progress.eta is None else f"{progress.eta:.0f}s",
+        )
+        if self._progress_callback is not None:
+            self._progress_callback(progress)
+
+    async def _async_fetch(self, meter_id: int) -> dict[str, Any]:
+        """Fetch readings of the meter, within the limiter if set."""
+        if self._limiter is None:
+            return await self._api.async_get_meter_readings(meter_id)
+        async with self._limiter.async_slot():
+            return await self._api.async_get_meter_readings(meter_id)
+
+    async def async_run(
+        self, meter_ids: Iterable[int] | None = None
+    ) -> TaipitBackfillProgress:
+        """Backfill the meters (all meters by default), return the progress."""
+        if meter_ids is None:
+            meter_ids = [meter["id"] for meter in await self._api.async_get_meters()]
+        ids = list(dict.fromkeys(meter_ids))
+        self._last_dates = await asyncio.to_thread(self.load_checkpoint)
+        todo = [meter_id for meter_id in ids if meter_id not in self._last_dates]
+        self._total = len(ids)
+        self._resumed = self._total - len(todo)
+        self._done = self._failed = self._written = 0
+        self._started = time.monotonic()
+        if self._resumed:
+            LOGGER.info("Resuming backfill, %s meters already done", self._resumed)
+        queue = iter(todo)
+        last_flush = self._started
+
+        async def _worker() -> None:
+            nonlocal last_flush
+            for meter_id in queue:
+                try:
+                    data = await self._async_fetch(meter_id)
+                except TaipitError as err:
+                    LOGGER.warning("Backfill of meter %s failed: %s", meter_id, err)
+                    self._failed += 1
+                    continue
+                self._rows.extend(iter_reading_rows(meter_id, data))
+                dates = [
+                    reading[CONF_DATE]
+                    for reading in data.get(CONF_READINGS) or ()
+                    if reading.get(CONF_DATE) is not None
+                ]
+                self._pending[meter_id] = max(dates, default=None)
+                self._done += 1
+                now = time.monotonic()
+                if (
+                    len(self._rows) >= self._chunk_size
+                    or now - last_flush >= self._checkpoint_interval
+                ):
+                    last_flush = now
+                    await self._async_flush()
+
+        async def _reporter() -> None:
+            while True:
+                await asyncio.sleep(self._report_interval)
+                self._report(self.get_progress())
+
+        workers = (
+            self._limiter.max_limit if self._limiter is not None else self._concurrency
+        )
+        tasks = [asyncio.create_task(_worker()) for _ in range(workers)]
+        reporter = asyncio.create_task(_reporter())
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # stop the other workers before the final flush when one fails
+            for task in (*tasks, reporter):
+                task.cancel()
+            await asyncio.gather(*tasks, reporter, return_exceptions=True)
+            await self._async_flush()
+        progress = self.get_progress()
+        self._report(progress)
+        return progress
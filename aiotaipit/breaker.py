@@ -0,0 +1,159 @@
+"""Circuit breaker for Taipit cloud requests."""
+from __future__ import annotations
+
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from enum import StrEnum
+
+from aiohttp import ClientError, ClientResponseError
+
+from .const import (
+    BREAKER_FAILURE_RATE,
+    BREAKER_HALF_OPEN_CALLS,
+    BREAKER_MIN_CALLS,
+    BREAKER_OPEN_SEC,
+    BREAKER_WINDOW_SEC,
+    LOGGER,
+)
+from .exceptions import TaipitCircuitOpenError
+
+
+class CircuitState(StrEnum):
+    """Circuit breaker state."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class TaipitCircuitBreaker:
+    """Circuit breaker tripping on the failure rate of recent requests.
+
+    Server errors (5xx, 429), connection errors, timeouts and, if
+    `slow_call_sec` is set, responses slower than that count as failures.
+    When the failure rate within `window_sec` reaches `failure_rate`
+    (with at least `min_calls` requests), the circuit opens and requests
+    fail fast with `TaipitCircuitOpenError`. After `open_sec` up to
+    `half_open_calls` probe requests are let through: if they all
+    succeed the circuit closes, any failure opens it again.
+    """
+
+    def __init__(
+        self,
+        *,
+        name: str = "api",
+        failure_rate: float = BREAKER_FAILURE_RATE,
+        min_calls: int = BREAKER_MIN_CALLS,
+        window_sec: float = BREAKER_WINDOW_SEC,
+        open_sec: float = BREAKER_OPEN_SEC,
+        half_open_calls: int = BREAKER_HALF_OPEN_CALLS,
+        slow_call_sec: float | None = None,
+    ) -> None:
+        """Initialize the circuit breaker."""
+        self.name = name
+        self._failure_rate = failure_rate
+        self._min_calls = min_calls
+        self._window_sec = window_sec
+        self._open_sec = open_sec
+        self._half_open_calls = half_open_calls
+        self._slow_call_sec = slow_call_sec
+        self._state = CircuitState.CLOSED
+        self._calls: deque[tuple[float, bool]] = deque()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Return the current state."""
+        if (
+            self._state is CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self._open_sec
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._probes = self._probe_successes = 0
+            LOGGER.debug("Circuit %s half-open", self.name)
+        return self._state
+
+    def _open(self) -> None:
+        """Open the circuit."""
+        self._state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        self._calls.clear()
+        self._failures = 0
+        LOGGER.warning("Circuit %s opened", self.name)
+
+    def _close(self) -> None:
+        """Close the circuit."""
+        self._state = CircuitState.CLOSED
+        self._calls.clear()
+        self._failures = 0
+        LOGGER.info("Circuit %s closed", self.name)
+
+    def _before_request(self) -> None:
+        """Fail fast if requests are not allowed."""
+        state = self.state
+        if state is CircuitState.OPEN:
+            raise TaipitCircuitOpenError(f"Circuit {self.name} is open")
+        if state is CircuitState.HALF_OPEN:
+            if self._probes >= self._half_open_calls:
+                raise TaipitCircuitOpenError(f"Circuit {self.name} is half-open")
+            self._probes += 1
+
+    def _record(self, failed: bool | None, probe: bool) -> None:
+        """Record the outcome of a request, None means "not counted"."""
+        if probe:
+            if self._state is not CircuitState.HALF_OPEN:
+                return
+            if failed:
+                self._open()
+            elif failed is None:
+                self._probes -= 1
+            else:
+                self._probe_successes += 1
+                if self._probe_successes >= self._half_open_calls:
+                    self._close()
+            return
+        if failed is None or self._state is not CircuitState.CLOSED:
+            return
+
+        now = time.monotonic()
+        calls = self._calls
+        calls.append((now, failed))
+        self._failures += failed
+        while calls and calls[0][0] < now - self._window_sec:
+            self._failures -= calls.popleft()[1]
+        if (
+            len(calls) >= self._min_calls
+            and self._failures >= self._failure_rate * len(calls)
+        ):
+            self._open()
+
+    @staticmethod
+    def _is_failure(err: BaseException) -> bool | None:
+        """Classify an exception raised by a request."""
+        if isinstance(err, ClientResponseError):
+            return err.status >= 500 or err.status == 429
+        if isinstance(err, (ClientError, TimeoutError)):
+            return True
+        return None
+
+    @asynccontextmanager
+    async def async_guard(self) -> AsyncIterator[None]:
+        """Guard a request made inside the block."""
+        self._before_request()
+        probe = self._state is CircuitState.HALF_OPEN
+        start = time.monotonic()
+        try:
+            yield
+        except BaseException as err:
+            self._record(self._is_failure(err), probe)
+            raise
+        slow = (
+            self._slow_call_sec is not None
+            and time.monotonic() - start > self._slow_call_sec
+        )
+        self._record(slow, probe)
@@ -0,0 +1,150 @@
+"""Stale-while-revalidate cache for API reads."""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from typing import Any
+
+from .const import (
+    LOGGER,
+    READ_CACHE_MAX_ENTRIES,
+    READ_CACHE_MAX_STALE,
+    READ_CACHE_STALE_IF_ERROR,
+    READ_CACHE_TTL,
+)
+from .exceptions import TaipitError
+from .helpers import match_endpoint
+
+_CacheKey = tuple[str, tuple[tuple[str, Any], ...]]
+
+
+def make_key(url: str, params: Mapping[str, Any] | None = None) -> _CacheKey:
+    """Return the cache key of the url and query parameters."""
+    return url, tuple(sorted((params or {}).items()))
+
+
+class TaipitReadCache:
+    """Cache of decoded API responses with stale-while-revalidate.
+
+    Entries are fresh for `ttl` seconds (or the longest matching prefix of
+    `endpoint_ttls`). For `max_stale` seconds more an expired entry is
+    still returned at once while one background request refreshes it.
+    When the upstream fails, entries up to `stale_if_error` seconds past
+    their TTL are returned instead of the error. Concurrent misses of the
+    same key share one request. Cached data is shared between callers and
+    must not be modified.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float = READ_CACHE_TTL,
+        endpoint_ttls: Mapping[str, float] | None = None,
+        max_stale: float = READ_CACHE_MAX_STALE,
+        stale_if_error: float = READ_CACHE_STALE_IF_ERROR,
+        max_entries: int = READ_CACHE_MAX_ENTRIES,
+    ) -> None:
+        """Initialize the cache."""
+        self._ttl = ttl
+        self._endpoint_ttls = dict(endpoint_ttls or {})
+        self._max_stale = max_stale
+        self._stale_if_error = stale_if_error
+        self._max_entries = max_entries
+        # key -> (expires_at, data), oldest first
+        self._entries: dict[_CacheKey, tuple[float, Any]] = {}
+        self._inflight: dict[_CacheKey, asyncio.Task[Any]] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.errors_served_stale = 0
+
+    def get_metrics(self) -> dict[str, int]:
+        """Return cache metrics."""
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "errors_served_stale": self.errors_served_stale,
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+        }
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        self._entries.clear()
+
+    async def async_close(self) -> None:
+        """Cancel background refreshes."""
+        tasks = list(self._inflight.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _get_ttl(self, url: str) -> float:
+        """Return the TTL of the url."""
+        return match_endpoint(url, self._endpoint_ttls, self._ttl)
+
+    async def async_get(
+        self, key: _CacheKey, fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return the cached data of the key, fetching it when needed."""
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, data = entry
+            if now < expires_at:
+                self.hits += 1
+                return data
+            if now < expires_at + self._max_stale:
+                self.stale_hits += 1
+                if key not in self._inflight:
+                    self.refreshes += 1
+                    # The refresh must not inherit the caller's deadline
+                    self._start_fetch(key, fetch, contextvars.Context())
+                return data
+
+        self.misses += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._start_fetch(key, fetch, None)
+        try:
+            return await asyncio.shield(task)
+        except TaipitError:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() >= entry[0] + self._stale_if_error:
+                raise
+            self.errors_served_stale += 1
+            return entry[1]
+
+    def _start_fetch(
+        self,
+        key: _CacheKey,
+        fetch: Callable[[], Awaitable[Any]],
+        context: contextvars.Context | None,
+    ) -> asyncio.Task[Any]:
+        """Start the upstream request of the key."""
+        task = asyncio.create_task(self._async_fetch(key, fetch), context=context)
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._fetch_done(key, done))
+        return task
+
+    def _fetch_done(self, key: _CacheKey, task: asyncio.Task[Any]) -> None:
+        """Forget the finished upstream request."""
+        self._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            LOGGER.debug("Refresh of %s failed: %s", key[0], task.exception())
+
+    async def _async_fetch(
+        self, key: _CacheKey, fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Fetch the data and store it."""
+        data = await fetch()
+        self._entries.pop(key, None)
+        while len(self._entries) >= self._max_entries:
+            del self._entries[next(iter(self._entries))]
+        self._entries[key] = (time.monotonic() + self._get_ttl(key[0]), data)
+        return data
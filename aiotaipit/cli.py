@@ -13,10 +13,15 @@ from .auth import SimpleTaipitAuth
 from .const import (
     DEFAULT_CLIENT_ID,
     DEFAULT_CLIENT_SECRET,
+    DEFAULT_SERVER_HOST,
+    DEFAULT_SERVER_PORT,
     GUEST_PASSWORD,
     GUEST_USERNAME,
     LOG_LEVELS,
+    SERVER_CACHE_TTL,
+    SERVER_CLIENT_ID,
 )
+from .server import TaipitServer, async_serve
 
 
 def get_arguments() -> argparse.Namespace:
@@ -56,6 +61,26 @@ def get_arguments() -> argparse.Namespace:
                         help="show settings for Taipit API",
                         action="store_true")
 
+    # server mode
+    parser.add_argument("--serve",
+                        help="serve the Taipit API locally from one shared "
+                             "client with caching",
+                        action="store_true")
+    parser.add_argument("--host", default=DEFAULT_SERVER_HOST,
+                        help=f"server host (default: {DEFAULT_SERVER_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_SERVER_PORT,
+                        help=f"server port (default: {DEFAULT_SERVER_PORT})")
+    parser.add_argument("--cache-ttl", type=float, default=SERVER_CACHE_TTL,
+                        help="server cache TTL in seconds "
+                             f"(default: {SERVER_CACHE_TTL})")
+    parser.add_argument("--access-token",
+                        help="token required from server clients "
+                             "(default: random)")
+    parser.add_argument("--server-client-secret",
+                        help="client secret for the server token endpoint "
+                             f"(client_id {SERVER_CLIENT_ID}); the endpoint "
+                             "is disabled if not set")
+
     parser.add_argument('-v', '--verbose',
                         action='count', default=0,
                         help="increase verbosity level")
@@ -97,6 +122,16 @@ async def cli() -> None:
         )
         api = TaipitApi(auth)
 
+        if args.serve:
+            server = TaipitServer(
+                api,
+                cache_ttl=args.cache_ttl,
+                access_token=args.access_token,
+                client_secret=args.server_client_secret,
+            )
+            await async_serve(server, args.host, args.port)
+            return
+
         if args.info:
             if args.id:
                 print(f"Info about Meter ID={args.id}:")
@@ -0,0 +1,77 @@
+"""Server clock offset estimated from response Date headers."""
+from __future__ import annotations
+
+import time
+from collections.abc import Mapping
+from email.utils import parsedate_to_datetime
+
+from .const import (
+    CLOCK_OUT_OF_SYNC_MAX_SEC,
+    CLOCK_SKEW_ALPHA,
+    CLOCK_SKEW_RESET_SEC,
+    TOKEN_EXPIRY_MARGIN_SEC,
+)
+
+
+def parse_http_date(value: str | None) -> float | None:
+    """Return the POSIX timestamp of an HTTP date, None if invalid."""
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class TaipitServerClock:
+    """Offset between the server clock and the local clock.
+
+    Every `Date` header is one sample: the server time (rounded down to a
+    second, so half a second is added) against the middle of the request.
+    Samples are smoothed by EWMA with `alpha`; a sample further than
+    `CLOCK_SKEW_RESET_SEC` from the estimate (the local clock was stepped)
+    replaces it. `error` bounds the estimate by the Date resolution and
+    half the round trip.
+    """
+
+    def __init__(self, *, alpha: float = CLOCK_SKEW_ALPHA) -> None:
+        """Initialize the clock."""
+        self._alpha = alpha
+        self.offset = 0.0
+        self.error: float | None = None
+        self.samples = 0
+
+    def observe(
+        self, headers: Mapping[str, str], sent_at: float, received_at: float
+    ) -> None:
+        """Update the offset from the Date header of a response.
+
+        `sent_at` and `received_at` are `time.time()` around the request.
+        """
+        server_time = parse_http_date(headers.get("Date") or headers.get("date"))
+        if server_time is None:
+            return
+        rtt = max(0.0, received_at - sent_at)
+        offset = server_time + 0.5 - (sent_at + received_at) / 2
+        error = 0.5 + rtt / 2
+        if self.error is None or abs(offset - self.offset) > CLOCK_SKEW_RESET_SEC:
+            self.offset = offset
+            self.error = error
+        else:
+            self.offset += self._alpha * (offset - self.offset)
+            self.error += self._alpha * (error - self.error)
+        self.samples += 1
+
+    def now(self) -> float:
+        """Return the estimated server time."""
+        return time.time() + self.offset
+
+    def get_expiry_margin(self) -> float:
+        """Return how long before `expires_at` a token is refreshed.
+
+        Until the first sample the offset is unknown and the conservative
+        `CLOCK_OUT_OF_SYNC_MAX_SEC` is used.
+        """
+        if self.error is None:
+            return CLOCK_OUT_OF_SYNC_MAX_SEC
+        return TOKEN_EXPIRY_MARGIN_SEC + self.error
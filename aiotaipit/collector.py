@@ -0,0 +1,234 @@
+"""Multi-process collector of meter readings for large meter fleets."""
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import queue
+from collections.abc import AsyncIterator, Callable, Iterable
+from multiprocessing.process import BaseProcess
+from typing import Any
+
+from aiohttp import ClientSession
+
+from .api import TaipitApi
+from .auth import AbstractTaipitAuth, SimpleTaipitAuth
+from .const import (
+    COLLECTOR_BATCH_SIZE,
+    COLLECTOR_POLL_SEC,
+    DEFAULT_API_URL,
+    DEFAULT_BASE_URL,
+    DEFAULT_CONCURRENCY,
+    LOGGER,
+)
+from .exceptions import TaipitError
+from .timeouts import get_remaining_time, taipit_deadline
+
+_MSG_RESULTS = 0
+_MSG_TOKEN = 1
+_MSG_DONE = 2
+
+ProcessFunc = Callable[[int, dict[str, Any]], Any]
+
+
+def shard_meter_ids(meter_ids: Iterable[int], shards: int) -> list[list[int]]:
+    """Split meter IDs into `shards` round-robin lists of similar size."""
+    result: list[list[int]] = [[] for _ in range(max(1, shards))]
+    for index, meter_id in enumerate(dict.fromkeys(meter_ids)):
+        result[index % len(result)].append(meter_id)
+    return result
+
+
+class _ShardAuth(AbstractTaipitAuth):
+    """Auth for a worker process that takes its token from the parent."""
+
+    def __init__(
+        self,
+        session: ClientSession,
+        token_source: Callable[[], dict[str, Any]],
+        *,
+        base_url: str = DEFAULT_BASE_URL,
+        token: dict[str, Any],
+    ) -> None:
+        super().__init__(session, base_url=base_url)
+        self._token_source = token_source
+        self._token = token
+        self._lock = asyncio.Lock()
+
+    async def async_get_access_token(self) -> str:
+        """Return the shared token, asking the parent for a fresh one."""
+        async with self._lock:
+            if self._is_expired_token(self._token):
+                self._token = await asyncio.to_thread(self._token_source)
+        return self._token["access_token"]
+
+
+async def _async_shard_worker(
+    shard: int,
+    meter_ids: list[int],
+    token: dict[str, Any],
+    options: dict[str, Any],
+    results: Any,
+    tokens: Any,
+) -> None:
+    """Collect readings for one shard and stream them to the parent."""
+    process_func: ProcessFunc | None = options["process_func"]
+    batch_size: int = options["batch_size"]
+    semaphore = asyncio.Semaphore(options["concurrency"])
+    batch: list[tuple[int, Any]] = []
+
+    def _token_source() -> dict[str, Any]:
+        results.put((_MSG_TOKEN, shard, None))
+        return tokens.get()
+
+    def _flush() -> None:
+        if batch:
+            results.put((_MSG_RESULTS, shard, batch.copy()))
+            batch.clear()
+
+    async def _collect(api: TaipitApi, meter_id: int) -> None:
+        async with semaphore:
+            try:
+                data = await api.async_get_meter_readings(meter_id)
+                result = data if process_func is None else process_func(meter_id, data)
+            except TaipitError as err:
+                result = err
+        batch.append((meter_id, result))
+        if len(batch) >= batch_size:
+            _flush()
+
+    async with ClientSession() as session:
+        auth = _ShardAuth(
+            session, _token_source, base_url=options["base_url"], token=token
+        )
+        api = TaipitApi(auth, api_url=options["api_url"])
+        with taipit_deadline(options.get("deadline")):
+            await asyncio.gather(
+                *(_collect(api, meter_id) for meter_id in meter_ids)
+            )
+
+    _flush()
+    results.put((_MSG_DONE, shard, None))
+
+
+def _shard_worker(
+    shard: int,
+    meter_ids: list[int],
+    token: dict[str, Any],
+    options: dict[str, Any],
+    results: Any,
+    tokens: Any,
+) -> None:
+    """Worker process entry point."""
+    asyncio.run(
+        _async_shard_worker(shard, meter_ids, token, options, results, tokens)
+    )
+
+
+class TaipitShardedCollector:
+    """Collect meter readings using a pool of worker processes.
+
+    Meter IDs are sharded across processes, each running its own event loop
+    and session. The token is owned by the parent `SimpleTaipitAuth`:
+    workers ask the parent for a new one when theirs expires. Results are
+    sent back in batches over a multiprocessing queue.
+    """
+
+    def __init__(
+        self,
+        auth: SimpleTaipitAuth,
+        *,
+        api_url: str = DEFAULT_API_URL,
+        processes: int | None = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        batch_size: int = COLLECTOR_BATCH_SIZE,
+        process_func: ProcessFunc | None = None,
+    ) -> None:
+        """Initialize the collector.
+
+        `process_func(meter_id, readings)` runs in the worker process and
+        must be picklable (a module-level function). Its return value is
+        sent to the parent instead of the raw readings.
+        """
+        self._auth = auth
+        self._api_url = api_url
+        self._processes = processes or os.cpu_count() or 1
+        self._options: dict[str, Any] = {
+            "base_url": auth._base_url,
+            "api_url": api_url,
+            "concurrency": concurrency,
+            "batch_size": batch_size,
+            "process_func": process_func,
+        }
+
+    @staticmethod
+    def _get_message(
+        results: Any, processes: list[BaseProcess], pending: set[int]
+    ) -> tuple[int, int, Any]:
+        """Wait for the next worker message, failing if a worker died."""
+        while True:
+            try:
+                return results.get(timeout=COLLECTOR_POLL_SEC)
+            except queue.Empty:
+                for shard in pending:
+                    exitcode = processes[shard].exitcode
+                    if exitcode is not None:
+                        raise TaipitError(
+                            f"Collector worker {shard} exited with code {exitcode}"
+                        ) from None
+
+    async def async_collect(
+        self, meter_ids: Iterable[int] | None = None
+    ) -> AsyncIterator[tuple[int, Any]]:
+        """Yield (meter_id, result) pairs as workers produce them.
+
+        If `meter_ids` is not specified, all meters from `async_get_meters()`
+        are collected. Failed meters yield the `TaipitError` as result.
+        The current `taipit_deadline()` is passed on to the workers.
+        """
+        if meter_ids is None:
+            api = TaipitApi(self._auth, api_url=self._api_url)
+            meter_ids = [meter["id"] for meter in await api.async_get_meters()]
+        shards = [s for s in shard_meter_ids(meter_ids, self._processes) if s]
+        if not shards:
+            return
+
+        token = await self._auth.async_get_token()
+        options = {**self._options, "deadline": get_remaining_time()}
+        ctx = multiprocessing.get_context("spawn")
+        results = ctx.Queue()
+        tokens = [ctx.Queue() for _ in shards]
+        processes: list[BaseProcess] = [
+            ctx.Process(
+                target=_shard_worker,
+                args=(shard, ids, token, options, results, tokens[shard]),
+                daemon=True,
+            )
+            for shard, ids in enumerate(shards)
+        ]
+        for process in processes:
+            process.start()
+        LOGGER.debug(
+            "Collector started, processes=%s, meters=%s",
+            len(processes),
+            sum(len(ids) for ids in shards),
+        )
+
+        pending = set(range(len(shards)))
+        try:
+            while pending:
+                kind, shard, payload = await asyncio.to_thread(
+                    self._get_message, results, processes, pending
+                )
+                if kind == _MSG_RESULTS:
+                    for item in payload:
+                        yield item
+                elif kind == _MSG_TOKEN:
+                    tokens[shard].put(await self._auth.async_get_token())
+                elif kind == _MSG_DONE:
+                    pending.discard(shard)
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                process.join()
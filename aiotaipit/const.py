@@ -36,6 +36,11 @@ SECTION_METER_TYPES: Final = 'meterTypes'
 SECTION_METER_TYPES_FULL: Final = 'meterTypesFull'
 SECTION_REGIONS: Final = 'regions'
 SECTIONS_ALL: Final = (SECTION_REGIONS, SECTION_METER_TYPES, SECTION_CONTROLLERS)
+SECTIONS_REFERENCE: Final = (
+    SECTION_REGIONS,
+    SECTION_METER_TYPES_FULL,
+    SECTION_CONTROLLERS,
+)
 
 PARAM_ID: Final = 'id'
 PARAM_ACTION: Final = 'action'
@@ -44,6 +49,100 @@ GET_ENTRIES: Final = 'getEntries'
 
 TOKEN_REQUIRED_FIELDS: Final = {'access_token', 'expires_in', 'refresh_token'}
 CLOCK_OUT_OF_SYNC_MAX_SEC: Final = 20
+CLOCK_SKEW_ALPHA: Final = 0.2
+CLOCK_SKEW_RESET_SEC: Final = 60.0
+TOKEN_EXPIRY_MARGIN_SEC: Final = 5.0
+
+DEFAULT_CONCURRENCY: Final = 10
+
+COLLECTOR_BATCH_SIZE: Final = 100
+COLLECTOR_POLL_SEC: Final = 1.0
+
+CONF_DATE: Final = "date"
+CONF_ECOMETER_DATA: Final = "ecometerdata"
+CONF_ENERGY_A: Final = "energy_a"
+CONF_ID: Final = "id"
+CONF_LAST_READING: Final = "lastReading"
+CONF_METERNAME: Final = "metername"
+CONF_READINGS: Final = "readings"
+CONF_REGION_ID: Final = "regionId"
+CONF_SN: Final = "sn"
+CONF_STATUS: Final = "status"
+CONF_TYPE: Final = "type"
+
+ENERGY_FIELDS: Final = ("energy_a", "energy_t1_a", "energy_t2_a", "energy_t3_a")
+METER_FIELDS: Final = (
+    CONF_ID,
+    CONF_METERNAME,
+    CONF_SN,
+    CONF_TYPE,
+    CONF_STATUS,
+    *ENERGY_FIELDS,
+)
+
+EXPORT_CHUNK_SIZE: Final = 1000
+EXPORT_QUEUE_SIZE: Final = 100
+
+BACKFILL_CHECKPOINT_INTERVAL: Final = 5.0
+BACKFILL_REPORT_INTERVAL: Final = 10.0
+
+PRIORITY_INTERACTIVE: Final = "interactive"
+PRIORITY_BULK: Final = "bulk"
+DEFAULT_PRIORITY_WEIGHTS: Final = {PRIORITY_INTERACTIVE: 8, PRIORITY_BULK: 1}
+
+BREAKER_FAILURE_RATE: Final = 0.5
+BREAKER_MIN_CALLS: Final = 10
+BREAKER_WINDOW_SEC: Final = 60.0
+BREAKER_OPEN_SEC: Final = 30.0
+BREAKER_HALF_OPEN_CALLS: Final = 3
+
+DEFAULT_REFERENCE_TTL: Final = 24 * 60 * 60
+REFERENCE_RETRY_SEC: Final = 60
+
+ANOMALY_GAP_SEC: Final = 2 * 24 * 60 * 60
+ANOMALY_EWMA_ALPHA: Final = 0.1
+ANOMALY_SPIKE_FACTOR: Final = 4.0
+ANOMALY_MIN_SAMPLES: Final = 5
+
+DEFAULT_SERVER_HOST: Final = "127.0.0.1"
+DEFAULT_SERVER_PORT: Final = 8080
+SERVER_CACHE_TTL: Final = 60.0
+SERVER_CACHE_MAX_ENTRIES: Final = 10000
+SERVER_TOKEN_EXPIRES_IN: Final = 24 * 60 * 60
+SERVER_CLIENT_ID: Final = "aiotaipit-server"
+
+HUB_POLL_INTERVAL: Final = 60.0
+HUB_QUEUE_SIZE: Final = 100
+
+LOG_BODY_MAX_CHARS: Final = 512
+
+LIMITER_MAX_LIMIT: Final = 100
+LIMITER_TARGET_LATENCY: Final = 2.0
+LIMITER_DECREASE_FACTOR: Final = 0.5
+LIMITER_WINDOW: Final = 100
+
+HEDGE_PATHS: Final = ("api/meter/get-id", "api/bmd/all")
+HEDGE_PERCENTILE: Final = 0.95
+HEDGE_BUDGET: Final = 0.05
+HEDGE_MIN_SAMPLES: Final = 20
+HEDGE_WINDOW: Final = 200
+HEDGE_MAX_TOKENS: Final = 10.0
+
+WARM_UP_CONNECTIONS: Final = 4
+
+ENRICH_INFO: Final = "info"
+ENRICH_USER: Final = "user"
+ENRICH_TARIFF: Final = "tariff"
+ENRICH_ALL: Final = (ENRICH_INFO, ENRICH_USER, ENRICH_TARIFF)
+ENRICH_TTL: Final = 3600.0
+ENRICH_NEGATIVE_TTL: Final = 300.0
+USER_ID_FIELD: Final = "userId"
+
+READ_CACHE_TTL: Final = 60.0
+READ_CACHE_MAX_STALE: Final = 300.0
+READ_CACHE_STALE_IF_ERROR: Final = 3600.0
+READ_CACHE_MAX_ENTRIES: Final = 1000
+SETTINGS_CACHE_TTL: Final = 3600.0
 
 METER_MODELS: Final[dict[int, tuple[str, str]]] = {
     1: ('Меркурий', '230'),
@@ -0,0 +1,175 @@
+"""Prioritized request dispatcher."""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Iterator, Mapping
+from contextlib import asynccontextmanager, contextmanager, suppress
+from contextvars import ContextVar
+from typing import Any
+
+from .const import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_PRIORITY_WEIGHTS,
+    PRIORITY_INTERACTIVE,
+)
+from .timeouts import async_within_deadline
+
+_priority: ContextVar[str | None] = ContextVar("taipit_priority", default=None)
+
+
+@contextmanager
+def taipit_priority(priority: str) -> Iterator[None]:
+    """Set the priority class of all requests made inside the block."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class _PriorityClass:
+    """Queue and metrics of one priority class."""
+
+    __slots__ = (
+        "weight",
+        "current",
+        "waiters",
+        "dispatched",
+        "wait_total",
+        "wait_max",
+    )
+
+    def __init__(self, weight: int) -> None:
+        self.weight = weight
+        self.current = 0
+        self.waiters: deque[tuple[asyncio.Future[None], float]] = deque()
+        self.dispatched = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+
+class TaipitPriorityDispatcher:
+    """Limit concurrent requests and share slots between priority classes.
+
+    When all slots are busy, requests wait in per-class queues. Freed slots
+    are given to the classes by smooth weighted round-robin, so a class
+    with weight 8 gets eight slots for every slot of a class with weight 1,
+    and no class is starved.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        *,
+        weights: Mapping[str, int] = DEFAULT_PRIORITY_WEIGHTS,
+        default_priority: str = PRIORITY_INTERACTIVE,
+    ) -> None:
+        """Initialize the dispatcher."""
+        if default_priority not in weights:
+            raise ValueError(f"Unknown default priority: {default_priority}")
+        self._concurrency = concurrency
+        self._classes = {
+            name: _PriorityClass(weight) for name, weight in weights.items()
+        }
+        self._default_priority = default_priority
+        self._in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Return the number of requests holding a slot."""
+        return self._in_flight
+
+    def queue_depth(self, priority: str | None = None) -> int:
+        """Return the number of waiting requests (of a class or in total)."""
+        if priority is not None:
+            return len(self._classes[priority].waiters)
+        return sum(len(item.waiters) for item in self._classes.values())
+
+    def get_metrics(self) -> dict[str, dict[str, Any]]:
+        """Return queue depth and wait-time metrics per priority class."""
+        return {
+            name: {
+                "queue_depth": len(item.waiters),
+                "dispatched": item.dispatched,
+                "wait_avg": item.wait_total / item.dispatched
+                if item.dispatched
+                else 0.0,
+                "wait_max": item.wait_max,
+            }
+            for name, item in self._classes.items()
+        }
+
+    def _next_class(self) -> _PriorityClass | None:
+        """Pick the next class with waiters by smooth weighted round-robin."""
+        ready = [item for item in self._classes.values() if item.waiters]
+        if not ready:
+            return None
+        total = 0
+        best = ready[0]
+        for item in ready:
+            item.current += item.weight
+            total += item.weight
+            if item.current > best.current:
+                best = item
+        best.current -= total
+        return best
+
+    def _dispatch(self) -> None:
+        """Hand free slots to waiting requests."""
+        while self._in_flight < self._concurrency:
+            item = self._next_class()
+            if item is None:
+                return
+            waiter, enqueued_at = item.waiters.popleft()
+            if waiter.done():
+                continue
+            wait = time.monotonic() - enqueued_at
+            item.dispatched += 1
+            item.wait_total += wait
+            item.wait_max = max(item.wait_max, wait)
+            self._in_flight += 1
+            waiter.set_result(None)
+
+    async def _acquire(self, priority: str) -> None:
+        """Wait for a free slot."""
+        item = self._classes[priority]
+        if self._in_flight < self._concurrency and not self.queue_depth():
+            self._in_flight += 1
+            item.dispatched += 1
+            return
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        entry = (waiter, time.monotonic())
+        item.waiters.append(entry)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            else:
+                # _dispatch() may have popped the cancelled entry already
+                with suppress(ValueError):
+                    item.waiters.remove(entry)
+            raise
+
+    def _release(self) -> None:
+        """Free a slot."""
+        self._in_flight -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def async_slot(self, priority: str | None = None) -> AsyncIterator[None]:
+        """Hold a request slot inside the block.
+
+        Without `priority` the one set by `taipit_priority()` is used, then
+        the default priority. The wait is limited by `taipit_deadline()`.
+        """
+        priority = priority or _priority.get() or self._default_priority
+        if priority not in self._classes:
+            raise ValueError(f"Unknown priority: {priority}")
+        await async_within_deadline(self._acquire(priority))
+        try:
+            yield
+        finally:
+            self._release()
@@ -0,0 +1,218 @@
+"""Join meters with user info, meter info and tariff."""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from .api import TaipitApi
+from .const import (
+    CONF_ID,
+    DEFAULT_CONCURRENCY,
+    ENRICH_ALL,
+    ENRICH_INFO,
+    ENRICH_NEGATIVE_TTL,
+    ENRICH_TARIFF,
+    ENRICH_TTL,
+    ENRICH_USER,
+    LOGGER,
+    USER_ID_FIELD,
+)
+from .exceptions import TaipitError
+
+
+@dataclass(slots=True)
+class TaipitEnrichedMeter:
+    """Meter with joined details, None where unavailable."""
+
+    meter: dict[str, Any]
+    info: dict[str, Any] | None = None
+    user: dict[str, Any] | None = None
+    tariff: dict[str, Any] | None = None
+
+
+class _EntityCache:
+    """Cache of fetched entities with negative caching and coalescing."""
+
+    def __init__(self, ttl: float, negative_ttl: float) -> None:
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        self._values: dict[Any, tuple[float, dict[str, Any] | None]] = {}
+        self._inflight: dict[Any, asyncio.Task[dict[str, Any] | None]] = {}
+        self.hits = 0
+        self.requests = 0
+
+    def clear(self) -> None:
+        """Drop all cached entities."""
+        self._values.clear()
+
+    async def async_get(
+        self,
+        key: Any,
+        fetch: Callable[[], Awaitable[dict[str, Any]]],
+        semaphore: asyncio.Semaphore,
+    ) -> dict[str, Any] | None:
+        """Return the cached entity or fetch it, None if fetching failed.
+
+        The fetch runs in its own task, so a cancelled caller does not
+        cancel it for the others waiting on the same key.
+        """
+        cached = self._values.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            self.hits += 1
+            return cached[1]
+        task = self._inflight.get(key)
+        if task is None:
+            self.requests += 1
+            task = asyncio.create_task(self._async_fetch(key, fetch, semaphore))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _async_fetch(
+        self,
+        key: Any,
+        fetch: Callable[[], Awaitable[dict[str, Any]]],
+        semaphore: asyncio.Semaphore,
+    ) -> dict[str, Any] | None:
+        """Fetch the entity and store it, None if fetching failed."""
+        try:
+            async with semaphore:
+                value: dict[str, Any] | None = await fetch()
+            ttl = self._ttl
+        except TaipitError as err:
+            LOGGER.debug("Enrichment of %s failed: %s", key, err)
+            value = None
+            ttl = self._negative_ttl
+        self._values[key] = (time.monotonic() + ttl, value)
+        return value
+
+
+class TaipitEnricher:
+    """Join meters with meter info, owner user info and tariff.
+
+    IDs are deduplicated across the batch and only unique entities are
+    fetched, at most `concurrency` at once. Results are cached for `ttl`
+    seconds and failures (e.g. no access to a tariff) for `negative_ttl`,
+    so the number of requests scales with unique entities, not meters.
+    The user ID is read from `user_id_field` of the meter or its info.
+    """
+
+    def __init__(
+        self,
+        api: TaipitApi,
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        ttl: float = ENRICH_TTL,
+        negative_ttl: float = ENRICH_NEGATIVE_TTL,
+        user_id_field: str = USER_ID_FIELD,
+    ) -> None:
+        """Initialize the enricher."""
+        self._api = api
+        self._concurrency = concurrency
+        self._user_id_field = user_id_field
+        self._info = _EntityCache(ttl, negative_ttl)
+        self._users = _EntityCache(ttl, negative_ttl)
+        self._tariffs = _EntityCache(ttl, negative_ttl)
+
+    def get_metrics(self) -> dict[str, dict[str, int]]:
+        """Return requests and cache hits per entity type."""
+        return {
+            name: {"requests": cache.requests, "hits": cache.hits}
+            for name, cache in (
+                (ENRICH_INFO, self._info),
+                (ENRICH_USER, self._users),
+                (ENRICH_TARIFF, self._tariffs),
+            )
+        }
+
+    def clear(self) -> None:
+        """Drop all cached entities."""
+        for cache in (self._info, self._users, self._tariffs):
+            cache.clear()
+
+    async def _async_fetch_all(
+        self,
+        cache: _EntityCache,
+        keys: Iterable[Any],
+        fetch: Callable[[Any], Awaitable[dict[str, Any]]],
+        semaphore: asyncio.Semaphore,
+    ) -> dict[Any, dict[str, Any] | None]:
+        """Fetch unique entities concurrently."""
+        unique = list(dict.fromkeys(keys))
+        values = await asyncio.gather(
+            *(
+                cache.async_get(key, lambda key=key: fetch(key), semaphore)
+                for key in unique
+            )
+        )
+        return dict(zip(unique, values))
+
+    async def async_enrich(
+        self,
+        meters: Sequence[dict[str, Any]] | None = None,
+        *,
+        include: Sequence[str] = ENRICH_ALL,
+    ) -> list[TaipitEnrichedMeter]:
+        """Return meters (all meters by default) joined with the details.
+
+        `include` selects the details: "info", "user" and "tariff".
+        """
+        if meters is None:
+            meters = await self._api.async_get_meters()
+        semaphore = asyncio.Semaphore(self._concurrency)
+        meter_ids = [meter[CONF_ID] for meter in meters]
+        field = self._user_id_field
+        need_info = ENRICH_INFO in include or (
+            ENRICH_USER in include
+            and any(meter.get(field) is None for meter in meters)
+        )
+
+        async def _info_and_users() -> tuple[dict[Any, Any], dict[Any, Any]]:
+            infos: dict[Any, Any] = {}
+            if need_info:
+                infos = await self._async_fetch_all(
+                    self._info, meter_ids, self._api.async_get_meter_info, semaphore
+                )
+            if ENRICH_USER not in include:
+                return infos, {}
+            user_ids = [
+                user_id
+                for meter in meters
+                if (user_id := self._get_user_id(meter, infos)) is not None
+            ]
+            users = await self._async_fetch_all(
+                self._users, user_ids, self._api.async_get_user_info, semaphore
+            )
+            return infos, users
+
+        async def _tariffs() -> dict[Any, Any]:
+            if ENRICH_TARIFF not in include:
+                return {}
+            return await self._async_fetch_all(
+                self._tariffs, meter_ids, self._api.async_get_tariff, semaphore
+            )
+
+        (infos, users), tariffs = await asyncio.gather(_info_and_users(), _tariffs())
+        return [
+            TaipitEnrichedMeter(
+                meter,
+                infos.get(meter[CONF_ID]) if ENRICH_INFO in include else None,
+                users.get(self._get_user_id(meter, infos)),
+                tariffs.get(meter[CONF_ID]),
+            )
+            for meter in meters
+        ]
+
+    def _get_user_id(
+        self, meter: dict[str, Any], infos: dict[Any, dict[str, Any] | None]
+    ) -> Any:
+        """Return the user ID from the meter or its info."""
+        user_id = meter.get(self._user_id_field)
+        if user_id is None:
+            info = infos.get(meter[CONF_ID])
+            if info is not None:
+                user_id = info.get(self._user_id_field)
+        return user_id
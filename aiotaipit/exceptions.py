@@ -10,6 +10,18 @@ class TaipitApiError(TaipitError):
     """Non-auth API/HTTP errors (e.g. server 5xx, unexpected status)."""
 
 
+class TaipitTimeoutError(TaipitApiError):
+    """Request timed out."""
+
+
+class TaipitDeadlineExceeded(TaipitTimeoutError):
+    """Operation deadline exceeded, no new requests are started."""
+
+
+class TaipitCircuitOpenError(TaipitApiError):
+    """Circuit breaker is open, the request was not sent."""
+
+
 class TaipitAuthError(TaipitError):
     """Base class for aiotaipit auth errors."""
 
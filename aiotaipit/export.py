@@ -0,0 +1,273 @@
+"""Streaming export of meters and readings to files."""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import csv
+import json
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import IO, Any
+
+from .api import TaipitApi
+from .const import (
+    CONF_ECOMETER_DATA,
+    CONF_LAST_READING,
+    CONF_READINGS,
+    DEFAULT_CONCURRENCY,
+    EXPORT_CHUNK_SIZE,
+    EXPORT_QUEUE_SIZE,
+    LOGGER,
+    METER_FIELDS,
+)
+from .exceptions import TaipitError
+from .limiter import TaipitAdaptiveLimiter
+
+
+def flatten_meter(meter: dict[str, Any]) -> dict[str, Any]:
+    """Return a flat row with meter fields and the last reading."""
+    last_reading = (meter.get(CONF_ECOMETER_DATA) or {}).get(CONF_LAST_READING) or {}
+    return {
+        field: meter.get(field, last_reading.get(field)) for field in METER_FIELDS
+    }
+
+
+def iter_reading_rows(
+    meter_id: int, data: dict[str, Any]
+) -> Iterator[dict[str, Any]]:
+    """Yield flat rows for the readings of a meter."""
+    for reading in data.get(CONF_READINGS) or ():
+        yield {"meter_id": meter_id, **reading}
+
+
+class AbstractExportWriter(ABC):
+    """Abstract chunked writer. Methods are called from a worker thread."""
+
+    def __enter__(self) -> AbstractExportWriter:
+        """Return the writer."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the writer."""
+        self.close()
+
+    @abstractmethod
+    def write_rows(self, rows: Sequence[dict[str, Any]]) -> None:
+        """Write a chunk of rows."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Flush and close the output."""
+
+    def flush(self) -> None:
+        """Flush written rows to the output."""
+
+
+class _FileExportWriter(AbstractExportWriter):
+    """Writer owning a text file (or writing to a given file object).
+
+    With `append`, rows are added to an existing file.
+    """
+
+    def __init__(self, file: str | Path | IO[str], *, append: bool = False) -> None:
+        if isinstance(file, (str, Path)):
+            self._file: IO[str] = open(
+                file, "a" if append else "w", encoding="utf-8", newline=""
+            )
+            self._owned = True
+        else:
+            self._file = file
+            self._owned = False
+
+    def close(self) -> None:
+        """Flush and close the file."""
+        if self._owned:
+            self._file.close()
+        else:
+            self._file.flush()
+
+    def flush(self) -> None:
+        """Flush written rows to the file."""
+        self._file.flush()
+
+
+class NdjsonExportWriter(_FileExportWriter):
+    """Write rows as newline-delimited JSON."""
+
+    def write_rows(self, rows: Sequence[dict[str, Any]]) -> None:
+        """Write a chunk of rows."""
+        self._file.write(
+            "".join(
+                json.dumps(row, ensure_ascii=False, default=str) + "\n"
+                for row in rows
+            )
+        )
+
+
+class CsvExportWriter(_FileExportWriter):
+    """Write rows as CSV.
+
+    Without `fieldnames` the columns are the keys of the first chunk and a
+    later row with another key raises ValueError instead of losing it; set
+    `fieldnames` to fix the columns and leave other keys out. The header
+    is not repeated when appending to a non-empty file.
+    """
+
+    def __init__(
+        self,
+        file: str | Path | IO[str],
+        fieldnames: Sequence[str] | None = None,
+        *,
+        append: bool = False,
+    ) -> None:
+        super().__init__(file, append=append)
+        self._fieldnames = fieldnames
+        self._writer: csv.DictWriter[str] | None = None
+        self._header = not (append and self._file.tell() > 0)
+
+    def write_rows(self, rows: Sequence[dict[str, Any]]) -> None:
+        """Write a chunk of rows."""
+        if not rows:
+            return
+        if self._writer is None:
+            if self._fieldnames is None:
+                fieldnames = list(dict.fromkeys(key for row in rows for key in row))
+            else:
+                fieldnames = list(self._fieldnames)
+            self._writer = csv.DictWriter(
+                self._file,
+                fieldnames=fieldnames,
+                extrasaction="raise" if self._fieldnames is None else "ignore",
+            )
+            if self._header:
+                self._writer.writeheader()
+        self._writer.writerows(rows)
+
+
+class ParquetExportWriter(AbstractExportWriter):
+    """Write rows as Parquet row groups. Requires `pyarrow`."""
+
+    def __init__(self, path: str | Path) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as err:
+            raise ImportError(
+                "ParquetExportWriter requires pyarrow: pip install aiotaipit[parquet]"
+            ) from err
+        self._pa = pa
+        self._pq = pq
+        self._path = path
+        self._writer: Any = None
+
+    def write_rows(self, rows: Sequence[dict[str, Any]]) -> None:
+        """Write a chunk of rows as a row group."""
+        if not rows:
+            return
+        if self._writer is None:
+            table = self._pa.Table.from_pylist(list(rows))
+            self._writer = self._pq.ParquetWriter(self._path, table.schema)
+        else:
+            table = self._pa.Table.from_pylist(
+                list(rows), schema=self._writer.schema
+            )
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        """Close the file."""
+        if self._writer is not None:
+            self._writer.close()
+
+
+async def async_export_meters(
+    api: TaipitApi,
+    writer: AbstractExportWriter,
+    *,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> int:
+    """Export all meters with their last reading, return the number of rows."""
+    meters = await api.async_get_meters()
+    for start in range(0, len(meters), chunk_size):
+        chunk = [flatten_meter(meter) for meter in meters[start:start + chunk_size]]
+        await asyncio.to_thread(writer.write_rows, chunk)
+    return len(meters)
+
+
+async def async_export_readings(
+    api: TaipitApi,
+    writer: AbstractExportWriter,
+    meter_ids: Iterable[int] | None = None,
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+    queue_size: int = EXPORT_QUEUE_SIZE,
+    limiter: TaipitAdaptiveLimiter | None = None,
+) -> int:
+    """Stream readings of meters into the writer, return the number of rows.
+
+    `concurrency` workers fetch readings into a queue of at most
+    `queue_size` responses; when the writer falls behind, the workers wait.
+    With `limiter`, up to its `max_limit` workers run and the limiter
+    decides how many requests are in flight. Rows are written in chunks of
+    `chunk_size`, so memory use does not depend on the number of meters.
+    Meters that fail are logged and skipped.
+    """
+    if meter_ids is None:
+        meter_ids = [meter["id"] for meter in await api.async_get_meters()]
+    ids = iter(meter_ids)
+    queue: asyncio.Queue[tuple[int, dict[str, Any]] | None] = asyncio.Queue(
+        queue_size
+    )
+
+    async def _fetch_one(meter_id: int) -> dict[str, Any]:
+        if limiter is None:
+            return await api.async_get_meter_readings(meter_id)
+        async with limiter.async_slot():
+            return await api.async_get_meter_readings(meter_id)
+
+    async def _fetch() -> None:
+        for meter_id in ids:
+            try:
+                data = await _fetch_one(meter_id)
+            except TaipitError as err:
+                LOGGER.warning("Export of meter %s failed: %s", meter_id, err)
+                continue
+            await queue.put((meter_id, data))
+
+    workers = limiter.max_limit if limiter is not None else concurrency
+
+    async def _fetch_all() -> None:
+        tasks = [asyncio.create_task(_fetch()) for _ in range(workers)]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException as err:
+            # stop the other workers when one fails or the export is cancelled
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if not isinstance(err, asyncio.CancelledError):
+                await queue.put(None)
+            raise
+        await queue.put(None)
+
+    producer = asyncio.create_task(_fetch_all())
+    rows: list[dict[str, Any]] = []
+    total = 0
+    try:
+        while (item := await queue.get()) is not None:
+            rows.extend(iter_reading_rows(*item))
+            if len(rows) >= chunk_size:
+                await asyncio.to_thread(writer.write_rows, rows)
+                total += len(rows)
+                rows = []
+        await producer
+        if rows:
+            await asyncio.to_thread(writer.write_rows, rows)
+            total += len(rows)
+    finally:
+        if not producer.done():
+            producer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await producer
+    return total
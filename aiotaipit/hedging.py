@@ -0,0 +1,111 @@
+"""Hedged requests for idempotent reads."""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any, TypeVar
+
+from .const import (
+    HEDGE_BUDGET,
+    HEDGE_MAX_TOKENS,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_PATHS,
+    HEDGE_PERCENTILE,
+    HEDGE_WINDOW,
+)
+
+_T = TypeVar("_T")
+
+
+class TaipitHedgingPolicy:
+    """Send a duplicate GET when the first one is slower than usual.
+
+    If no response arrives within the `percentile` latency of the last
+    `window` requests (after `min_samples` of them), the request is sent
+    again; the first successful response wins and the other request is
+    cancelled. Only URLs starting with one of `paths` are hedged. Each
+    request earns `budget` of a hedge (at most `max_tokens` are saved), so
+    no more than `budget` extra requests are sent, also during outages.
+    """
+
+    def __init__(
+        self,
+        *,
+        percentile: float = HEDGE_PERCENTILE,
+        budget: float = HEDGE_BUDGET,
+        paths: Sequence[str] = HEDGE_PATHS,
+        min_samples: int = HEDGE_MIN_SAMPLES,
+        window: int = HEDGE_WINDOW,
+        max_tokens: float = HEDGE_MAX_TOKENS,
+    ) -> None:
+        """Initialize the policy."""
+        self._percentile = percentile
+        self._budget = budget
+        self._paths = tuple(paths)
+        self._min_samples = min_samples
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._max_tokens = max_tokens
+        self._tokens = 0.0
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def applies(self, method: str, url: str) -> bool:
+        """Return True if the request may be hedged."""
+        return method.upper() == "GET" and url.startswith(self._paths)
+
+    def get_delay(self) -> float | None:
+        """Return the latency after which a hedge is sent, None if unknown."""
+        if len(self._latencies) < self._min_samples:
+            return None
+        latencies = sorted(self._latencies)
+        index = min(len(latencies) - 1, int(len(latencies) * self._percentile))
+        return latencies[index]
+
+    def get_metrics(self) -> dict[str, Any]:
+        """Return hedging metrics."""
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "delay": self.get_delay(),
+        }
+
+    def _take_token(self) -> bool:
+        """Spend one hedge of the budget if available."""
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    async def async_run(self, send: Callable[[], Awaitable[_T]]) -> _T:
+        """Run `send()`, hedging it with a second call if it is slow."""
+        self.requests += 1
+        self._tokens = min(self._max_tokens, self._tokens + self._budget)
+        delay = self.get_delay()
+        started = time.monotonic()
+        first = asyncio.ensure_future(send())
+        tasks = {first}
+        try:
+            if delay is not None:
+                await asyncio.wait(tasks, timeout=delay)
+                if not first.done() and self._take_token():
+                    self.hedged += 1
+                    tasks.add(asyncio.ensure_future(send()))
+            pending = tasks
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        self._latencies.append(time.monotonic() - started)
+                        if task is not first:
+                            self.hedge_wins += 1
+                        return task.result()
+            return first.result()
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -1,12 +1,106 @@
 """Helpers and utils."""
 from __future__ import annotations
 
-from .const import METER_MODELS, REGIONS
+import asyncio
+from collections.abc import Iterable, Mapping
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from .const import (
+    LOGGER,
+    METER_MODELS,
+    REGIONS,
+    SECTION_METER_TYPES,
+    SECTION_METER_TYPES_FULL,
+    SECTION_REGIONS,
+)
+
+if TYPE_CHECKING:
+    from .api import TaipitApi
+
+_T = TypeVar("_T")
+
+
+def match_endpoint(path: str, values: Mapping[str, _T], default: _T) -> _T:
+    """Return the value of the longest prefix of the path, else `default`."""
+    result, best = default, -1
+    for prefix, value in values.items():
+        if len(prefix) > best and path.startswith(prefix):
+            result, best = value, len(prefix)
+    return result
+
+
+def normalize_region_name(name: str) -> str:
+    """Normalize region name for lookups (case, whitespace, 'ё')."""
+    return " ".join(name.casefold().replace("ё", "е").split())
+
+
+class _ReferenceIndex:
+    """Forward and reverse lookup tables for regions and meter models."""
+
+    def __init__(
+        self,
+        regions: Mapping[int, str],
+        models: Mapping[int, tuple[str | None, str]],
+    ) -> None:
+        """Build the index from region and model tables."""
+        self.regions: dict[int, str] = dict(regions)
+        self.models: dict[int, tuple[str | None, str]] = dict(models)
+        self.region_ids: dict[str, int] = {}
+        self.model_ids: dict[str, tuple[int, ...]] = {}
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        """Rebuild reverse indexes from forward tables."""
+        self.region_ids = {
+            normalize_region_name(name): region_id
+            for region_id, name in self.regions.items()
+        }
+        model_ids: dict[str, list[int]] = {}
+        for model_id, (manufacturer, _) in self.models.items():
+            if manufacturer is not None:
+                model_ids.setdefault(manufacturer.casefold(), []).append(model_id)
+        self.model_ids = {
+            manufacturer: tuple(sorted(ids))
+            for manufacturer, ids in model_ids.items()
+        }
+
+    def split_model_name(self, name: str) -> tuple[str | None, str]:
+        """Split a full model name into (manufacturer, model_name)."""
+        manufacturers = {
+            manufacturer
+            for manufacturer, _ in self.models.values()
+            if manufacturer is not None
+        }
+        for manufacturer in sorted(manufacturers, key=len, reverse=True):
+            if name.startswith(f"{manufacturer} "):
+                return manufacturer, name[len(manufacturer) + 1:]
+        return None, name
+
+    def merge(self, settings: Mapping[str, Any]) -> None:
+        """Merge `regions` and `meterTypes` sections of the settings response.
+
+        Region names from the cloud replace static ones. Static model names
+        are kept for known IDs because they are already split into
+        manufacturer and model; unknown models are added.
+        """
+        for item in settings.get(SECTION_REGIONS) or ():
+            self.regions[int(item["id"])] = item["name"]
+        for section in (SECTION_METER_TYPES, SECTION_METER_TYPES_FULL):
+            for item in settings.get(section) or ():
+                model_id = int(item["id"])
+                if model_id not in METER_MODELS:
+                    self.models[model_id] = self.split_model_name(item["name"])
+        self._rebuild()
+
+
+_INDEX = _ReferenceIndex(REGIONS, METER_MODELS)
+_settings_merged = False
+_settings_lock: asyncio.Lock | None = None
 
 
 def get_region_name(region_id: int) -> str:
     """Return region name by ID, or string ID if not found."""
-    return REGIONS.get(region_id, str(region_id))
+    return _INDEX.regions.get(region_id) or str(region_id)
 
 
 def get_model_name(model_id: int) -> tuple[str | None, str]:
@@ -14,4 +108,59 @@ def get_model_name(model_id: int) -> tuple[str | None, str]:
 
     Returns (None, str(model_id)) if the model is unknown.
     """
-    return METER_MODELS.get(model_id, (None, str(model_id)))
+    return _INDEX.models.get(model_id) or (None, str(model_id))
+
+
+def get_region_names(region_ids: Iterable[int]) -> list[str]:
+    """Return region names for a sequence of region IDs."""
+    regions = _INDEX.regions
+    return [regions.get(region_id) or str(region_id) for region_id in region_ids]
+
+
+def get_model_names(model_ids: Iterable[int]) -> list[tuple[str | None, str]]:
+    """Return (manufacturer, model_name) pairs for a sequence of model IDs."""
+    models = _INDEX.models
+    return [
+        models.get(model_id) or (None, str(model_id)) for model_id in model_ids
+    ]
+
+
+def get_region_id(name: str) -> int | None:
+    """Return region ID by name, or None if not found.
+
+    The name is matched case-insensitively, ignoring extra whitespace.
+    """
+    return _INDEX.region_ids.get(normalize_region_name(name))
+
+
+def get_model_ids(manufacturer: str) -> tuple[int, ...]:
+    """Return IDs of all known models of the manufacturer."""
+    return _INDEX.model_ids.get(manufacturer.casefold(), ())
+
+
+def merge_settings(settings: Mapping[str, Any]) -> None:
+    """Merge reference data from a settings response into the lookups."""
+    _INDEX.merge(settings)
+
+
+async def async_merge_settings(api: TaipitApi, *, force: bool = False) -> None:
+    """Fetch settings once per process and merge them into the lookups."""
+    global _settings_merged, _settings_lock
+
+    if _settings_merged and not force:
+        return
+    if _settings_lock is None:
+        _settings_lock = asyncio.Lock()
+    async with _settings_lock:
+        if _settings_merged and not force:
+            return
+        settings = await api.async_get_settings(
+            (SECTION_REGIONS, SECTION_METER_TYPES), refresh=force
+        )
+        merge_settings(settings)
+        _settings_merged = True
+        LOGGER.debug(
+            "Reference data merged, regions=%s, models=%s",
+            len(_INDEX.regions),
+            len(_INDEX.models),
+        )
@@ -0,0 +1,244 @@
+"""Fan-out of meter updates from one poller per account to many consumers."""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator, Hashable
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any
+
+from .api import TaipitApi
+from .const import CONF_ID, HUB_POLL_INTERVAL, HUB_QUEUE_SIZE, LOGGER
+from .exceptions import TaipitError
+
+
+class MeterEventType(StrEnum):
+    """Type of meter change."""
+
+    ADDED = "added"
+    UPDATED = "updated"
+    REMOVED = "removed"
+
+
+class OverflowPolicy(StrEnum):
+    """What to do when the queue of a subscriber is full."""
+
+    DROP_OLDEST = "drop_oldest"
+    BLOCK = "block"
+
+
+@dataclass(frozen=True, slots=True)
+class TaipitMeterEvent:
+    """Change of a meter. `meter` is the new state, None if removed."""
+
+    type: MeterEventType
+    meter_id: int
+    meter: dict[str, Any] | None
+
+
+class TaipitSubscription:
+    """Bounded queue of meter events of one subscriber.
+
+    `snapshot` holds the meters known when the subscription was made.
+    Iterate the subscription to receive events until it is closed.
+    """
+
+    def __init__(
+        self,
+        account: _Account,
+        snapshot: dict[int, dict[str, Any]],
+        maxsize: int,
+        policy: OverflowPolicy,
+    ) -> None:
+        """Initialize the subscription."""
+        self._account = account
+        self.snapshot = snapshot
+        self.policy = policy
+        self.dropped = 0
+        self._queue: asyncio.Queue[TaipitMeterEvent | None] = asyncio.Queue(
+            maxsize
+        )
+        self._closed = False
+        self._pending_put: asyncio.Future[None] | None = None
+
+    @property
+    def closed(self) -> bool:
+        """Return True if the subscription is closed."""
+        return self._closed
+
+    def _put_nowait(self, event: TaipitMeterEvent | None) -> None:
+        """Put the event, dropping the oldest one if the queue is full."""
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(event)
+
+    async def _async_put(self, event: TaipitMeterEvent) -> None:
+        """Deliver the event according to the overflow policy."""
+        if self._closed:
+            return
+        if self.policy is OverflowPolicy.BLOCK:
+            put = asyncio.ensure_future(self._queue.put(event))
+            self._pending_put = put
+            try:
+                await asyncio.wait((put,))
+            finally:
+                self._pending_put = None
+                put.cancel()
+        else:
+            self._put_nowait(event)
+
+    async def async_get(self) -> TaipitMeterEvent | None:
+        """Return the next event, None once the subscription is closed."""
+        if self._closed and self._queue.empty():
+            return None
+        return await self._queue.get()
+
+    def __aiter__(self) -> AsyncIterator[TaipitMeterEvent]:
+        """Iterate events until the subscription is closed."""
+        return self._iter()
+
+    async def _iter(self) -> AsyncIterator[TaipitMeterEvent]:
+        while (event := await self.async_get()) is not None:
+            yield event
+
+    def close(self) -> None:
+        """Unsubscribe. Pending events are discarded."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._pending_put is not None:
+            self._pending_put.cancel()
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+        self._account.unsubscribe(self)
+
+
+class _Account:
+    """Poller and subscribers of one account."""
+
+    def __init__(
+        self, hub: TaipitMeterHub, key: Hashable, api: TaipitApi
+    ) -> None:
+        self.hub = hub
+        self.key = key
+        self.api = api
+        self.meters: dict[int, dict[str, Any]] = {}
+        self.subscriptions: list[TaipitSubscription] = []
+        self.ready = asyncio.Event()
+        self.task: asyncio.Task[None] | None = None
+
+    def unsubscribe(self, subscription: TaipitSubscription) -> None:
+        """Remove the subscription, stop polling after the last one."""
+        with contextlib.suppress(ValueError):
+            self.subscriptions.remove(subscription)
+        if not self.subscriptions:
+            self.hub._remove_account(self)
+
+    def diff(self, meters: list[dict[str, Any]]) -> list[TaipitMeterEvent]:
+        """Update the known meters, return the changes."""
+        current = {meter[CONF_ID]: meter for meter in meters}
+        events = [
+            TaipitMeterEvent(
+                MeterEventType.ADDED
+                if meter_id not in self.meters
+                else MeterEventType.UPDATED,
+                meter_id,
+                meter,
+            )
+            for meter_id, meter in current.items()
+            if self.meters.get(meter_id) != meter
+        ]
+        events.extend(
+            TaipitMeterEvent(MeterEventType.REMOVED, meter_id, None)
+            for meter_id in self.meters
+            if meter_id not in current
+        )
+        self.meters = current
+        return events
+
+    async def async_poll(self) -> None:
+        """Poll meters and publish changes to the subscribers."""
+        while True:
+            try:
+                meters = await self.api.async_get_meters()
+            except TaipitError as err:
+                LOGGER.warning("Meter hub poll failed: %s", err)
+            else:
+                for event in self.diff(meters):
+                    for subscription in list(self.subscriptions):
+                        await subscription._async_put(event)
+            finally:
+                self.ready.set()
+            await asyncio.sleep(self.hub.poll_interval)
+
+
+class TaipitMeterHub:
+    """Poll `async_get_meters()` once per account and fan out changes.
+
+    The first subscription of an account starts its poller, closing the
+    last one stops it. Accounts are told apart by the `account` key of
+    `async_subscribe()`, `id(api)` by default. Each subscriber has its
+    own bounded queue: with `OverflowPolicy.DROP_OLDEST` a slow
+    subscriber loses the oldest events, with `OverflowPolicy.BLOCK` it
+    holds back the poller.
+    """
+
+    def __init__(self, *, poll_interval: float = HUB_POLL_INTERVAL) -> None:
+        """Initialize the hub."""
+        self.poll_interval = poll_interval
+        self._accounts: dict[Hashable, _Account] = {}
+
+    async def async_subscribe(
+        self,
+        api: TaipitApi,
+        *,
+        account: Hashable | None = None,
+        maxsize: int = HUB_QUEUE_SIZE,
+        policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+    ) -> TaipitSubscription:
+        """Subscribe to meter changes of the account of `api`.
+
+        Subscriptions with the same `account` key (e.g. the username) share
+        one poller, which uses the `api` of the first of them. Without a key
+        each `TaipitApi` instance is polled separately. Waits for the first
+        poll of the account, so the snapshot of the subscription is filled
+        unless that poll failed.
+        """
+        key = id(api) if account is None else account
+        poller = self._accounts.get(key)
+        if poller is None:
+            poller = self._accounts[key] = _Account(self, key, api)
+            poller.task = asyncio.create_task(poller.async_poll())
+        try:
+            await poller.ready.wait()
+        except asyncio.CancelledError:
+            if not poller.subscriptions:
+                self._remove_account(poller)
+            raise
+        subscription = TaipitSubscription(
+            poller, dict(poller.meters), maxsize, policy
+        )
+        poller.subscriptions.append(subscription)
+        return subscription
+
+    def _remove_account(self, account: _Account) -> None:
+        """Stop the poller of the account."""
+        if self._accounts.get(account.key) is account:
+            del self._accounts[account.key]
+        if account.task is not None:
+            account.task.cancel()
+
+    async def async_close(self) -> None:
+        """Close all subscriptions and stop the pollers."""
+        tasks = []
+        for account in list(self._accounts.values()):
+            tasks.append(account.task)
+            for subscription in list(account.subscriptions):
+                subscription.close()
+        for task in tasks:
+            if task is not None:
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
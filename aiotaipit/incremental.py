@@ -0,0 +1,108 @@
+"""Incremental (delta-aware) readings fetch."""
+from __future__ import annotations
+
+import hashlib
+from abc import ABC, abstractmethod
+from typing import Any, TypedDict
+
+from aiohttp import hdrs
+
+from .api import TaipitApi
+from .const import CONF_DATE, CONF_READINGS, LOGGER, PARAM_ID
+
+
+class ReadingsState(TypedDict, total=False):
+    """Last seen state of meter readings."""
+
+    last_date: str
+    etag: str
+    last_modified: str
+    digest: str
+
+
+class AbstractReadingsStore(ABC):
+    """Abstract storage of the last seen readings state per meter."""
+
+    @abstractmethod
+    async def async_get_state(self, meter_id: int) -> ReadingsState | None:
+        """Return the stored state for the meter."""
+
+    @abstractmethod
+    async def async_set_state(self, meter_id: int, state: ReadingsState) -> None:
+        """Store the state for the meter."""
+
+
+class MemoryReadingsStore(AbstractReadingsStore):
+    """In-memory readings state storage."""
+
+    def __init__(self) -> None:
+        """Initialize the store."""
+        self._states: dict[int, ReadingsState] = {}
+
+    async def async_get_state(self, meter_id: int) -> ReadingsState | None:
+        """Return the stored state for the meter."""
+        return self._states.get(meter_id)
+
+    async def async_set_state(self, meter_id: int, state: ReadingsState) -> None:
+        """Store the state for the meter."""
+        self._states[meter_id] = state
+
+
+class TaipitIncrementalReadings:
+    """Fetch only readings that are newer than the last seen ones.
+
+    Conditional request headers are sent when the server provided an
+    `ETag` or `Last-Modified`. If the body is byte-for-byte the same as
+    the previous one, it is not decoded at all.
+    """
+
+    def __init__(
+        self,
+        api: TaipitApi,
+        store: AbstractReadingsStore | None = None,
+    ) -> None:
+        """Initialize with the API and an optional state store."""
+        self._api = api
+        self._store = store if store is not None else MemoryReadingsStore()
+
+    async def async_get_new_readings(self, meter_id: int) -> list[dict[str, Any]]:
+        """Return readings of the meter added since the previous call."""
+        state = await self._store.async_get_state(meter_id) or ReadingsState()
+        headers: dict[str, str] = {}
+        if "etag" in state:
+            headers[hdrs.IF_NONE_MATCH] = state["etag"]
+        if "last_modified" in state:
+            headers[hdrs.IF_MODIFIED_SINCE] = state["last_modified"]
+
+        response = await self._api.async_get_raw(
+            "bmd/all", params={PARAM_ID: meter_id}, headers=headers
+        )
+        if response.status == 304:
+            LOGGER.debug("Readings not modified, meter_id=%s", meter_id)
+            return []
+        digest = hashlib.blake2b(response.body, digest_size=16).hexdigest()
+        if digest == state.get("digest"):
+            LOGGER.debug("Readings unchanged, meter_id=%s", meter_id)
+            return []
+
+        data = response.json() or {}
+        last_date = state.get("last_date")
+        new_readings = [
+            reading
+            for reading in data.get(CONF_READINGS) or ()
+            if last_date is None or str(reading[CONF_DATE]) > last_date
+        ]
+
+        new_state = ReadingsState(digest=digest)
+        dates = [str(reading[CONF_DATE]) for reading in new_readings]
+        if dates:
+            new_state["last_date"] = max(dates)
+        elif last_date is not None:
+            new_state["last_date"] = last_date
+        if etag := response.headers.get(hdrs.ETAG):
+            new_state["etag"] = etag
+        if last_modified := response.headers.get(hdrs.LAST_MODIFIED):
+            new_state["last_modified"] = last_modified
+        await self._store.async_set_state(meter_id, new_state)
+
+        return new_readings
@@ -0,0 +1,177 @@
+"""Adaptive concurrency limit for bulk operations."""
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+from typing import Any
+
+from aiohttp import ClientResponseError
+
+from .const import (
+    DEFAULT_CONCURRENCY,
+    LIMITER_DECREASE_FACTOR,
+    LIMITER_MAX_LIMIT,
+    LIMITER_TARGET_LATENCY,
+    LIMITER_WINDOW,
+    LOGGER,
+)
+from .exceptions import TaipitDeadlineExceeded, TaipitTimeoutError
+
+
+def is_overload(err: BaseException) -> bool:
+    """Return True if the error means the backend is overloaded.
+
+    Timeouts, 429 and 5xx responses count, also when wrapped in
+    `TaipitApiError`. An exceeded caller deadline does not.
+    """
+    for item in (err, err.__cause__):
+        if isinstance(item, TaipitDeadlineExceeded):
+            return False
+        if isinstance(item, (TimeoutError, TaipitTimeoutError)):
+            return True
+        if isinstance(item, ClientResponseError):
+            return item.status == 429 or item.status >= 500
+    return False
+
+
+class TaipitAdaptiveLimiter:
+    """Concurrency limit adjusted by AIMD from latency and errors.
+
+    After every `limit` successful requests the limit grows by one while
+    the p95 latency of the last `window` requests stays within
+    `target_latency`. Overload errors (see `is_overload()`) multiply the
+    limit by `decrease_factor`, at most once per p95 latency so that one
+    burst of failures cuts it once.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial_limit: int = DEFAULT_CONCURRENCY,
+        min_limit: int = 1,
+        max_limit: int = LIMITER_MAX_LIMIT,
+        target_latency: float = LIMITER_TARGET_LATENCY,
+        decrease_factor: float = LIMITER_DECREASE_FACTOR,
+        window: int = LIMITER_WINDOW,
+    ) -> None:
+        """Initialize the limiter."""
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Expected 1 <= min_limit <= initial_limit <= max_limit")
+        self._limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self._target_latency = target_latency
+        self._decrease_factor = decrease_factor
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._successes = 0
+        self._last_decrease = -math.inf
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self.increases = 0
+        self.decreases = 0
+
+    @property
+    def limit(self) -> int:
+        """Return the current concurrency limit."""
+        return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        """Return the number of requests holding a slot."""
+        return self._in_flight
+
+    def get_p95_latency(self) -> float | None:
+        """Return the p95 latency of recent successful requests."""
+        if not self._latencies:
+            return None
+        latencies = sorted(self._latencies)
+        return latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+
+    def get_metrics(self) -> dict[str, Any]:
+        """Return the current limit and related metrics."""
+        return {
+            "limit": self._limit,
+            "in_flight": self._in_flight,
+            "waiting": len(self._waiters),
+            "p95_latency": self.get_p95_latency(),
+            "increases": self.increases,
+            "decreases": self.decreases,
+        }
+
+    def _wake(self) -> None:
+        """Hand free slots to waiters."""
+        while self._waiters and self._in_flight < self._limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    async def _acquire(self) -> None:
+        """Wait for a free slot."""
+        if self._in_flight < self._limit and not self._waiters:
+            self._in_flight += 1
+            return
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._in_flight -= 1
+                self._wake()
+            else:
+                # _wake() may have popped the cancelled waiter already
+                with suppress(ValueError):
+                    self._waiters.remove(waiter)
+            raise
+
+    def _on_success(self, latency: float) -> None:
+        """Record a successful request, grow the limit after a full round."""
+        self._latencies.append(latency)
+        self._successes += 1
+        if self._successes < self._limit:
+            return
+        self._successes = 0
+        p95 = self.get_p95_latency()
+        if (
+            p95 is not None
+            and p95 <= self._target_latency
+            and self._limit < self.max_limit
+        ):
+            self._limit += 1
+            self.increases += 1
+
+    def _on_overload(self) -> None:
+        """Cut the limit, once per p95 latency."""
+        now = time.monotonic()
+        cooldown = self.get_p95_latency() or self._target_latency
+        if now - self._last_decrease < cooldown:
+            return
+        self._last_decrease = now
+        self._successes = 0
+        limit = max(self.min_limit, int(self._limit * self._decrease_factor))
+        if limit != self._limit:
+            LOGGER.debug("Concurrency limit decreased %s -> %s", self._limit, limit)
+            self._limit = limit
+            self.decreases += 1
+
+    @asynccontextmanager
+    async def async_slot(self) -> AsyncIterator[None]:
+        """Hold a slot for one request made inside the block."""
+        await self._acquire()
+        started = time.monotonic()
+        try:
+            yield
+        except Exception as err:
+            if is_overload(err):
+                self._on_overload()
+            raise
+        else:
+            self._on_success(time.monotonic() - started)
+        finally:
+            self._in_flight -= 1
+            self._wake()
@@ -0,0 +1,90 @@
+"""Size-capped, sampled logging of API responses."""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from .const import LOG_BODY_MAX_CHARS, LOGGER
+from .transport import TaipitResponse
+
+
+def count_items(data: Any) -> dict[str, int] | int | None:
+    """Return the element count of decoded JSON.
+
+    Lists give their length, objects give the length of each top-level
+    list (or the number of keys if there are none).
+    """
+    if isinstance(data, list):
+        return len(data)
+    if isinstance(data, dict):
+        counts = {
+            key: len(value) for key, value in data.items() if isinstance(value, list)
+        }
+        return counts or len(data)
+    return None
+
+
+class TaipitPayloadLogger:
+    """Log a summary of API responses without formatting whole payloads.
+
+    Each logged response has its status, body size, element counts and a
+    preview of at most `max_body` characters, also available to handlers
+    as the `taipit` attribute of the record. Only one of `sample_rate`
+    responses is logged. Nothing is computed unless the logger is
+    enabled for `level`.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_body: int = LOG_BODY_MAX_CHARS,
+        sample_rate: int = 1,
+        level: int = logging.DEBUG,
+        logger: logging.Logger = LOGGER,
+    ) -> None:
+        """Initialize the payload logger."""
+        if sample_rate < 1:
+            raise ValueError("sample_rate must be at least 1")
+        self._max_body = max_body
+        self._sample_rate = sample_rate
+        self._level = level
+        self._logger = logger
+        self._count = 0
+
+    def is_enabled(self) -> bool:
+        """Return True if responses are logged at all."""
+        return self._logger.isEnabledFor(self._level)
+
+    def log_response(
+        self, method: str, url: str, response: TaipitResponse, data: Any
+    ) -> None:
+        """Log a response if enabled and sampled."""
+        if not self._logger.isEnabledFor(self._level):
+            return
+        self._count += 1
+        if self._count % self._sample_rate:
+            return
+        body = response.body
+        preview = body[: self._max_body].decode("utf-8", "replace")
+        if len(body) > self._max_body:
+            preview += "..."
+        items = count_items(data)
+        self._logger.log(
+            self._level,
+            "Response %s %s status=%s size=%s items=%s body=%s",
+            method,
+            url,
+            response.status,
+            len(body),
+            items,
+            preview,
+            extra={
+                "taipit": {
+                    "method": method,
+                    "url": url,
+                    "status": response.status,
+                    "size": len(body),
+                    "items": items,
+                }
+            },
+        )
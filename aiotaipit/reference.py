@@ -0,0 +1,181 @@
+"""Reference data registry for Taipit regions, meter models and controllers."""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .const import (
+    DEFAULT_REFERENCE_TTL,
+    LOGGER,
+    METER_MODELS,
+    REFERENCE_RETRY_SEC,
+    REGIONS,
+    SECTION_CONTROLLERS,
+    SECTIONS_REFERENCE,
+)
+from .exceptions import TaipitError
+from .helpers import _ReferenceIndex, merge_settings
+
+if TYPE_CHECKING:
+    from .api import TaipitApi
+
+
+class TaipitReferenceData:
+    """Registry of reference data loaded from the Taipit settings.
+
+    The `regions`, `meterTypesFull` and `controllers` sections are fetched
+    once, optionally persisted to a local snapshot file and refreshed in
+    the background every `ttl` seconds. Lookups are served from memory;
+    the static tables from `const` are used for anything the cloud
+    did not return.
+    """
+
+    def __init__(
+        self,
+        api: TaipitApi,
+        *,
+        snapshot_path: str | Path | None = None,
+        ttl: float = DEFAULT_REFERENCE_TTL,
+    ) -> None:
+        """Initialize the registry."""
+        self._api = api
+        self._snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self._ttl = ttl
+        self._index = _ReferenceIndex(REGIONS, METER_MODELS)
+        self._controllers: dict[int, dict[str, Any]] = {}
+        self._updated_at: float | None = None
+        self._lock = asyncio.Lock()
+        self._refresh_task: asyncio.Task[None] | None = None
+
+    @property
+    def updated_at(self) -> float | None:
+        """Return the time of the last successful update."""
+        return self._updated_at
+
+    @property
+    def is_stale(self) -> bool:
+        """Return True if the data was never loaded or is older than TTL."""
+        return (
+            self._updated_at is None
+            or time.time() - self._updated_at >= self._ttl
+        )
+
+    def get_region_name(self, region_id: int) -> str:
+        """Return region name by ID, or string ID if not found."""
+        return self._index.regions.get(region_id) or str(region_id)
+
+    def get_model_name(self, model_id: int) -> tuple[str | None, str]:
+        """Return (manufacturer, model_name) by model ID."""
+        return self._index.models.get(model_id) or (None, str(model_id))
+
+    def get_controller(self, controller_id: int) -> dict[str, Any] | None:
+        """Return controller description by ID."""
+        return self._controllers.get(controller_id)
+
+    def _apply(self, settings: dict[str, Any], updated_at: float) -> None:
+        """Replace in-memory data with the settings sections."""
+        index = _ReferenceIndex(REGIONS, METER_MODELS)
+        index.merge(settings)
+        self._index = index
+        self._controllers = {
+            int(item["id"]): item
+            for item in settings.get(SECTION_CONTROLLERS) or ()
+        }
+        self._updated_at = updated_at
+        merge_settings(settings)
+
+    def _read_snapshot(self) -> dict[str, Any] | None:
+        """Read the snapshot file, return None if missing or broken."""
+        assert self._snapshot_path is not None
+        try:
+            with self._snapshot_path.open(encoding="utf-8") as f:
+                snapshot: dict[str, Any] = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as err:
+            LOGGER.warning("Unable to read reference snapshot: %s", err)
+            return None
+        if "settings" not in snapshot or "updated_at" not in snapshot:
+            return None
+        return snapshot
+
+    def _write_snapshot(self, settings: dict[str, Any], updated_at: float) -> None:
+        """Write the snapshot file atomically."""
+        assert self._snapshot_path is not None
+        tmp_path = self._snapshot_path.with_name(f"{self._snapshot_path.name}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(
+                {"updated_at": updated_at, "settings": settings},
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_path, self._snapshot_path)
+
+    async def async_load(self) -> None:
+        """Load data from the snapshot, or from the cloud if it is stale.
+
+        A stale snapshot is kept if the cloud is unavailable.
+        """
+        if self._snapshot_path is not None and self._updated_at is None:
+            snapshot = await asyncio.to_thread(self._read_snapshot)
+            if snapshot is not None:
+                self._apply(snapshot["settings"], float(snapshot["updated_at"]))
+                LOGGER.debug("Reference data loaded from %s", self._snapshot_path)
+        if not self.is_stale:
+            return
+        try:
+            await self.async_refresh()
+        except TaipitError as err:
+            if self._updated_at is None:
+                raise
+            LOGGER.warning("Using stale reference snapshot: %s", err)
+
+    async def async_refresh(self) -> None:
+        """Fetch reference data from the cloud and update the snapshot."""
+        async with self._lock:
+            settings = await self._api.async_get_settings(
+                SECTIONS_REFERENCE, refresh=True
+            )
+            updated_at = time.time()
+            self._apply(settings, updated_at)
+            if self._snapshot_path is not None:
+                await asyncio.to_thread(self._write_snapshot, settings, updated_at)
+        LOGGER.debug(
+            "Reference data refreshed, regions=%s, models=%s, controllers=%s",
+            len(self._index.regions),
+            len(self._index.models),
+            len(self._controllers),
+        )
+
+    async def _async_refresh_loop(self) -> None:
+        """Refresh data in the background when it becomes stale."""
+        while True:
+            if self._updated_at is None:
+                delay = 0.0
+            else:
+                delay = max(0.0, self._updated_at + self._ttl - time.time())
+            await asyncio.sleep(delay)
+            try:
+                await self.async_refresh()
+            except (TaipitError, OSError) as err:
+                LOGGER.warning("Reference data refresh failed: %s", err)
+                await asyncio.sleep(min(self._ttl, REFERENCE_RETRY_SEC))
+
+    async def async_start(self) -> None:
+        """Load data and start the background refresh."""
+        await self.async_load()
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._async_refresh_loop())
+
+    async def async_stop(self) -> None:
+        """Stop the background refresh."""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._refresh_task
+            self._refresh_task = None
@@ -0,0 +1,256 @@
+"""Compact in-memory registry of meters."""
+from __future__ import annotations
+
+import math
+import sys
+from array import array
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from .aggregate import _to_float
+from .const import (
+    CONF_ECOMETER_DATA,
+    CONF_ID,
+    CONF_LAST_READING,
+    CONF_METERNAME,
+    CONF_REGION_ID,
+    CONF_SN,
+    CONF_STATUS,
+    CONF_TYPE,
+    ENERGY_FIELDS,
+)
+from .helpers import get_model_name, get_region_name
+
+_NONE = -1
+
+
+def _to_int(value: Any) -> int:
+    """Convert an optional integer field, -1 if missing."""
+    return _NONE if value is None else int(value)
+
+
+def _intern(value: Any) -> str | None:
+    """Intern a string field so equal values share one object."""
+    return None if value is None else sys.intern(str(value))
+
+
+class TaipitMeterRegistry:
+    """Latest `meter/list-all` snapshot in parallel typed arrays.
+
+    Every meter is one row of the arrays: `id`, `type`, `status` and
+    `regionId` as integers, the last reading `ENERGY_FIELDS` as doubles
+    and interned `metername`/`sn` strings. Model and region names are
+    resolved from the shared reference tables instead of being stored.
+    Lookup and update by meter ID are O(1); meters are also indexed by
+    type and status. Other fields of the meter list are not kept.
+    """
+
+    __slots__ = (
+        "_index",
+        "_ids",
+        "_types",
+        "_statuses",
+        "_regions",
+        "_energy",
+        "_names",
+        "_serials",
+        "_by_type",
+        "_by_status",
+    )
+
+    def __init__(self, meters: Iterable[dict[str, Any]] = ()) -> None:
+        """Initialize the registry, optionally with a snapshot."""
+        self._index: dict[int, int] = {}
+        self._ids = array("q")
+        self._types = array("i")
+        self._statuses = array("i")
+        self._regions = array("i")
+        self._energy: tuple[array[float], ...] = tuple(
+            array("d") for _ in ENERGY_FIELDS
+        )
+        self._names: list[str | None] = []
+        self._serials: list[str | None] = []
+        self._by_type: dict[int, set[int]] = {}
+        self._by_status: dict[int, set[int]] = {}
+        for meter in meters:
+            self.set_meter(meter)
+
+    def __len__(self) -> int:
+        """Return the number of meters."""
+        return len(self._ids)
+
+    def __contains__(self, meter_id: object) -> bool:
+        """Return True if the meter is known."""
+        return meter_id in self._index
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate over meter IDs."""
+        return iter(self._index)
+
+    def get(self, meter_id: int) -> dict[str, Any] | None:
+        """Return the meter in the `meter/list-all` shape, None if unknown."""
+        row = self._index.get(meter_id)
+        if row is None:
+            return None
+        meter: dict[str, Any] = {
+            CONF_ID: self._ids[row],
+            CONF_METERNAME: self._names[row],
+            CONF_SN: self._serials[row],
+            CONF_TYPE: self._get_optional(self._types, row),
+            CONF_STATUS: self._get_optional(self._statuses, row),
+        }
+        if (region_id := self._regions[row]) != _NONE:
+            meter[CONF_REGION_ID] = region_id
+        last_reading = {
+            field: column[row]
+            for field, column in zip(ENERGY_FIELDS, self._energy)
+            if not math.isnan(column[row])
+        }
+        if last_reading:
+            meter[CONF_ECOMETER_DATA] = {CONF_LAST_READING: last_reading}
+        return meter
+
+    @staticmethod
+    def _get_optional(column: array[int], row: int) -> int | None:
+        """Return an integer field, None if missing."""
+        value = column[row]
+        return None if value == _NONE else value
+
+    def get_energy(self, meter_id: int, field: str = ENERGY_FIELDS[0]) -> float:
+        """Return a last reading field of the meter, NaN if missing."""
+        return self._energy[ENERGY_FIELDS.index(field)][self._index[meter_id]]
+
+    def get_model_name(self, meter_id: int) -> tuple[str | None, str]:
+        """Return (manufacturer, model_name) of the meter."""
+        return get_model_name(self._types[self._index[meter_id]])
+
+    def get_region_name(self, meter_id: int) -> str | None:
+        """Return the region name of the meter, None if unknown."""
+        region_id = self._regions[self._index[meter_id]]
+        return None if region_id == _NONE else get_region_name(region_id)
+
+    def ids_by_type(self, meter_type: int) -> frozenset[int]:
+        """Return IDs of meters of the type (model ID)."""
+        return frozenset(self._by_type.get(meter_type, ()))
+
+    def ids_by_status(self, status: int) -> frozenset[int]:
+        """Return IDs of meters with the status."""
+        return frozenset(self._by_status.get(status, ()))
+
+    @staticmethod
+    def _index_add(index: dict[int, set[int]], key: int, meter_id: int) -> None:
+        """Add the meter to a secondary index."""
+        index.setdefault(key, set()).add(meter_id)
+
+    @staticmethod
+    def _index_remove(index: dict[int, set[int]], key: int, meter_id: int) -> None:
+        """Remove the meter from a secondary index."""
+        ids = index[key]
+        ids.discard(meter_id)
+        if not ids:
+            del index[key]
+
+    def set_meter(self, meter: dict[str, Any]) -> bool:
+        """Add or update a meter in place, return True if it changed."""
+        meter_id = int(meter[CONF_ID])
+        meter_type = _to_int(meter.get(CONF_TYPE))
+        status = _to_int(meter.get(CONF_STATUS))
+        region_id = _to_int(meter.get(CONF_REGION_ID))
+        name = _intern(meter.get(CONF_METERNAME))
+        serial = _intern(meter.get(CONF_SN))
+        last_reading = (meter.get(CONF_ECOMETER_DATA) or {}).get(
+            CONF_LAST_READING
+        ) or {}
+        energy = [_to_float(last_reading.get(field)) for field in ENERGY_FIELDS]
+
+        row = self._index.get(meter_id)
+        if row is None:
+            self._index[meter_id] = len(self._ids)
+            self._ids.append(meter_id)
+            self._types.append(meter_type)
+            self._statuses.append(status)
+            self._regions.append(region_id)
+            for column, value in zip(self._energy, energy):
+                column.append(value)
+            self._names.append(name)
+            self._serials.append(serial)
+            self._index_add(self._by_type, meter_type, meter_id)
+            self._index_add(self._by_status, status, meter_id)
+            return True
+
+        changed = False
+        if self._types[row] != meter_type:
+            self._index_remove(self._by_type, self._types[row], meter_id)
+            self._index_add(self._by_type, meter_type, meter_id)
+            self._types[row] = meter_type
+            changed = True
+        if self._statuses[row] != status:
+            self._index_remove(self._by_status, self._statuses[row], meter_id)
+            self._index_add(self._by_status, status, meter_id)
+            self._statuses[row] = status
+            changed = True
+        if self._regions[row] != region_id:
+            self._regions[row] = region_id
+            changed = True
+        for column, value in zip(self._energy, energy):
+            old = column[row]
+            if old != value and not (math.isnan(old) and math.isnan(value)):
+                column[row] = value
+                changed = True
+        if self._names[row] != name:
+            self._names[row] = name
+            changed = True
+        if self._serials[row] != serial:
+            self._serials[row] = serial
+            changed = True
+        return changed
+
+    def remove_meter(self, meter_id: int) -> bool:
+        """Remove the meter, return False if it is unknown.
+
+        The last row is moved into the freed row, so removal is O(1).
+        """
+        row = self._index.pop(meter_id, None)
+        if row is None:
+            return False
+        self._index_remove(self._by_type, self._types[row], meter_id)
+        self._index_remove(self._by_status, self._statuses[row], meter_id)
+        last = len(self._ids) - 1
+        columns: list[Any] = [
+            self._ids,
+            self._types,
+            self._statuses,
+            self._regions,
+            *self._energy,
+            self._names,
+            self._serials,
+        ]
+        if row != last:
+            for column in columns:
+                column[row] = column[last]
+            self._index[self._ids[row]] = row
+        for column in columns:
+            column.pop()
+        return True
+
+    def apply_snapshot(self, meters: Iterable[dict[str, Any]]) -> dict[str, int]:
+        """Apply a full snapshot in place.
+
+        Meters missing from the snapshot are removed. Return the number of
+        `added`, `updated` and `removed` meters.
+        """
+        seen = bytearray(len(self._ids))
+        added = updated = 0
+        for meter in meters:
+            row = self._index.get(int(meter[CONF_ID]))
+            if row is None:
+                self.set_meter(meter)
+                added += 1
+                continue
+            seen[row] = 1
+            if self.set_meter(meter):
+                updated += 1
+        stale = [self._ids[row] for row, flag in enumerate(seen) if not flag]
+        for meter_id in stale:
+            self.remove_meter(meter_id)
+        return {"added": added, "updated": updated, "removed": len(stale)}
@@ -0,0 +1,243 @@
+"""Local server exposing the Taipit API from one shared upstream client."""
+from __future__ import annotations
+
+import asyncio
+import secrets
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+
+from aiohttp import ClientResponseError, web
+
+from .api import TaipitApi
+from .const import (
+    DEFAULT_API_URL,
+    DEFAULT_SERVER_HOST,
+    DEFAULT_SERVER_PORT,
+    DEFAULT_TOKEN_URL,
+    LOGGER,
+    SERVER_CACHE_MAX_ENTRIES,
+    SERVER_CACHE_TTL,
+    SERVER_CLIENT_ID,
+    SERVER_TOKEN_EXPIRES_IN,
+)
+from .exceptions import TaipitError, TaipitTimeoutError
+from .helpers import match_endpoint
+from .transport import TaipitResponse
+
+SERVER_PATHS: tuple[str, ...] = (
+    "meter/list-all",
+    "meter/list-owner",
+    "meter/get-id",
+    "meter/tariff/",
+    "bmd/all",
+    "user/getuser",
+    "user/getuserinfo/",
+    "warnings/list",
+    "config/settings",
+)
+
+_PASS_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+_CacheKey = tuple[str, tuple[tuple[str, str], ...]]
+
+
+class TaipitServer:
+    """Serve Taipit API paths from a shared `TaipitApi` with caching.
+
+    Responses are cached for `cache_ttl` seconds (or the longest matching
+    prefix of `endpoint_ttls`), at most `max_entries` of them with the
+    least recently used evicted first, and concurrent requests for the same
+    path and query share one upstream request. Upstream 401 and 403 errors
+    are returned as 502, so they are not taken for the client's own
+    authentication failing. API requests must carry
+    `access_token` (random if not set). Clients either get it from the
+    token endpoint, which requires `client_id` and `client_secret`
+    (disabled without `client_secret`), or are configured with it as
+    their token.
+    """
+
+    def __init__(
+        self,
+        api: TaipitApi,
+        *,
+        cache_ttl: float = SERVER_CACHE_TTL,
+        endpoint_ttls: Mapping[str, float] | None = None,
+        max_entries: int = SERVER_CACHE_MAX_ENTRIES,
+        access_token: str | None = None,
+        client_id: str = SERVER_CLIENT_ID,
+        client_secret: str | None = None,
+    ) -> None:
+        """Initialize the server."""
+        self._api = api
+        self._cache_ttl = cache_ttl
+        self._endpoint_ttls = dict(endpoint_ttls or {})
+        self._max_entries = max_entries
+        self._access_token = access_token or secrets.token_urlsafe(32)
+        self._client_id = client_id
+        self._client_secret = client_secret
+        self._cache: OrderedDict[_CacheKey, tuple[float, TaipitResponse]] = (
+            OrderedDict()
+        )
+        self._inflight: dict[_CacheKey, asyncio.Task[TaipitResponse]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def create_app(self) -> web.Application:
+        """Return the aiohttp application."""
+        app = web.Application()
+        app.router.add_route("*", f"/{DEFAULT_TOKEN_URL}", self._handle_token)
+        app.router.add_get(f"/{DEFAULT_API_URL}/{{path:.+}}", self._handle_api)
+        return app
+
+    def get_metrics(self) -> dict[str, int]:
+        """Return cache metrics."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "entries": len(self._cache),
+            "inflight": len(self._inflight),
+        }
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        self._cache.clear()
+
+    def _get_ttl(self, path: str) -> float:
+        """Return the cache TTL of the path."""
+        return match_endpoint(path, self._endpoint_ttls, self._cache_ttl)
+
+    def _check_client(self, data: Mapping[str, str]) -> bool:
+        """Return True if the request carries the configured client."""
+        if self._client_secret is None:
+            return False
+        client_ok = _equal(data.get("client_id", ""), self._client_id)
+        secret_ok = _equal(data.get("client_secret", ""), self._client_secret)
+        return client_ok and secret_ok
+
+    async def _handle_token(self, request: web.Request) -> web.Response:
+        """Issue the local token to the configured client."""
+        data: dict[str, str] = dict(request.query)
+        if request.method == "POST":
+            data.update(
+                (key, value)
+                for key, value in (await request.post()).items()
+                if isinstance(value, str)
+            )
+        if not self._check_client(data):
+            return _token_error("invalid_client", "Client authentication failed")
+        grant_type = data.get("grant_type")
+        if grant_type == "refresh_token":
+            if not _equal(data.get("refresh_token", ""), self._access_token):
+                return _token_error("invalid_grant", "Invalid refresh token")
+        elif grant_type != "password":
+            return _token_error("invalid_grant", "Unsupported grant type")
+        return web.json_response(
+            {
+                "access_token": self._access_token,
+                "refresh_token": self._access_token,
+                "expires_in": SERVER_TOKEN_EXPIRES_IN,
+                "token_type": "bearer",
+                "scope": None,
+            }
+        )
+
+    async def _handle_api(self, request: web.Request) -> web.StreamResponse:
+        """Serve an API path from the cache or the upstream client."""
+        if request.headers.get("Authorization") != f"Bearer {self._access_token}":
+            return web.json_response({"error": "invalid_token"}, status=401)
+        path = request.match_info["path"]
+        if not path.startswith(SERVER_PATHS):
+            raise web.HTTPNotFound()
+        try:
+            response = await self.async_get(path, request.query)
+        except TaipitTimeoutError as err:
+            return web.json_response({"error": str(err)}, status=504)
+        except TaipitError as err:
+            status = 502
+            if isinstance(err.__cause__, ClientResponseError) and (
+                err.__cause__.status not in (401, 403)
+            ):
+                status = err.__cause__.status
+            return web.json_response({"error": str(err)}, status=status)
+
+        headers = {
+            name: response.headers[name]
+            for name in _PASS_HEADERS
+            if name in response.headers
+        }
+        etag = headers.get("ETag")
+        if etag is not None and request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        headers.setdefault("Content-Type", "application/json")
+        return web.Response(body=response.body, headers=headers)
+
+    async def async_get(
+        self, path: str, params: Mapping[str, str] | None = None
+    ) -> TaipitResponse:
+        """Return the cached response, sharing one upstream request."""
+        key: _CacheKey = (path, tuple(sorted((params or {}).items())))
+        cached = self._cache.get(key)
+        if cached is not None:
+            if cached[0] > time.monotonic():
+                self.hits += 1
+                self._cache.move_to_end(key)
+                return cached[1]
+            del self._cache[key]
+        task = self._inflight.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.create_task(self._async_fetch(key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._fetch_done(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _fetch_done(
+        self, key: _CacheKey, task: asyncio.Task[TaipitResponse]
+    ) -> None:
+        """Forget the finished upstream request."""
+        self._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            LOGGER.debug("Upstream request %s failed: %s", key[0], task.exception())
+
+    async def _async_fetch(self, key: _CacheKey) -> TaipitResponse:
+        """Fetch the response from upstream and cache it."""
+        path, params = key
+        response = await self._api.async_get_raw(path, params=dict(params))
+        self._cache.pop(key, None)
+        while self._cache and len(self._cache) >= self._max_entries:
+            self._cache.popitem(last=False)
+        self._cache[key] = (time.monotonic() + self._get_ttl(path), response)
+        return response
+
+
+def _equal(value: str, expected: str) -> bool:
+    """Compare secrets in constant time."""
+    return secrets.compare_digest(value.encode(), expected.encode())
+
+
+def _token_error(error: str, description: str) -> web.Response:
+    """Return an OAuth error response."""
+    return web.json_response(
+        {"error": error, "error_description": description}, status=400
+    )
+
+
+async def async_serve(
+    server: TaipitServer,
+    host: str = DEFAULT_SERVER_HOST,
+    port: int = DEFAULT_SERVER_PORT,
+) -> None:
+    """Run the server until cancelled."""
+    runner = web.AppRunner(server.create_app())
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, host, port).start()
+        LOGGER.info("Serving Taipit API on http://%s:%s", host, port)
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
@@ -0,0 +1,235 @@
+"""Synchronous wrapper for the Taipit API."""
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from collections.abc import Callable, Coroutine, Iterable
+from typing import Any, TypeVar
+
+from aiohttp import ClientSession
+
+from .api import TaipitApi
+from .auth import SimpleTaipitAuth
+from .const import (
+    DEFAULT_API_URL,
+    DEFAULT_BASE_URL,
+    DEFAULT_CLIENT_ID,
+    DEFAULT_CLIENT_SECRET,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_TOKEN_URL,
+    SECTIONS_ALL,
+)
+from .limiter import TaipitAdaptiveLimiter
+from .timeouts import taipit_deadline
+
+_T = TypeVar("_T")
+
+
+class TaipitSyncApi:
+    """Thread-safe synchronous client for the Taipit API.
+
+    All calls are dispatched to one event loop running in a background
+    thread, which owns a persistent `ClientSession` and `SimpleTaipitAuth`,
+    so the connection pool and the token are shared by every caller.
+    """
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        *,
+        client_id: str = DEFAULT_CLIENT_ID,
+        client_secret: str = DEFAULT_CLIENT_SECRET,
+        base_url: str = DEFAULT_BASE_URL,
+        token_url: str = DEFAULT_TOKEN_URL,
+        api_url: str = DEFAULT_API_URL,
+        token: dict[str, Any] | None = None,
+        token_update_callback: Callable[[dict[str, Any]], None] | None = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        limiter: TaipitAdaptiveLimiter | None = None,
+    ) -> None:
+        """Initialize the client. The loop thread is started on first call.
+
+        Batch methods run at most `concurrency` requests at once, or as many
+        as `limiter` allows.
+        """
+        self._auth_kwargs: dict[str, Any] = {
+            "client_id": client_id,
+            "client_secret": client_secret,
+            "base_url": base_url,
+            "token_url": token_url,
+            "token": token,
+            "token_update_callback": token_update_callback,
+        }
+        self._username = username
+        self._password = password
+        self._api_url = api_url
+        self._concurrency = concurrency
+        self._limiter = limiter
+        self._start_lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._session: ClientSession | None = None
+        self._api: TaipitApi | None = None
+        self._pending: set[Future[Any]] = set()
+
+    def __enter__(self) -> TaipitSyncApi:
+        """Start the client."""
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the client."""
+        self.close()
+
+    async def _async_setup(self) -> TaipitApi:
+        """Create the session and API inside the loop thread."""
+        self._session = ClientSession()
+        auth = SimpleTaipitAuth(
+            self._username,
+            self._password,
+            self._session,
+            **self._auth_kwargs,
+        )
+        return TaipitApi(auth, api_url=self._api_url)
+
+    def start(self) -> None:
+        """Start the background event loop thread."""
+        with self._start_lock:
+            self._start()
+
+    def _start(self) -> None:
+        """Start the loop thread unless running, with the lock held."""
+        if self._loop is not None:
+            return
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(
+            target=loop.run_forever, name="aiotaipit", daemon=True
+        )
+        thread.start()
+        self._api = asyncio.run_coroutine_threadsafe(
+            self._async_setup(), loop
+        ).result()
+        self._loop = loop
+        self._thread = thread
+
+    def close(self) -> None:
+        """Close the session and stop the background thread.
+
+        Calls still in progress raise `concurrent.futures.CancelledError`.
+        """
+        with self._start_lock:
+            loop, thread = self._loop, self._thread
+            if loop is None or thread is None:
+                return
+            for future in self._pending:
+                future.cancel()
+            if self._session is not None:
+                asyncio.run_coroutine_threadsafe(
+                    self._session.close(), loop
+                ).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+            self._loop = self._thread = None
+            self._session = self._api = None
+
+    def _run(self, func: Callable[[TaipitApi], Coroutine[Any, Any, _T]]) -> _T:
+        """Run a coroutine on the loop thread and wait for its result."""
+        with self._start_lock:
+            self._start()
+            assert self._loop is not None and self._api is not None
+            future = asyncio.run_coroutine_threadsafe(func(self._api), self._loop)
+            self._pending.add(future)
+        try:
+            return future.result()
+        finally:
+            with self._start_lock:
+                self._pending.discard(future)
+
+    async def _async_gather(
+        self,
+        func: Callable[[int], Coroutine[Any, Any, _T]],
+        ids: Iterable[int],
+        deadline: float | None,
+    ) -> dict[int, _T]:
+        """Run a per-ID coroutine for many IDs with limited concurrency."""
+        semaphore = asyncio.Semaphore(self._concurrency)
+        limiter = self._limiter
+
+        async def _run_one(item_id: int) -> _T:
+            if limiter is not None:
+                async with limiter.async_slot():
+                    return await func(item_id)
+            async with semaphore:
+                return await func(item_id)
+
+        unique_ids = list(dict.fromkeys(ids))
+        with taipit_deadline(deadline):
+            results = await asyncio.gather(*(_run_one(i) for i in unique_ids))
+        return dict(zip(unique_ids, results))
+
+    def get_meters(self) -> list[dict[str, Any]]:
+        """Get all meters and short info."""
+        return self._run(lambda api: api.async_get_meters())
+
+    def get_meter_readings(self, meter_id: int) -> dict[str, Any]:
+        """Get readings for meter."""
+        return self._run(lambda api: api.async_get_meter_readings(meter_id))
+
+    def get_own_meters(self) -> list[dict[str, Any]]:
+        """Get meters owned by current user."""
+        return self._run(lambda api: api.async_get_own_meters())
+
+    def get_meter_info(self, meter_id: int) -> dict[str, Any]:
+        """Get info for meter."""
+        return self._run(lambda api: api.async_get_meter_info(meter_id))
+
+    def get_current_user(self) -> dict[str, Any]:
+        """Get current user info."""
+        return self._run(lambda api: api.async_get_current_user())
+
+    def get_user_info(self, user_id: str) -> dict[str, Any]:
+        """Get specified user info."""
+        return self._run(lambda api: api.async_get_user_info(user_id))
+
+    def get_warnings(self) -> dict[str, Any]:
+        """List warnings."""
+        return self._run(lambda api: api.async_get_warnings())
+
+    def get_settings(
+        self, sections: tuple[str, ...] = SECTIONS_ALL, *, refresh: bool = False
+    ) -> dict[str, Any]:
+        """Get settings, see `TaipitApi.async_get_settings()`."""
+        return self._run(lambda api: api.async_get_settings(sections, refresh=refresh))
+
+    def get_tariff(self, meter_id: int) -> dict[str, Any]:
+        """Get tariff for meter. Available only for meter owner."""
+        return self._run(lambda api: api.async_get_tariff(meter_id))
+
+    def get_meters_readings(
+        self, meter_ids: Iterable[int], *, deadline: float | None = None
+    ) -> dict[int, dict[str, Any]]:
+        """Get readings for many meters concurrently.
+
+        `deadline` limits the whole batch to the given number of seconds.
+        """
+        return self._run(
+            lambda api: self._async_gather(
+                api.async_get_meter_readings, meter_ids, deadline
+            )
+        )
+
+    def get_meters_info(
+        self, meter_ids: Iterable[int], *, deadline: float | None = None
+    ) -> dict[int, dict[str, Any]]:
+        """Get info for many meters concurrently.
+
+        `deadline` limits the whole batch to the given number of seconds.
+        """
+        return self._run(
+            lambda api: self._async_gather(
+                api.async_get_meter_info, meter_ids, deadline
+            )
+        )
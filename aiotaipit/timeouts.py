@@ -0,0 +1,96 @@
+"""Request timeouts and operation deadlines."""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TypeVar
+
+from aiohttp import ClientTimeout
+
+from .exceptions import TaipitDeadlineExceeded
+from .helpers import match_endpoint
+
+_T = TypeVar("_T")
+
+_deadline: ContextVar[float | None] = ContextVar("taipit_deadline", default=None)
+
+
+@contextmanager
+def taipit_deadline(seconds: float | None) -> Iterator[None]:
+    """Share one time budget between all requests made inside the block.
+
+    The budget covers waiting for the token lock and a dispatcher slot,
+    token acquisition/refresh and API requests, including requests made by
+    tasks created inside the block. Nested deadlines can
+    only shorten the budget. `None` keeps the current deadline.
+    """
+    if seconds is None:
+        yield
+        return
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        deadline = min(deadline, current)
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def get_remaining_time() -> float | None:
+    """Return seconds left until the current deadline, or None."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def check_deadline() -> float | None:
+    """Raise if the current deadline has passed, return the remaining time."""
+    remaining = get_remaining_time()
+    if remaining is not None and remaining <= 0:
+        raise TaipitDeadlineExceeded
+    return remaining
+
+
+async def async_within_deadline(awaitable: Awaitable[_T]) -> _T:
+    """Await within the time left until the current deadline."""
+    remaining = check_deadline()
+    if remaining is None:
+        return await awaitable
+    try:
+        async with asyncio.timeout(remaining):
+            return await awaitable
+    except TimeoutError as err:
+        raise TaipitDeadlineExceeded from err
+
+
+def select_timeout(
+    url: str,
+    timeout: ClientTimeout | None,
+    endpoint_timeouts: Mapping[str, ClientTimeout],
+) -> ClientTimeout | None:
+    """Return the timeout of the longest matching endpoint prefix."""
+    return match_endpoint(url, endpoint_timeouts, timeout)
+
+
+def limit_timeout(timeout: ClientTimeout | None) -> ClientTimeout | None:
+    """Limit the total timeout to the time left until the deadline."""
+    remaining = check_deadline()
+    if remaining is None:
+        return timeout
+    if timeout is None:
+        return ClientTimeout(total=remaining)
+    if timeout.total is not None and timeout.total <= remaining:
+        return timeout
+    return ClientTimeout(
+        total=remaining,
+        connect=timeout.connect,
+        sock_read=timeout.sock_read,
+        sock_connect=timeout.sock_connect,
+        ceil_threshold=timeout.ceil_threshold,
+    )
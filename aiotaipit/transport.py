@@ -0,0 +1,363 @@
+"""HTTP transports used by AbstractTaipitAuth."""
+from __future__ import annotations
+
+import asyncio
+import base64
+import gzip
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Mapping
+from dataclasses import dataclass
+from http import HTTPStatus
+from pathlib import Path
+from typing import IO, Any
+
+from aiohttp import (
+    ClientConnectionError,
+    ClientResponseError,
+    ClientSession,
+    ClientTimeout,
+    RequestInfo,
+)
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+from .const import LOGGER
+from .exceptions import TaipitApiError
+
+SENSITIVE_PARAMS = frozenset({"password", "client_secret", "refresh_token"})
+SENSITIVE_FIELDS = frozenset({"access_token", "refresh_token"})
+_SENSITIVE_KEYS = tuple(f'"{field}"'.encode() for field in SENSITIVE_FIELDS)
+MASK = "***"
+
+
+@dataclass(slots=True)
+class TaipitResponse:
+    """Raw API response."""
+
+    status: int
+    headers: Mapping[str, str]
+    body: bytes
+
+    def json(self) -> Any:
+        """Decode the JSON body, return None for an empty body."""
+        if not self.body.strip():
+            return None
+        try:
+            return json.loads(self.body)
+        except ValueError as err:
+            raise TaipitApiError(f"Invalid JSON response: {err}") from err
+
+
+def raise_for_status(method: str, url: str, response: TaipitResponse) -> None:
+    """Raise `aiohttp.ClientResponseError` for 4xx and 5xx responses."""
+    if response.status < 400:
+        return
+    headers = CIMultiDictProxy(CIMultiDict(response.headers))
+    request_info = RequestInfo(URL(url), method, headers, URL(url))
+    try:
+        reason = HTTPStatus(response.status).phrase
+    except ValueError:
+        reason = ""
+    raise ClientResponseError(
+        request_info,
+        (),
+        status=response.status,
+        message=reason,
+        headers=headers,
+    )
+
+
+def _mask_params(params: Mapping[str, Any] | None) -> dict[str, str]:
+    """Return params as strings with credentials masked."""
+    return {
+        str(key): MASK if key in SENSITIVE_PARAMS else str(value)
+        for key, value in (params or {}).items()
+    }
+
+
+def _mask_body(body: bytes) -> bytes:
+    """Return a JSON body with tokens masked, other bodies unchanged."""
+    if not any(key in body for key in _SENSITIVE_KEYS):
+        return body
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return body
+    if not isinstance(data, dict) or SENSITIVE_FIELDS.isdisjoint(data):
+        return body
+    masked = {
+        key: MASK if key in SENSITIVE_FIELDS else value for key, value in data.items()
+    }
+    return json.dumps(masked, ensure_ascii=False).encode("utf-8")
+
+
+def _request_key(
+    method: str, url: str, params: dict[str, str]
+) -> tuple[str, str, tuple[tuple[str, str], ...]]:
+    """Return the key matching a request to a recorded exchange."""
+    return method.upper(), url, tuple(sorted(params.items()))
+
+
+class AbstractTaipitTransport(ABC):
+    """Abstract transport sending HTTP requests.
+
+    Transports return responses of any status. Connection errors are
+    raised as `aiohttp.ClientError` and timeouts as `TimeoutError`.
+    """
+
+    @abstractmethod
+    async def async_request(
+        self, method: str, url: str, **kwargs: Any
+    ) -> TaipitResponse:
+        """Send a request. `params`, `headers` and `timeout` are supported."""
+
+    async def async_warm_up(self, url: str, connections: int) -> int:
+        """Open keep-alive connections to the URL, return how many succeeded.
+
+        Sends `connections` concurrent HEAD requests; errors are ignored.
+        """
+        results = await asyncio.gather(
+            *(self.async_request("HEAD", url) for _ in range(connections)),
+            return_exceptions=True,
+        )
+        failed = [item for item in results if isinstance(item, BaseException)]
+        if failed:
+            LOGGER.debug("Warm-up of %s connections failed: %s", len(failed), failed[0])
+        return len(results) - len(failed)
+
+    async def async_close(self) -> None:
+        """Release resources of the transport."""
+
+
+class AiohttpTransport(AbstractTaipitTransport):
+    """Transport using an `aiohttp.ClientSession`."""
+
+    def __init__(self, session: ClientSession) -> None:
+        """Initialize the transport. The session is owned by the caller."""
+        self._session = session
+
+    async def async_request(
+        self, method: str, url: str, **kwargs: Any
+    ) -> TaipitResponse:
+        """Send a request."""
+        async with self._session.request(method, url, **kwargs) as resp:
+            body = await resp.read()
+        return TaipitResponse(resp.status, resp.headers, body)
+
+
+class HttpxTransport(AbstractTaipitTransport):
+    """Transport using `httpx`, with HTTP/2 by default. Requires `httpx[http2]`.
+
+    Over HTTPS, concurrent requests are multiplexed over a few HTTP/2
+    connections instead of one connection per request in flight. Without
+    `client` the transport creates and closes its own client.
+    """
+
+    def __init__(self, client: Any = None, *, http2: bool = True) -> None:
+        """Initialize the transport."""
+        try:
+            import httpx
+        except ImportError as err:
+            raise ImportError(
+                "HttpxTransport requires httpx: pip install aiotaipit[http2]"
+            ) from err
+        self._httpx = httpx
+        self._owned = client is None
+        self._client = client if client is not None else httpx.AsyncClient(
+            http2=http2
+        )
+
+    def _get_timeout(self, timeout: ClientTimeout | None) -> Any:
+        """Convert an aiohttp timeout to an httpx timeout."""
+        if timeout is None:
+            return self._httpx.USE_CLIENT_DEFAULT
+        return self._httpx.Timeout(
+            timeout.total,
+            connect=timeout.connect,
+            read=timeout.sock_read,
+        )
+
+    async def async_request(
+        self, method: str, url: str, **kwargs: Any
+    ) -> TaipitResponse:
+        """Send a request."""
+        timeout: ClientTimeout | None = kwargs.pop("timeout", None)
+        try:
+            async with asyncio.timeout(timeout.total if timeout else None):
+                resp = await self._client.request(
+                    method, url, timeout=self._get_timeout(timeout), **kwargs
+                )
+        except self._httpx.TimeoutException as err:
+            raise TimeoutError(str(err)) from err
+        except self._httpx.HTTPError as err:
+            raise ClientConnectionError(str(err)) from err
+        return TaipitResponse(resp.status_code, resp.headers, resp.content)
+
+    async def async_close(self) -> None:
+        """Close the client if it is owned by the transport."""
+        if self._owned:
+            await self._client.aclose()
+
+
+class MemoryTransport(AbstractTaipitTransport):
+    """In-memory transport serving preset responses, for tests.
+
+    Responses are matched by method and URL without the query string;
+    unknown URLs get 404. Sent requests are kept in `requests`.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the transport without responses."""
+        self._responses: dict[tuple[str, str], tuple[float, TaipitResponse]] = {}
+        self.requests: list[tuple[str, str, dict[str, str]]] = []
+
+    def add(
+        self,
+        method: str,
+        url: str,
+        *,
+        payload: Any = None,
+        body: bytes | None = None,
+        status: int = 200,
+        headers: Mapping[str, str] | None = None,
+        delay: float = 0.0,
+    ) -> None:
+        """Set the response to a request, `payload` is encoded as JSON."""
+        if body is None:
+            body = json.dumps(payload).encode() if payload is not None else b""
+        self._responses[(method.upper(), url)] = (
+            delay,
+            TaipitResponse(status, dict(headers or {}), body),
+        )
+
+    async def async_request(
+        self, method: str, url: str, **kwargs: Any
+    ) -> TaipitResponse:
+        """Return the preset response."""
+        self.requests.append((method.upper(), url, _mask_params(kwargs.get("params"))))
+        delay, response = self._responses.get(
+            (method.upper(), url.split("?", 1)[0]),
+            (0.0, TaipitResponse(404, {}, b"")),
+        )
+        if delay:
+            await asyncio.sleep(delay)
+        return response
+
+
+class RecordingTransport(AbstractTaipitTransport):
+    """Record requests and responses of another transport to a file.
+
+    Each exchange is one JSON line of a gzip file with the request method,
+    URL and params (credentials masked), the response and its timings:
+    `offset` since the start of the recording and `elapsed` seconds.
+    Headers are recorded as a list of pairs, so repeated headers are kept.
+    Tokens in JSON response bodies are masked, other API data is recorded
+    as is. The file is written in a worker thread.
+    """
+
+    def __init__(self, transport: AbstractTaipitTransport, path: str | Path) -> None:
+        """Initialize the transport."""
+        self._transport = transport
+        self._path = path
+        self._file: IO[str] | None = None
+        self._lock = asyncio.Lock()
+        self._started = time.monotonic()
+
+    def _write(self, line: str) -> None:
+        """Write a line, opening the file on first use."""
+        if self._file is None:
+            self._file = gzip.open(self._path, "wt", encoding="utf-8")
+        self._file.write(line)
+
+    def _close(self) -> None:
+        """Close the file, creating an empty recording if nothing was sent."""
+        if self._file is None:
+            self._file = gzip.open(self._path, "wt", encoding="utf-8")
+        self._file.close()
+
+    async def async_request(
+        self, method: str, url: str, **kwargs: Any
+    ) -> TaipitResponse:
+        """Send a request and record the exchange."""
+        started = time.monotonic()
+        response = await self._transport.async_request(method, url, **kwargs)
+        elapsed = time.monotonic() - started
+        response_body = _mask_body(response.body)
+        try:
+            body = {"body": response_body.decode("utf-8")}
+        except UnicodeDecodeError:
+            body = {"body_b64": base64.b64encode(response_body).decode("ascii")}
+        entry = {
+            "method": method,
+            "url": url,
+            "params": _mask_params(kwargs.get("params")),
+            "offset": round(started - self._started, 6),
+            "elapsed": round(elapsed, 6),
+            "status": response.status,
+            "headers": [[key, value] for key, value in response.headers.items()],
+            **body,
+        }
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        async with self._lock:
+            await asyncio.to_thread(self._write, line)
+        return response
+
+    async def async_close(self) -> None:
+        """Finish the recording and close the wrapped transport."""
+        async with self._lock:
+            await asyncio.to_thread(self._close)
+        await self._transport.async_close()
+
+
+class ReplayTransport(AbstractTaipitTransport):
+    """Serve responses recorded by `RecordingTransport` without network.
+
+    Requests are matched by method, URL and params. Repeated requests get
+    the recorded responses in order, starting over after the last one.
+    Responses are delayed by their recorded time multiplied by
+    `time_scale` (0 for no delay). Headers may be recorded as a list of
+    pairs or, in older recordings, as a mapping.
+    """
+
+    def __init__(self, path: str | Path, *, time_scale: float = 1.0) -> None:
+        """Load the recording."""
+        self._time_scale = time_scale
+        self._exchanges: dict[
+            tuple[str, str, tuple[tuple[str, str], ...]],
+            deque[tuple[float, TaipitResponse]],
+        ] = {}
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            for line in file:
+                entry = json.loads(line)
+                if "body_b64" in entry:
+                    body = base64.b64decode(entry["body_b64"])
+                else:
+                    body = entry["body"].encode("utf-8")
+                key = _request_key(entry["method"], entry["url"], entry["params"])
+                self._exchanges.setdefault(key, deque()).append(
+                    (
+                        entry["elapsed"],
+                        TaipitResponse(
+                            entry["status"],
+                            CIMultiDictProxy(CIMultiDict(entry["headers"])),
+                            body,
+                        ),
+                    )
+                )
+
+    async def async_request(
+        self, method: str, url: str, **kwargs: Any
+    ) -> TaipitResponse:
+        """Return the next recorded response for the request."""
+        key = _request_key(method, url, _mask_params(kwargs.get("params")))
+        exchanges = self._exchanges.get(key)
+        if not exchanges:
+            raise TaipitApiError(f"No recorded response for {method} {url}")
+        elapsed, response = exchanges[0]
+        exchanges.rotate(-1)
+        if self._time_scale > 0:
+            await asyncio.sleep(elapsed * self._time_scale)
+        return response
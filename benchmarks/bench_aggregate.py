@@ -0,0 +1,67 @@
+"""Benchmark TaipitConsumptionAggregator on synthetic readings.
+
+Usage: python benchmarks/bench_aggregate.py [--readings 10000000] [--meters 10000]
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import random
+import time
+
+from aiotaipit.aggregate import ReadingColumns, TaipitConsumptionAggregator
+
+START_DAY = datetime.date(2024, 1, 1).toordinal()
+
+
+def build_columns(readings: int, meters: int) -> ReadingColumns:
+    """Build daily cumulative readings grouped by meter."""
+    columns = ReadingColumns()
+    per_meter = max(1, readings // meters)
+    rnd = random.Random(0)
+    for meter_id in range(1, meters + 1):
+        t1 = t2 = t3 = 0.0
+        for day in range(per_meter):
+            t1 += rnd.random() * 10
+            t2 += rnd.random() * 5
+            t3 += rnd.random()
+            columns.append(meter_id, START_DAY + day, (t1 + t2 + t3, t1, t2, t3))
+    return columns
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--readings", type=int, default=10_000_000)
+    parser.add_argument("--meters", type=int, default=10_000)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    columns = build_columns(args.readings, args.meters)
+    print(f"built {len(columns):,} readings in {time.perf_counter() - started:.1f}s")
+
+    aggregator = TaipitConsumptionAggregator()
+    for meter_id in range(1, args.meters + 1):
+        aggregator.set_meter_region(meter_id, meter_id % 85 + 1)
+
+    started = time.perf_counter()
+    aggregator.update(columns)
+    elapsed = time.perf_counter() - started
+    print(
+        f"aggregated {len(columns):,} readings in {elapsed:.1f}s "
+        f"({len(columns) / elapsed:,.0f} readings/s)"
+    )
+
+    started = time.perf_counter()
+    tail = ReadingColumns()
+    for meter_id in range(1, args.meters + 1):
+        tail.append(meter_id, START_DAY + 10**5, (10**9, 10**9, 0.0, 0.0))
+    aggregator.update(tail)
+    print(
+        f"incremental update of {len(tail):,} readings in "
+        f"{(time.perf_counter() - started) * 1000:.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Benchmark response logging overhead of AbstractTaipitAuth.request.
+
+Compares logging off, the payload logger (every response and sampled) and
+formatting the whole decoded payload as before.
+
+Usage: python benchmarks/bench_logging.py [--readings 50000] [--requests 50]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import logging
+import time
+from typing import Any
+
+from aiohttp import ClientSession
+
+from aiotaipit.auth import AbstractTaipitAuth, TaipitResponse
+from aiotaipit.const import LOGGER
+from aiotaipit.payload import TaipitPayloadLogger
+
+
+class BenchAuth(AbstractTaipitAuth):
+    """Auth returning a prepared response without network requests."""
+
+    def __init__(
+        self,
+        session: ClientSession,
+        response: TaipitResponse,
+        payload_logger: TaipitPayloadLogger | None = None,
+    ) -> None:
+        super().__init__(session, payload_logger=payload_logger)
+        self._response = response
+
+    async def async_get_access_token(self) -> str:
+        return "token"
+
+    async def request_raw(
+        self, method: str, url: str, **kwargs: Any
+    ) -> TaipitResponse:
+        return self._response
+
+
+class FullDataAuth(BenchAuth):
+    """Auth logging the whole decoded payload."""
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> Any:
+        response = await self.request_raw(method, url, **kwargs)
+        data = response.json()
+        LOGGER.debug("Response status=%s, data=%s", response.status, data)
+        return data
+
+
+async def measure(auth: BenchAuth, requests: int) -> float:
+    """Return the average time of one request in milliseconds."""
+    started = time.perf_counter()
+    for _ in range(requests):
+        await auth.request("GET", "api/bmd/all")
+    return (time.perf_counter() - started) / requests * 1000
+
+
+async def run(readings: int, requests: int) -> None:
+    """Run the benchmark."""
+    body = json.dumps(
+        {
+            "meter": {"id": 1},
+            "readings": [
+                {"date": f"2026-01-01 00:{i % 60:02d}:00", "energy_a": i * 1.5}
+                for i in range(readings)
+            ],
+        }
+    ).encode()
+    response = TaipitResponse(200, {}, body)
+    handler = logging.StreamHandler(io.StringIO())
+    LOGGER.addHandler(handler)
+    LOGGER.propagate = False
+    print(f"payload: {len(body) / 1e6:.1f} MB, {requests} requests")
+
+    async with ClientSession() as session:
+        cases = [
+            ("logging off", logging.INFO, BenchAuth(session, response)),
+            ("payload logger", logging.DEBUG, BenchAuth(session, response)),
+            (
+                "payload logger 1/100",
+                logging.DEBUG,
+                BenchAuth(session, response, TaipitPayloadLogger(sample_rate=100)),
+            ),
+            ("full data (before)", logging.DEBUG, FullDataAuth(session, response)),
+        ]
+        baseline = None
+        for name, level, auth in cases:
+            LOGGER.setLevel(level)
+            elapsed = await measure(auth, requests)
+            baseline = baseline or elapsed
+            print(
+                f"{name:>22}: {elapsed:8.2f} ms/request "
+                f"({elapsed - baseline:+.2f} ms)"
+            )
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--readings", type=int, default=50_000)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.readings, args.requests))
+
+
+if __name__ == "__main__":
+    main()
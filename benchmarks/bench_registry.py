@@ -0,0 +1,98 @@
+"""Benchmark memory of TaipitMeterRegistry against a list of meter dicts.
+
+Usage: python benchmarks/bench_registry.py [--meters 1000000] [--sample 100000]
+
+The registry is built from `--meters` synthetic meters; the memory of plain
+dicts (as decoded from `meter/list-all`) is measured on `--sample` meters
+and extrapolated.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from collections.abc import Iterator
+from typing import Any
+
+from aiotaipit.registry import TaipitMeterRegistry
+
+NAMES = ("Квартира", "Дача", "Гараж", "Офис", "Счётчик")
+
+
+def iter_meters(count: int, seed: int = 0) -> Iterator[dict[str, Any]]:
+    """Yield synthetic meters with fresh strings, like a decoded response."""
+    rnd = random.Random(seed)
+    for meter_id in range(1, count + 1):
+        t1, t2, t3 = rnd.random() * 1e4, rnd.random() * 5e3, rnd.random() * 1e3
+        yield {
+            "id": meter_id,
+            # a decoded response has a separate string object per meter
+            "metername": (rnd.choice(NAMES) + " ")[:-1],
+            "sn": f"{meter_id * 7919 % 10**11:011}",
+            "type": rnd.choice((1, 5, 16, 24, 30)),
+            "status": rnd.choice((0, 1, 1, 1, 2)),
+            "regionId": rnd.randrange(1, 93),
+            "ecometerdata": {
+                "lastReading": {
+                    "energy_a": t1 + t2 + t3,
+                    "energy_t1_a": t1,
+                    "energy_t2_a": t2,
+                    "energy_t3_a": t3,
+                }
+            },
+        }
+
+
+def measure(build: Any) -> tuple[Any, int]:
+    """Return the built object and the memory it holds."""
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, size
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--meters", type=int, default=1_000_000)
+    parser.add_argument("--sample", type=int, default=100_000)
+    args = parser.parse_args()
+
+    sample, dict_size = measure(lambda: list(iter_meters(args.sample)))
+    del sample
+    per_dict = dict_size / args.sample
+    print(
+        f"dicts:    {per_dict:,.0f} B/meter, "
+        f"~{per_dict * args.meters / 2**20:,.0f} MiB for {args.meters:,} meters"
+    )
+
+    started = time.perf_counter()
+    registry, size = measure(lambda: TaipitMeterRegistry(iter_meters(args.meters)))
+    elapsed = time.perf_counter() - started
+    print(
+        f"registry: {size / args.meters:,.0f} B/meter, "
+        f"{size / 2**20:,.0f} MiB for {len(registry):,} meters "
+        f"(built in {elapsed:.1f}s, {per_dict * args.meters / size:.1f}x smaller)"
+    )
+
+    started = time.perf_counter()
+    changes = registry.apply_snapshot(iter_meters(args.meters, seed=1))
+    elapsed = time.perf_counter() - started
+    print(f"snapshot update in {elapsed:.1f}s: {changes}")
+
+    started = time.perf_counter()
+    for meter_id in range(1, args.meters + 1, 7):
+        registry.get(meter_id)
+    elapsed = time.perf_counter() - started
+    lookups = len(range(1, args.meters + 1, 7))
+    print(f"{lookups / elapsed:,.0f} lookups/s")
+    print(f"{len(registry.ids_by_type(16)):,} meters of type 16")
+
+
+if __name__ == "__main__":
+    main()
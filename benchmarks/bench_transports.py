@@ -0,0 +1,151 @@
+"""Benchmark transports: throughput and number of opened connections.
+
+By default a local aiohttp server (plain HTTP/1.1) is started. HTTP/2 is
+only negotiated over HTTPS, so pass `--url` of an HTTPS endpoint with
+HTTP/2 support to see the httpx backend multiplex requests.
+
+Usage: python benchmarks/bench_transports.py [--requests 2000] [--concurrency 50]
+       [--url https://example.com/path]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+from typing import Any
+
+from aiohttp import ClientSession, TraceConfig, web
+
+from aiotaipit.transport import (
+    AbstractTaipitTransport,
+    AiohttpTransport,
+    HttpxTransport,
+    MemoryTransport,
+)
+
+READINGS = {
+    "readings": [
+        {"date": f"2026-01-{day:02d}", "energy_a": day * 10.5} for day in range(1, 31)
+    ]
+}
+
+
+async def measure(
+    transport: AbstractTaipitTransport, url: str, requests: int, concurrency: int
+) -> float:
+    """Send requests with limited concurrency, return requests per second."""
+    ids = iter(range(requests))
+
+    async def _worker() -> None:
+        for meter_id in ids:
+            response = await transport.async_request(
+                "GET", url, params={"id": meter_id}
+            )
+            assert response.status == 200, response.status
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - started)
+
+
+def report(name: str, rate: float, connections: int | str, version: str) -> None:
+    """Print one result line."""
+    print(f"{name:>16}: {rate:9.0f} req/s, connections: {connections}, {version}")
+
+
+async def bench_aiohttp(url: str, requests: int, concurrency: int) -> None:
+    """Benchmark the aiohttp transport."""
+    connections = 0
+
+    async def _on_connection(*args: Any) -> None:
+        nonlocal connections
+        connections += 1
+
+    trace = TraceConfig()
+    trace.on_connection_create_end.append(_on_connection)
+    async with ClientSession(trace_configs=[trace]) as session:
+        rate = await measure(AiohttpTransport(session), url, requests, concurrency)
+    report("aiohttp", rate, connections, "HTTP/1.1")
+
+
+async def bench_httpx(url: str, requests: int, concurrency: int) -> None:
+    """Benchmark the httpx transport with HTTP/2 enabled."""
+    try:
+        import httpx
+    except ImportError:
+        print("           httpx: skipped, pip install aiotaipit[http2]")
+        return
+    connections = 0
+    versions: Counter[str] = Counter()
+
+    async def _trace(event: str, info: dict[str, Any]) -> None:
+        nonlocal connections
+        if event == "connection.connect_tcp.complete":
+            connections += 1
+
+    async def _on_request(request: httpx.Request) -> None:
+        request.extensions["trace"] = _trace
+
+    async def _on_response(response: httpx.Response) -> None:
+        versions[response.http_version] += 1
+
+    client = httpx.AsyncClient(
+        http2=True,
+        event_hooks={"request": [_on_request], "response": [_on_response]},
+    )
+    transport = HttpxTransport(client)
+    try:
+        rate = await measure(transport, url, requests, concurrency)
+    finally:
+        await client.aclose()
+    report("httpx (http2)", rate, connections, ", ".join(versions))
+
+
+async def bench_memory(requests: int, concurrency: int) -> None:
+    """Benchmark the in-memory transport."""
+    transport = MemoryTransport()
+    transport.add("GET", "memory://api/bmd/all", payload=READINGS)
+    rate = await measure(transport, "memory://api/bmd/all", requests, concurrency)
+    report("memory", rate, 0, "-")
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Run the benchmark."""
+    runner = None
+    url = args.url
+    if url is None:
+
+        async def _readings(request: web.Request) -> web.Response:
+            return web.json_response(READINGS)
+
+        app = web.Application()
+        app.router.add_get("/api/bmd/all", _readings)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        url = f"http://127.0.0.1:{port}/api/bmd/all"
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}, {url}")
+    try:
+        await bench_aiohttp(url, args.requests, args.concurrency)
+        await bench_httpx(url, args.requests, args.concurrency)
+        await bench_memory(args.requests, args.concurrency)
+    finally:
+        if runner is not None:
+            await runner.cleanup()
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--url", help="endpoint to request instead of a local server")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import json
+import time
 from pathlib import Path
 from typing import Any
 
@@ -27,6 +28,17 @@ def load_fixture(name: str) -> dict[str, Any] | list[Any]:
         return json.load(f)
 
 
+def make_token(**kwargs: Any) -> dict[str, Any]:
+    """Return a valid token for mocked auth, `kwargs` override its fields."""
+    return {
+        "access_token": "test_token",
+        "refresh_token": "test_refresh",
+        "expires_in": 3600,
+        "expires_at": time.time() + 3600,
+        **kwargs,
+    }
+
+
 @pytest_asyncio.fixture(scope="class")
 async def auth() -> SimpleTaipitAuth:
     """Create a SimpleTaipitAuth instance for integration tests."""
@@ -53,3 +65,16 @@ def session_mock() -> aioresponses:
     """Create an aioresponses mock context."""
     with aioresponses() as mock:
         yield mock
+
+
+@pytest_asyncio.fixture
+async def mock_api(session_mock: aioresponses) -> TaipitApi:
+    """Create a TaipitApi with mocked auth (pre-loaded token)."""
+    async with aiohttp.ClientSession() as session:
+        auth = SimpleTaipitAuth(
+            username="test@example.com",
+            password="test",
+            session=session,
+            token=make_token(),
+        )
+        yield TaipitApi(auth)
@@ -0,0 +1,95 @@
+"""Tests for aiotaipit aggregate module."""
+from __future__ import annotations
+
+import datetime
+
+from aiotaipit import ReadingColumns, TaipitConsumptionAggregator
+from tests.conftest import load_fixture
+
+
+def _reading(date: str, t1: float, t2: float) -> dict:
+    return {
+        "date": date,
+        "energy_a": t1 + t2,
+        "energy_t1_a": t1,
+        "energy_t2_a": t2,
+    }
+
+
+class TestConsumptionAggregator:
+    def test_daily_and_totals(self) -> None:
+        aggregator = TaipitConsumptionAggregator()
+        aggregator.set_meter_region(1, 77)
+        aggregator.set_meter_region(2, 78)
+        aggregator.update_readings(
+            1,
+            [
+                _reading("2026-02-02", 15, 5),
+                _reading("2026-02-01", 10, 2),
+                _reading("2026-02-03 10:00:00", 20, 5),
+            ],
+        )
+        aggregator.update_readings(2, [_reading("2026-02-01", 0, 0)])
+        aggregator.update_readings(2, [_reading("2026-02-02", 1, 1)])
+
+        daily = aggregator.get_daily(1)
+        assert list(daily) == [
+            datetime.date(2026, 2, 1),
+            datetime.date(2026, 2, 2),
+            datetime.date(2026, 2, 3),
+        ]
+        assert daily[datetime.date(2026, 2, 2)]["energy_t1_a"] == 5
+        assert daily[datetime.date(2026, 2, 2)]["energy_t2_a"] == 3
+        assert daily[datetime.date(2026, 2, 2)]["energy_t3_a"] == 0
+        assert aggregator.get_tariff_totals(1)["energy_a"] == 13
+        assert aggregator.get_tariff_totals()["energy_a"] == 15
+        assert aggregator.get_region_totals() == {
+            "Москва": {
+                "energy_a": 13,
+                "energy_t1_a": 10,
+                "energy_t2_a": 3,
+                "energy_t3_a": 0,
+            },
+            "Санкт-Петербург": {
+                "energy_a": 2,
+                "energy_t1_a": 1,
+                "energy_t2_a": 1,
+                "energy_t3_a": 0,
+            },
+        }
+
+    def test_reset_and_old_readings(self) -> None:
+        aggregator = TaipitConsumptionAggregator()
+        aggregator.update_readings(
+            1,
+            [
+                _reading("2026-02-01", 100, 0),
+                _reading("2026-02-02", 5, 0),
+                _reading("2026-02-03", 8, 0),
+            ],
+        )
+        aggregator.update_readings(1, [_reading("2026-01-01", 0, 0)])
+
+        assert aggregator.get_tariff_totals(1)["energy_t1_a"] == 3
+        assert aggregator.skipped == 1
+
+    def test_update_meters(self) -> None:
+        aggregator = TaipitConsumptionAggregator()
+        meters = load_fixture("meters_response.json")
+        aggregator.update_meters(meters, datetime.date(2026, 2, 1))
+        meters[0]["ecometerdata"]["lastReading"]["energy_t1_a"] += 2.5
+        aggregator.update_meters(meters, datetime.date(2026, 2, 2))
+
+        assert aggregator.get_daily(12345)[datetime.date(2026, 2, 2)][
+            "energy_t1_a"
+        ] == 2.5
+        assert aggregator.get_region_totals()[None]["energy_t1_a"] == 2.5
+
+    def test_columns(self) -> None:
+        columns = ReadingColumns()
+        columns.extend_readings(1, [{"date": "2026-02-01", "energy_a": "1.5"}])
+        columns.append(2, 1, (1.0, 2.0, 3.0, 4.0))
+
+        assert len(columns) == 2
+        assert columns.values[0][0] == 1.5
+        assert columns.values[1][0] != columns.values[1][0]
@@ -0,0 +1,96 @@
+"""Tests for aiotaipit anomaly module."""
+from __future__ import annotations
+
+from aiotaipit import AnomalyType, TaipitAnomalyDetector
+from tests.conftest import load_fixture
+
+HOUR = 3600.0
+
+
+def _types(events: list) -> list[AnomalyType]:
+    return [event.type for event in events]
+
+
+class TestAnomalyDetector:
+    def test_spike(self) -> None:
+        detector = TaipitAnomalyDetector()
+        value = 0.0
+        for hour in range(10):
+            value += 1 + (hour % 2) * 0.1
+            assert detector.add_reading(1, hour * HOUR, value) == []
+
+        events = detector.add_reading(1, 10 * HOUR, value + 20)
+        assert _types(events) == [AnomalyType.SPIKE]
+        assert events[0].meter_id == 1
+        assert events[0].expected is not None
+        assert value < events[0].expected < value + 2
+
+    def test_no_spike_before_min_samples(self) -> None:
+        detector = TaipitAnomalyDetector(min_samples=5)
+        detector.add_reading(1, 0, 0)
+        detector.add_reading(1, HOUR, 1)
+        assert detector.add_reading(1, 2 * HOUR, 100) == []
+
+    def test_reset_and_gap(self) -> None:
+        detector = TaipitAnomalyDetector(gap_sec=2 * HOUR)
+        detector.add_reading(1, 0, 100)
+        assert _types(detector.add_reading(1, HOUR, 5)) == [AnomalyType.RESET]
+        assert detector.add_reading(1, 2 * HOUR, 6) == []
+        assert _types(detector.add_reading(1, 10 * HOUR, 7)) == [AnomalyType.GAP]
+        assert detector.add_reading(1, 10 * HOUR, 8) == []
+
+    def test_stopped(self) -> None:
+        detector = TaipitAnomalyDetector(gap_sec=HOUR)
+        detector.add_reading(1, 0, 1)
+        detector.add_reading(2, 0, 1)
+        detector.add_reading(2, 1.5 * HOUR, 2)
+
+        events = detector.check_stopped(2 * HOUR)
+        assert [(event.meter_id, event.type) for event in events] == [
+            (1, AnomalyType.STOPPED)
+        ]
+        assert [event.meter_id for event in detector.check_stopped(3 * HOUR)] == [2]
+        assert detector.check_stopped(3 * HOUR) == []
+
+        detector.add_reading(1, 4 * HOUR, 2)
+        assert [event.meter_id for event in detector.check_stopped(6 * HOUR)] == [1]
+
+    def test_backfill_and_meters(self) -> None:
+        detector = TaipitAnomalyDetector(gap_sec=3 * 24 * HOUR)
+        history = [
+            {"date": "2026-02-03", "energy_a": 1200.0},
+            {"date": "2026-02-01", "energy_a": 1100.0},
+            {"date": "2026-02-02", "energy_a": 1150.0},
+            {"date": "2026-02-02", "energy_a": None},
+        ]
+        assert detector.backfill([(12345, history)]) == []
+
+        meters = load_fixture("meters_response.json")
+        events = detector.add_meters(meters, timestamp=1770336000.0)
+        assert _types(events) == []
+        meters[0]["ecometerdata"]["lastReading"]["energy_a"] = 10.0
+        meters[0]["ecometerdata"]["lastReading"]["date"] = "2026-02-10"
+        assert _types(detector.add_meters(meters)) == [
+            AnomalyType.GAP,
+            AnomalyType.RESET,
+        ]
+
+    def test_polling_idle_meter(self) -> None:
+        detector = TaipitAnomalyDetector(gap_sec=HOUR)
+        meters = load_fixture("meters_response.json")
+        reading = meters[0]["ecometerdata"]["lastReading"]
+        value = reading["energy_a"]
+        for minute in range(0, 120, 10):
+            reading["energy_a"] = value + minute / 10
+            assert detector.add_meters(meters, timestamp=minute * 60.0) == []
+
+        reading["energy_a"] += 0.01
+        for poll in range(13, 21):
+            assert detector.add_meters(meters, timestamp=poll * 600.0) == []
+        events = detector.check_stopped(21 * 600.0)
+        assert _types(events) == [AnomalyType.STOPPED]
+        assert events[0].value == reading["energy_a"]
+
+        reading["energy_a"] += 0.01
+        events = detector.add_meters(meters, timestamp=22 * 600.0)
+        assert AnomalyType.SPIKE not in _types(events)
@@ -1,14 +1,20 @@
 """Mocked tests for aiotaipit API module."""
 from __future__ import annotations
 
-import time
+import asyncio
+import re
 
 import aiohttp
-import pytest_asyncio
+import pytest
 from aioresponses import aioresponses
 
-from aiotaipit import SimpleTaipitAuth, TaipitApi
-from aiotaipit.const import DEFAULT_BASE_URL
+from aiotaipit import SimpleTaipitAuth, TaipitApi, helpers
+from aiotaipit.const import (
+    DEFAULT_BASE_URL,
+    DEFAULT_TOKEN_URL,
+    METER_MODELS,
+    REGIONS,
+)
 from tests.conftest import load_fixture
 
 API_URL = f"{DEFAULT_BASE_URL}/api"
@@ -16,24 +22,6 @@ METER_ID = 12345
 USER_ID = "67890"
 
 
-@pytest_asyncio.fixture
-async def mock_api(session_mock: aioresponses) -> TaipitApi:
-    """Create a TaipitApi with mocked auth (pre-loaded token)."""
-    async with aiohttp.ClientSession() as session:
-        auth = SimpleTaipitAuth(
-            username="test@example.com",
-            password="test",
-            session=session,
-            token={
-                "access_token": "test_token",
-                "refresh_token": "test_refresh",
-                "expires_in": 3600,
-                "expires_at": time.time() + 3600,
-            },
-        )
-        yield TaipitApi(auth)
-
-
 class TestTaipitApiMock:
     async def test_get_meters(
         self, mock_api: TaipitApi, session_mock: aioresponses
@@ -136,6 +124,61 @@ class TestTaipitApiMock:
         assert "meterTypes" in data
         assert "controllers" in data
 
+    async def test_get_settings_per_section(
+        self, mock_api: TaipitApi, session_mock: aioresponses
+    ) -> None:
+        settings = load_fixture("settings_response.json")
+        session_mock.get(
+            f"{API_URL}/config/settings?sections=regions%2CmeterTypes",
+            payload={"regions": settings["regions"], "meterTypes": []},
+        )
+        session_mock.get(
+            f"{API_URL}/config/settings?sections=controllers%2CmeterTypesFull",
+            payload={"controllers": settings["controllers"]},
+        )
+        session_mock.get(
+            f"{API_URL}/config/settings?sections=meterTypesFull",
+            payload={"meterTypesFull": [{"id": 1}]},
+        )
+        session_mock.get(
+            f"{API_URL}/config/settings?sections=regions",
+            payload={"regions": []},
+        )
+
+        first = await mock_api.async_get_settings(("regions", "meterTypes"))
+        assert await mock_api.async_get_settings(("regions",)) == {
+            "regions": first["regions"]
+        }
+        data = await mock_api.async_get_settings(
+            ("regions", "controllers", "meterTypesFull")
+        )
+        assert list(data) == ["regions", "controllers"]
+        data = await mock_api.async_get_settings(("meterTypesFull", "controllers"))
+        assert data["meterTypesFull"] == [{"id": 1}]
+        assert await mock_api.async_get_settings(
+            ("regions",), refresh=True
+        ) == {"regions": []}
+        assert len(session_mock.requests) == 4
+
+    async def test_get_settings_shared_request(
+        self, mock_api: TaipitApi, session_mock: aioresponses
+    ) -> None:
+        session_mock.get(
+            f"{API_URL}/config/settings?sections=regions",
+            payload={"regions": [{"id": 99}]},
+        )
+        session_mock.get(
+            f"{API_URL}/config/settings?sections=controllers",
+            payload={"controllers": []},
+        )
+        first, second = await asyncio.gather(
+            mock_api.async_get_settings(("regions",)),
+            mock_api.async_get_settings(("regions", "controllers")),
+        )
+        assert first == {"regions": [{"id": 99}]}
+        assert second == {"regions": [{"id": 99}], "controllers": []}
+        assert len(session_mock.requests) == 2
+
     async def test_get_tariff(
         self, mock_api: TaipitApi, session_mock: aioresponses
     ) -> None:
@@ -147,3 +190,34 @@ class TestTaipitApiMock:
 
         assert data["id"] == METER_ID
         assert "prices" in data
+
+    async def test_warm_up(
+        self, session_mock: aioresponses, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(
+            helpers, "_INDEX", helpers._ReferenceIndex(REGIONS, METER_MODELS)
+        )
+        session_mock.get(
+            re.compile(re.escape(f"{DEFAULT_BASE_URL}/{DEFAULT_TOKEN_URL}") + r"\?.*"),
+            payload=load_fixture("token_response.json"),
+        )
+        session_mock.head(DEFAULT_BASE_URL, status=200, repeat=True)
+        session_mock.get(
+            f"{API_URL}/config/settings?sections=regions%2CmeterTypes%2Ccontrollers",
+            payload={"regions": [{"id": 99, "name": "Новый регион"}]},
+        )
+        session_mock.get(
+            f"{API_URL}/meter/list-all",
+            payload=load_fixture("meters_response.json"),
+        )
+
+        async with aiohttp.ClientSession() as session:
+            auth = SimpleTaipitAuth("test@example.com", "test", session)
+            data = await TaipitApi(auth).async_warm_up(connections=3)
+            assert await auth.async_warm_up(connections=2) == 2
+
+        assert data["meters"][0]["id"] == METER_ID
+        assert data["settings"]["regions"][0]["id"] == 99
+        assert helpers.get_region_name(99) == "Новый регион"
+        head_calls = [key for key in session_mock.requests if key[0] == "HEAD"]
+        assert len(session_mock.requests[head_calls[0]]) == 5
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import re
 import time
+from email.utils import formatdate
 from unittest.mock import MagicMock
 
 import aiohttp
@@ -352,17 +353,55 @@ class TestTokenValidation:
 
 
 class TestTokenExpiration:
-    def test_not_expired(self) -> None:
+    async def test_not_expired(self, mock_auth: SimpleTaipitAuth) -> None:
         token = {"expires_at": time.time() + 3600}
-        assert SimpleTaipitAuth._is_expired_token(token) is False
+        assert mock_auth._is_expired_token(token) is False
 
-    def test_expired(self) -> None:
+    async def test_expired(self, mock_auth: SimpleTaipitAuth) -> None:
         token = {"expires_at": time.time() - 100}
-        assert SimpleTaipitAuth._is_expired_token(token) is True
+        assert mock_auth._is_expired_token(token) is True
 
-    def test_no_expires_at(self) -> None:
+    async def test_no_expires_at(self, mock_auth: SimpleTaipitAuth) -> None:
         token = {"access_token": "tok"}
-        assert SimpleTaipitAuth._is_expired_token(token) is False
+        assert mock_auth._is_expired_token(token) is False
+
+    async def test_server_clock_ahead(
+        self, mock_auth: SimpleTaipitAuth, session_mock: aioresponses
+    ) -> None:
+        """Test expiry is based on the server time from the Date header."""
+        server_time = formatdate(time.time() + 3000, usegmt=True)
+        session_mock.get(
+            TOKEN_URL_PATTERN,
+            payload=load_fixture("token_response.json"),
+            headers={"Date": server_time},
+        )
+        token = await mock_auth._async_new_token()
+
+        assert token["expires_at"] == pytest.approx(time.time() + 3600, abs=2)
+        assert token["server_expires_at"] == pytest.approx(time.time() + 6600, abs=2)
+        assert mock_auth._is_expired_token(token) is False
+        assert mock_auth._is_expired_token(dict(token)) is False
+        assert mock_auth._is_expired_token(
+            {"server_expires_at": time.time() + 2000}
+        )
+        assert not mock_auth._is_expired_token({"expires_at": time.time() + 2000})
+
+    async def test_monotonic_expiry(
+        self,
+        mock_auth: SimpleTaipitAuth,
+        session_mock: aioresponses,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test a stepped local clock does not expire an own token."""
+        session_mock.get(
+            TOKEN_URL_PATTERN, payload=load_fixture("token_response.json")
+        )
+        token = await mock_auth._async_new_token()
+        wall = time.time() + 7200
+        monkeypatch.setattr(time, "time", lambda: wall)
+
+        assert mock_auth._is_expired_token(token) is False
+        assert mock_auth._is_expired_token(dict(token)) is True
 
 
 class TestRequest:
@@ -384,3 +423,25 @@ class TestRequest:
         session_mock.get(f"{API_URL}/fail", status=500)
         with pytest.raises(TaipitApiError):
             await mock_auth_with_token.request("GET", "api/fail")
+
+    async def test_request_raw(
+        self, mock_auth_with_token: SimpleTaipitAuth, session_mock: aioresponses
+    ) -> None:
+        """Test raw request returns status, headers and body."""
+        session_mock.get(
+            f"{API_URL}/test-endpoint",
+            payload={"result": "ok"},
+            headers={"ETag": '"1"'},
+        )
+        response = await mock_auth_with_token.request_raw("GET", "api/test-endpoint")
+        assert response.status == 200
+        assert response.headers["ETag"] == '"1"'
+        assert response.json() == {"result": "ok"}
+
+    async def test_request_invalid_json(
+        self, mock_auth_with_token: SimpleTaipitAuth, session_mock: aioresponses
+    ) -> None:
+        """Test request wraps invalid JSON in TaipitApiError."""
+        session_mock.get(f"{API_URL}/test-endpoint", body="<html>")
+        with pytest.raises(TaipitApiError):
+            await mock_auth_with_token.request("GET", "api/test-endpoint")
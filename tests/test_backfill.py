@@ -0,0 +1,134 @@
+"""Tests for aiotaipit backfill module."""
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+
+from aiotaipit import (
+    NdjsonExportWriter,
+    TaipitApiError,
+    TaipitBackfill,
+    TaipitBackfillProgress,
+)
+
+
+def _readings(meter_id: int) -> dict[str, Any]:
+    return {
+        "id": meter_id,
+        "readings": [
+            {"date": "2026-02-01", "value": meter_id},
+            {"date": "2026-02-02", "value": meter_id + 1},
+        ],
+    }
+
+
+def _read_rows(path: Path) -> list[dict[str, Any]]:
+    with path.open(encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestBackfill:
+    async def test_run(self, tmp_path: Path) -> None:
+        api = AsyncMock()
+        api.async_get_meters.return_value = [{"id": 1}, {"id": 2}, {"id": 3}]
+        api.async_get_meter_readings.side_effect = _readings
+        output = tmp_path / "readings.ndjson"
+        checkpoint = tmp_path / "checkpoint.json"
+        reports: list[TaipitBackfillProgress] = []
+
+        with NdjsonExportWriter(output) as writer:
+            backfill = TaipitBackfill(
+                api, writer, checkpoint, progress_callback=reports.append
+            )
+            progress = await backfill.async_run()
+
+        assert progress.total == progress.completed == 3
+        assert progress.rows == 6
+        assert progress.eta == 0
+        assert reports[-1] == progress
+        assert len(_read_rows(output)) == 6
+        assert backfill.load_checkpoint() == {
+            1: "2026-02-02",
+            2: "2026-02-02",
+            3: "2026-02-02",
+        }
+
+    async def test_resume(self, tmp_path: Path) -> None:
+        output = tmp_path / "readings.ndjson"
+        checkpoint = tmp_path / "checkpoint.json"
+        api = AsyncMock()
+
+        def _crash(meter_id: int) -> dict[str, Any]:
+            if meter_id == 6:
+                raise RuntimeError("crash")
+            return _readings(meter_id)
+
+        api.async_get_meter_readings.side_effect = _crash
+        with NdjsonExportWriter(output) as writer:
+            backfill = TaipitBackfill(
+                api, writer, checkpoint, concurrency=1, chunk_size=2
+            )
+            with pytest.raises(RuntimeError):
+                await backfill.async_run(range(1, 11))
+        assert sorted(backfill.load_checkpoint()) == [1, 2, 3, 4, 5]
+        assert not (tmp_path / "checkpoint.json.tmp").exists()
+
+        api.async_get_meter_readings.reset_mock()
+        api.async_get_meter_readings.side_effect = _readings
+        with NdjsonExportWriter(output, append=True) as writer:
+            backfill = TaipitBackfill(api, writer, checkpoint)
+            progress = await backfill.async_run(range(1, 11))
+
+        assert api.async_get_meter_readings.await_count == 5
+        assert progress.completed == 10
+        rows = _read_rows(output)
+        assert sorted({row["meter_id"] for row in rows}) == list(range(1, 11))
+        assert len(rows) == 20
+
+    async def test_crash_stops_workers(self, tmp_path: Path) -> None:
+        output = tmp_path / "readings.ndjson"
+        api = AsyncMock()
+
+        async def _crash(meter_id: int) -> dict[str, Any]:
+            if meter_id == 6:
+                raise RuntimeError("crash")
+            await asyncio.sleep(0.001)
+            return _readings(meter_id)
+
+        api.async_get_meter_readings.side_effect = _crash
+        with NdjsonExportWriter(output) as writer:
+            backfill = TaipitBackfill(
+                api, writer, tmp_path / "checkpoint.json", concurrency=3
+            )
+            with pytest.raises(RuntimeError):
+                await backfill.async_run(range(1, 101))
+            calls = api.async_get_meter_readings.await_count
+            await asyncio.sleep(0.05)
+
+        assert api.async_get_meter_readings.await_count == calls < 100
+        rows = _read_rows(output)
+        assert {row["meter_id"] for row in rows} == set(backfill.load_checkpoint())
+        assert len(rows) == 2 * len(backfill.load_checkpoint())
+
+    async def test_failed_meters(self, tmp_path: Path) -> None:
+        api = AsyncMock()
+
+        def _fail_even(meter_id: int) -> dict[str, Any]:
+            if meter_id % 2 == 0:
+                raise TaipitApiError("500")
+            return {"readings": []}
+
+        api.async_get_meter_readings.side_effect = _fail_even
+        with NdjsonExportWriter(tmp_path / "readings.ndjson") as writer:
+            backfill = TaipitBackfill(api, writer, tmp_path / "checkpoint.json")
+            progress = await backfill.async_run(range(1, 5))
+
+        assert progress.completed == 2
+        assert progress.failed == 2
+        assert progress.rows == 0
+        assert backfill.last_dates == {1: None, 3: None}
@@ -0,0 +1,123 @@
+"""Tests for aiotaipit breaker module."""
+from __future__ import annotations
+
+import asyncio
+import re
+
+import aiohttp
+import pytest
+from aioresponses import aioresponses
+
+from aiotaipit import (
+    CircuitState,
+    SimpleTaipitAuth,
+    TaipitApiError,
+    TaipitCircuitBreaker,
+    TaipitCircuitOpenError,
+    TaipitTokenAcquireFailed,
+)
+from aiotaipit.const import DEFAULT_BASE_URL, DEFAULT_TOKEN_URL
+from tests.conftest import make_token
+
+API_URL = f"{DEFAULT_BASE_URL}/api"
+TOKEN_URL_PATTERN = re.compile(
+    re.escape(f"{DEFAULT_BASE_URL}/{DEFAULT_TOKEN_URL}") + r"(\?.*)?"
+)
+
+
+async def _call(breaker: TaipitCircuitBreaker, error: BaseException | None) -> None:
+    async with breaker.async_guard():
+        if error is not None:
+            raise error
+
+
+class TestCircuitBreaker:
+    async def test_trips_on_failure_rate(self) -> None:
+        breaker = TaipitCircuitBreaker(min_calls=4, failure_rate=0.5)
+        await _call(breaker, None)
+        await _call(breaker, None)
+        for _ in range(2):
+            with pytest.raises(aiohttp.ClientConnectionError):
+                await _call(breaker, aiohttp.ClientConnectionError())
+
+        assert breaker.state is CircuitState.OPEN
+        with pytest.raises(TaipitCircuitOpenError):
+            await _call(breaker, None)
+
+    async def test_client_errors_not_counted(self) -> None:
+        breaker = TaipitCircuitBreaker(min_calls=2)
+        for _ in range(3):
+            with pytest.raises(aiohttp.ClientResponseError):
+                await _call(
+                    breaker,
+                    aiohttp.ClientResponseError(None, (), status=404),
+                )
+        assert breaker.state is CircuitState.CLOSED
+
+    async def test_trips_on_latency(self) -> None:
+        breaker = TaipitCircuitBreaker(min_calls=2, slow_call_sec=0.001)
+        for _ in range(2):
+            async with breaker.async_guard():
+                await asyncio.sleep(0.01)
+        assert breaker.state is CircuitState.OPEN
+
+    async def test_half_open_probes(self) -> None:
+        breaker = TaipitCircuitBreaker(
+            min_calls=1, open_sec=0.01, half_open_calls=2
+        )
+        with pytest.raises(TimeoutError):
+            await _call(breaker, TimeoutError())
+        await asyncio.sleep(0.02)
+        assert breaker.state is CircuitState.HALF_OPEN
+
+        async with breaker.async_guard():
+            async with breaker.async_guard():
+                with pytest.raises(TaipitCircuitOpenError):
+                    await _call(breaker, None)
+        assert breaker.state is CircuitState.CLOSED
+
+    async def test_half_open_failure_reopens(self) -> None:
+        breaker = TaipitCircuitBreaker(min_calls=1, open_sec=0.01)
+        with pytest.raises(TimeoutError):
+            await _call(breaker, TimeoutError())
+        await asyncio.sleep(0.02)
+        with pytest.raises(TimeoutError):
+            await _call(breaker, TimeoutError())
+        assert breaker.state is CircuitState.OPEN
+
+
+class TestAuthCircuitBreaker:
+    async def test_api_breaker(self, session_mock: aioresponses) -> None:
+        session_mock.get(f"{API_URL}/meter/list-all", status=503, repeat=True)
+        breaker = TaipitCircuitBreaker(min_calls=2)
+        token_breaker = TaipitCircuitBreaker(name="token", min_calls=2)
+        async with aiohttp.ClientSession() as session:
+            auth = SimpleTaipitAuth(
+                "user",
+                "pass",
+                session,
+                token=make_token(),
+                circuit_breaker=breaker,
+                token_circuit_breaker=token_breaker,
+            )
+            for _ in range(2):
+                with pytest.raises(TaipitApiError):
+                    await auth.request("GET", "api/meter/list-all")
+            with pytest.raises(TaipitCircuitOpenError):
+                await auth.request("GET", "api/meter/list-all")
+
+        assert breaker.state is CircuitState.OPEN
+        assert token_breaker.state is CircuitState.CLOSED
+        assert len(next(iter(session_mock.requests.values()))) == 2
+
+    async def test_token_breaker(self, session_mock: aioresponses) -> None:
+        session_mock.get(TOKEN_URL_PATTERN, status=500, repeat=True)
+        token_breaker = TaipitCircuitBreaker(name="token", min_calls=1)
+        async with aiohttp.ClientSession() as session:
+            auth = SimpleTaipitAuth(
+                "user", "pass", session, token_circuit_breaker=token_breaker
+            )
+            with pytest.raises(TaipitTokenAcquireFailed):
+                await auth.async_get_access_token()
+            with pytest.raises(TaipitCircuitOpenError):
+                await auth.async_get_access_token()
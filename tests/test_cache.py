@@ -0,0 +1,149 @@
+"""Tests for aiotaipit cache module."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from aiotaipit import (
+    TaipitApi,
+    TaipitApiError,
+    TaipitReadCache,
+    get_remaining_time,
+    taipit_deadline,
+)
+
+
+def _auth() -> AsyncMock:
+    auth = AsyncMock()
+    calls = 0
+
+    async def _request(method: str, url: str, **kwargs: object) -> dict[str, int]:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"call": calls}
+
+    auth.request.side_effect = _request
+    return auth
+
+
+def _expire(cache: TaipitReadCache, age: float) -> None:
+    """Move all entries `age` seconds past their TTL."""
+    for key, (expires_at, data) in cache._entries.items():
+        cache._entries[key] = (expires_at - age - cache._ttl, data)
+
+
+class TestReadCache:
+    async def test_fresh(self) -> None:
+        auth = _auth()
+        cache = TaipitReadCache()
+        api = TaipitApi(auth, cache=cache)
+        assert await api.async_get_meter_info(1) == {"call": 1}
+        assert await api.async_get_meter_info(1) == {"call": 1}
+        assert await api.async_get_meter_info(2) == {"call": 2}
+        assert auth.request.await_count == 2
+        assert cache.get_metrics()["hits"] == 1
+
+    async def test_coalescing(self) -> None:
+        auth = _auth()
+        api = TaipitApi(auth, cache=TaipitReadCache())
+        results = await asyncio.gather(*(api.async_get_meters() for _ in range(5)))
+        assert results == [{"call": 1}] * 5
+        assert auth.request.await_count == 1
+
+    async def test_stale_while_revalidate(self) -> None:
+        auth = _auth()
+        cache = TaipitReadCache(ttl=60, max_stale=60)
+        api = TaipitApi(auth, cache=cache)
+        await api.async_get_meters()
+        _expire(cache, 10)
+
+        results = await asyncio.gather(*(api.async_get_meters() for _ in range(5)))
+        assert results == [{"call": 1}] * 5
+        assert cache.get_metrics()["inflight"] == 1
+        await asyncio.sleep(0.05)
+        assert await api.async_get_meters() == {"call": 2}
+        assert auth.request.await_count == 2
+        assert cache.stale_hits == 5
+        assert cache.refreshes == 1
+
+    async def test_refresh_ignores_deadline(self) -> None:
+        auth = _auth()
+        cache = TaipitReadCache(ttl=60, max_stale=60)
+        api = TaipitApi(auth, cache=cache)
+        await api.async_get_meters()
+        _expire(cache, 10)
+        remaining: list[float | None] = []
+        request = auth.request.side_effect
+
+        async def _request(method: str, url: str, **kwargs: object) -> object:
+            remaining.append(get_remaining_time())
+            return await request(method, url, **kwargs)
+
+        auth.request.side_effect = _request
+        with taipit_deadline(0.001):
+            assert await api.async_get_meters() == {"call": 1}
+        await asyncio.sleep(0.05)
+        assert await api.async_get_meters() == {"call": 2}
+        assert remaining == [None]
+
+    async def test_max_stale(self) -> None:
+        auth = _auth()
+        cache = TaipitReadCache(ttl=60, max_stale=60)
+        api = TaipitApi(auth, cache=cache)
+        await api.async_get_meters()
+        _expire(cache, 120)
+        assert await api.async_get_meters() == {"call": 2}
+        assert cache.misses == 2
+
+    async def test_stale_if_error(self) -> None:
+        auth = _auth()
+        cache = TaipitReadCache(ttl=60, max_stale=0, stale_if_error=600)
+        api = TaipitApi(auth, cache=cache)
+        await api.async_get_meters()
+        _expire(cache, 300)
+
+        auth.request.side_effect = TaipitApiError("502")
+        assert await api.async_get_meters() == {"call": 1}
+        assert cache.errors_served_stale == 1
+
+        _expire(cache, 600)
+        with pytest.raises(TaipitApiError):
+            await api.async_get_meters()
+
+    async def test_settings_refresh_bypasses_cache(self) -> None:
+        auth = AsyncMock()
+        auth.request.side_effect = [{"regions": [1]}, {"regions": [2]}, [], "x"]
+        cache = TaipitReadCache(ttl=60)
+        api = TaipitApi(auth, cache=cache)
+        assert await api.async_get_settings(("regions",)) == {"regions": [1]}
+        assert await api.async_get_settings(("regions",), refresh=True) == {
+            "regions": [2]
+        }
+        assert await api.async_get_settings(("regions",)) == {"regions": [2]}
+        assert auth.request.await_count == 2
+        assert cache.get_metrics()["entries"] == 0
+
+        with pytest.raises(TaipitApiError):
+            await api.async_get_settings(("regions",), refresh=True)
+        with pytest.raises(TaipitApiError):
+            await api.async_get_settings(("controllers",))
+
+    async def test_endpoint_ttls_and_max_entries(self) -> None:
+        auth = _auth()
+        cache = TaipitReadCache(
+            ttl=0, max_stale=0, endpoint_ttls={"meter/get-id": 60}, max_entries=2
+        )
+        api = TaipitApi(auth, cache=cache)
+        await api.async_get_meters()
+        await api.async_get_meters()
+        assert auth.request.await_count == 2
+
+        await api.async_get_meter_info(1)
+        await api.async_get_meter_info(2)
+        await api.async_get_meter_info(1)
+        assert auth.request.await_count == 4
+        assert cache.get_metrics()["entries"] == 2
+        await cache.async_close()
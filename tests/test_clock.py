@@ -0,0 +1,50 @@
+"""Tests for aiotaipit clock module."""
+from __future__ import annotations
+
+from email.utils import formatdate
+
+import pytest
+
+from aiotaipit import TaipitServerClock
+from aiotaipit.clock import parse_http_date
+from aiotaipit.const import CLOCK_OUT_OF_SYNC_MAX_SEC, TOKEN_EXPIRY_MARGIN_SEC
+
+NOW = 1_750_000_000.0
+
+
+def _headers(server_time: float) -> dict[str, str]:
+    return {"Date": formatdate(server_time, usegmt=True)}
+
+
+class TestServerClock:
+    def test_parse_http_date(self) -> None:
+        assert parse_http_date("Sun, 06 Nov 1994 08:49:37 GMT") == 784111777
+        assert parse_http_date("garbage") is None
+        assert parse_http_date(None) is None
+
+    def test_no_samples(self) -> None:
+        clock = TaipitServerClock()
+        clock.observe({}, NOW, NOW + 1)
+        assert clock.offset == 0
+        assert clock.samples == 0
+        assert clock.get_expiry_margin() == CLOCK_OUT_OF_SYNC_MAX_SEC
+
+    def test_offset(self) -> None:
+        clock = TaipitServerClock()
+        clock.observe(_headers(NOW + 100), NOW - 0.5, NOW + 0.5)
+        assert clock.offset == pytest.approx(100, abs=0.5)
+        assert clock.error == pytest.approx(1.0)
+        assert clock.get_expiry_margin() == pytest.approx(TOKEN_EXPIRY_MARGIN_SEC + 1)
+
+    def test_smoothing(self) -> None:
+        clock = TaipitServerClock(alpha=0.5)
+        clock.observe(_headers(NOW + 10), NOW, NOW)
+        clock.observe(_headers(NOW + 20), NOW, NOW)
+        assert clock.offset == pytest.approx(15.5)
+        assert clock.samples == 2
+
+    def test_reset_on_step(self) -> None:
+        clock = TaipitServerClock(alpha=0.1)
+        clock.observe(_headers(NOW), NOW, NOW)
+        clock.observe(_headers(NOW + 3600), NOW, NOW)
+        assert clock.offset == pytest.approx(3600.5)
@@ -0,0 +1,117 @@
+"""Tests for aiotaipit collector module."""
+from __future__ import annotations
+
+import queue
+import time
+from typing import Any
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from aioresponses import aioresponses
+
+from aiotaipit import (
+    SimpleTaipitAuth,
+    TaipitApiError,
+    TaipitShardedCollector,
+    shard_meter_ids,
+)
+from aiotaipit.collector import _MSG_DONE, _MSG_RESULTS, _MSG_TOKEN, _async_shard_worker
+from aiotaipit.const import DEFAULT_API_URL, DEFAULT_BASE_URL
+from tests.conftest import make_token
+
+API_URL = f"{DEFAULT_BASE_URL}/api"
+
+
+def count_readings(meter_id: int, data: dict[str, Any]) -> int:
+    """Reduce readings to their count in the worker."""
+    return len(data["readings"])
+
+
+async def _readings_handler(request: web.Request) -> web.Response:
+    """Serve readings for a test server."""
+    meter_id = int(request.query["id"])
+    return web.json_response({"id": meter_id, "readings": [{}] * meter_id})
+
+
+class TestShardMeterIds:
+    def test_shard(self) -> None:
+        assert shard_meter_ids([1, 2, 3, 4, 5], 2) == [[1, 3, 5], [2, 4]]
+        assert shard_meter_ids([1, 1, 2], 3) == [[1], [2], []]
+        assert shard_meter_ids([1], 0) == [[1]]
+
+
+class TestShardWorker:
+    async def test_worker(self, session_mock: aioresponses) -> None:
+        session_mock.get(
+            f"{API_URL}/bmd/all?id=1", payload={"id": 1, "readings": [{}]}
+        )
+        session_mock.get(f"{API_URL}/bmd/all?id=2", status=500)
+        results: queue.Queue = queue.Queue()
+        tokens: queue.Queue = queue.Queue()
+        options = {
+            "base_url": DEFAULT_BASE_URL,
+            "api_url": DEFAULT_API_URL,
+            "concurrency": 2,
+            "batch_size": 1,
+            "process_func": count_readings,
+        }
+
+        await _async_shard_worker(0, [1, 2], make_token(), options, results, tokens)
+
+        messages = [results.get_nowait() for _ in range(results.qsize())]
+        assert messages[-1] == (_MSG_DONE, 0, None)
+        items = dict(
+            item for kind, _, batch in messages[:-1] for item in batch
+            if kind == _MSG_RESULTS
+        )
+        assert items[1] == 1
+        assert isinstance(items[2], TaipitApiError)
+
+    async def test_worker_token_from_parent(
+        self, session_mock: aioresponses
+    ) -> None:
+        session_mock.get(
+            f"{API_URL}/bmd/all?id=1", payload={"id": 1, "readings": []}
+        )
+        results: queue.Queue = queue.Queue()
+        tokens: queue.Queue = queue.Queue()
+        tokens.put(make_token())
+        options = {
+            "base_url": DEFAULT_BASE_URL,
+            "api_url": DEFAULT_API_URL,
+            "concurrency": 1,
+            "batch_size": 10,
+            "process_func": None,
+        }
+        expired = make_token(expires_at=time.time() - 100)
+
+        await _async_shard_worker(0, [1], expired, options, results, tokens)
+
+        assert results.get_nowait() == (_MSG_TOKEN, 0, None)
+        assert results.get_nowait() == (
+            _MSG_RESULTS, 0, [(1, {"id": 1, "readings": []})]
+        )
+
+
+class TestShardedCollector:
+    async def test_collect_processes(self) -> None:
+        app = web.Application()
+        app.router.add_get("/api/bmd/all", _readings_handler)
+        async with TestServer(app) as server, aiohttp.ClientSession() as session:
+            auth = SimpleTaipitAuth(
+                "test@example.com",
+                "test",
+                session,
+                base_url=f"http://{server.host}:{server.port}",
+                token=make_token(),
+            )
+            collector = TaipitShardedCollector(
+                auth, processes=2, process_func=count_readings
+            )
+            results = {
+                meter_id: count
+                async for meter_id, count in collector.async_collect(range(1, 7))
+            }
+
+        assert results == {i: i for i in range(1, 7)}
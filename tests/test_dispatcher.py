@@ -0,0 +1,112 @@
+"""Tests for aiotaipit dispatcher module."""
+from __future__ import annotations
+
+import asyncio
+
+import aiohttp
+import pytest
+from aioresponses import aioresponses
+
+from aiotaipit import (
+    PRIORITY_BULK,
+    PRIORITY_INTERACTIVE,
+    SimpleTaipitAuth,
+    TaipitApi,
+    TaipitPriorityDispatcher,
+    taipit_priority,
+)
+from aiotaipit.const import DEFAULT_BASE_URL
+from tests.conftest import make_token
+
+API_URL = f"{DEFAULT_BASE_URL}/api"
+
+
+class TestPriorityDispatcher:
+    async def test_weighted_order(self) -> None:
+        dispatcher = TaipitPriorityDispatcher(
+            1, weights={PRIORITY_INTERACTIVE: 3, PRIORITY_BULK: 1}
+        )
+        order: list[str] = []
+        release = asyncio.Event()
+
+        async def _request(priority: str) -> None:
+            async with dispatcher.async_slot(priority):
+                order.append(priority)
+                await release.wait()
+
+        blocker = asyncio.create_task(_request(PRIORITY_BULK))
+        await asyncio.sleep(0)
+        tasks = [
+            asyncio.create_task(_request(priority))
+            for priority in [PRIORITY_BULK] * 4 + [PRIORITY_INTERACTIVE] * 4
+        ]
+        await asyncio.sleep(0)
+        assert dispatcher.queue_depth() == 8
+        assert dispatcher.queue_depth(PRIORITY_BULK) == 4
+
+        release.set()
+        await asyncio.gather(blocker, *tasks)
+
+        assert order[1:6] == [
+            PRIORITY_INTERACTIVE,
+            PRIORITY_INTERACTIVE,
+            PRIORITY_BULK,
+            PRIORITY_INTERACTIVE,
+            PRIORITY_INTERACTIVE,
+        ]
+        metrics = dispatcher.get_metrics()
+        assert metrics[PRIORITY_BULK]["dispatched"] == 5
+        assert metrics[PRIORITY_INTERACTIVE]["dispatched"] == 4
+        assert metrics[PRIORITY_INTERACTIVE]["queue_depth"] == 0
+        assert dispatcher.in_flight == 0
+
+    async def test_cancel_waiting(self) -> None:
+        dispatcher = TaipitPriorityDispatcher(1)
+        async with dispatcher.async_slot():
+            task = asyncio.create_task(
+                dispatcher.async_slot(PRIORITY_BULK).__aenter__()
+            )
+            await asyncio.sleep(0)
+            assert dispatcher.queue_depth() == 1
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            assert dispatcher.queue_depth() == 0
+        assert dispatcher.in_flight == 0
+
+    async def test_cancel_on_release(self) -> None:
+        dispatcher = TaipitPriorityDispatcher(1)
+        async with dispatcher.async_slot():
+            task = asyncio.create_task(dispatcher.async_slot().__aenter__())
+            await asyncio.sleep(0)
+            # cancelled in the same tick the slot is released
+            task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert dispatcher.queue_depth() == 0
+        assert dispatcher.in_flight == 0
+
+    async def test_unknown_priority(self) -> None:
+        dispatcher = TaipitPriorityDispatcher()
+        with pytest.raises(ValueError):
+            async with dispatcher.async_slot("unknown"):
+                pass
+
+
+class TestAuthDispatcher:
+    async def test_request_priority(self, session_mock: aioresponses) -> None:
+        session_mock.get(f"{API_URL}/meter/list-all", payload=[], repeat=True)
+        dispatcher = TaipitPriorityDispatcher(2)
+        async with aiohttp.ClientSession() as session:
+            auth = SimpleTaipitAuth(
+                "user", "pass", session, token=make_token(), dispatcher=dispatcher
+            )
+            api = TaipitApi(auth)
+            await api.async_get("meter/list-all", priority=PRIORITY_BULK)
+            with taipit_priority(PRIORITY_BULK):
+                await api.async_get_meters()
+            await api.async_get_meters()
+
+        metrics = dispatcher.get_metrics()
+        assert metrics[PRIORITY_BULK]["dispatched"] == 2
+        assert metrics[PRIORITY_INTERACTIVE]["dispatched"] == 1
@@ -0,0 +1,107 @@
+"""Tests for aiotaipit enrich module."""
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock
+
+from aiotaipit import TaipitApiError, TaipitEnricher
+
+METERS = [{"id": meter_id, "userId": meter_id % 2} for meter_id in range(1, 11)]
+
+
+def _api() -> AsyncMock:
+    api = AsyncMock()
+
+    async def _user_info(user_id: int) -> dict[str, Any]:
+        await asyncio.sleep(0.01)
+        return {"id": user_id}
+
+    async def _tariff(meter_id: int) -> dict[str, Any]:
+        if meter_id > 5:
+            raise TaipitApiError("403")
+        return {"meter": meter_id}
+
+    api.async_get_meters.return_value = METERS
+    api.async_get_meter_info.side_effect = lambda meter_id: {"id": meter_id}
+    api.async_get_user_info.side_effect = _user_info
+    api.async_get_tariff.side_effect = _tariff
+    return api
+
+
+class TestEnricher:
+    async def test_enrich(self) -> None:
+        api = _api()
+        enricher = TaipitEnricher(api)
+        rows = await enricher.async_enrich()
+
+        assert len(rows) == 10
+        assert rows[0].meter == METERS[0]
+        assert rows[0].info == {"id": 1}
+        assert rows[0].user == {"id": 1}
+        assert rows[1].user == {"id": 0}
+        assert rows[0].tariff == {"meter": 1}
+        assert rows[9].tariff is None
+        assert api.async_get_user_info.await_count == 2
+        assert api.async_get_meter_info.await_count == 10
+        assert api.async_get_tariff.await_count == 10
+
+    async def test_cache(self) -> None:
+        api = _api()
+        enricher = TaipitEnricher(api)
+        await enricher.async_enrich()
+        rows = await enricher.async_enrich()
+
+        assert rows[9].tariff is None
+        assert api.async_get_tariff.await_count == 10
+        assert api.async_get_user_info.await_count == 2
+        metrics = enricher.get_metrics()
+        assert metrics["tariff"] == {"requests": 10, "hits": 10}
+
+        enricher.clear()
+        await enricher.async_enrich(include=("tariff",))
+        assert api.async_get_tariff.await_count == 20
+
+    async def test_negative_ttl(self) -> None:
+        api = _api()
+        enricher = TaipitEnricher(api, negative_ttl=0)
+        await enricher.async_enrich(include=("tariff",))
+        await enricher.async_enrich(include=("tariff",))
+        assert api.async_get_tariff.await_count == 15
+
+    async def test_user_id_from_info(self) -> None:
+        api = _api()
+        api.async_get_meter_info.side_effect = lambda meter_id: {"ownerId": 7}
+        enricher = TaipitEnricher(api, user_id_field="ownerId")
+        rows = await enricher.async_enrich([{"id": 1}, {"id": 2}], include=("user",))
+
+        assert [row.user for row in rows] == [{"id": 7}, {"id": 7}]
+        assert rows[0].info is None
+        assert rows[0].tariff is None
+        api.async_get_user_info.assert_awaited_once_with(7)
+
+    async def test_coalescing(self) -> None:
+        api = _api()
+        enricher = TaipitEnricher(api, concurrency=1)
+        await asyncio.gather(
+            enricher.async_enrich(include=("user",)),
+            enricher.async_enrich(include=("user",)),
+        )
+        assert api.async_get_user_info.await_count == 2
+
+    async def test_cancelled_caller(self) -> None:
+        api = _api()
+        enricher = TaipitEnricher(api)
+        first = asyncio.create_task(
+            enricher.async_enrich([METERS[0]], include=("user",))
+        )
+        second = asyncio.create_task(
+            enricher.async_enrich([METERS[0]], include=("user",))
+        )
+        # both are waiting for the user fetch started by the first
+        await asyncio.sleep(0.005)
+        first.cancel()
+
+        enriched = await second
+        assert enriched[0].user == {"id": 1}
+        assert api.async_get_user_info.await_count == 1
@@ -0,0 +1,155 @@
+"""Tests for aiotaipit export module."""
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import json
+import sys
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+
+from aiotaipit import (
+    CsvExportWriter,
+    NdjsonExportWriter,
+    ParquetExportWriter,
+    TaipitApiError,
+    async_export_meters,
+    async_export_readings,
+)
+from aiotaipit.export import AbstractExportWriter
+from tests.conftest import load_fixture
+
+
+class ListWriter(AbstractExportWriter):
+    """Collect written chunks in memory."""
+
+    def __init__(self) -> None:
+        self.chunks: list[list[dict[str, Any]]] = []
+
+    def write_rows(self, rows) -> None:
+        self.chunks.append(list(rows))
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def api() -> AsyncMock:
+    """Create an API mock."""
+    _api = AsyncMock()
+    _api.async_get_meters.return_value = load_fixture("meters_response.json")
+
+    async def _readings(meter_id: int) -> dict[str, Any]:
+        if meter_id == 13:
+            raise TaipitApiError("failed")
+        await asyncio.sleep(0)
+        return {
+            "id": meter_id,
+            "readings": [{"date": "2026-02-01", "value": float(meter_id)}],
+        }
+
+    _api.async_get_meter_readings.side_effect = _readings
+    return _api
+
+
+class TestExport:
+    async def test_export_meters_ndjson(self, api: AsyncMock) -> None:
+        output = io.StringIO()
+        with NdjsonExportWriter(output) as writer:
+            count = await async_export_meters(api, writer)
+
+        assert count == 1
+        row = json.loads(output.getvalue())
+        assert row["id"] == 12345
+        assert row["metername"] == "Test Meter"
+        assert row["energy_a"] == 1234.5
+        assert row["energy_t3_a"] == 134.5
+
+    async def test_export_readings_csv(self, api: AsyncMock, tmp_path: Path) -> None:
+        path = tmp_path / "readings.csv"
+        with CsvExportWriter(path) as writer:
+            count = await async_export_readings(api, writer, [1, 2, 3])
+
+        with path.open(encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        assert count == 3
+        assert sorted(row["meter_id"] for row in rows) == ["1", "2", "3"]
+        assert rows[0].keys() == {"meter_id", "date", "value"}
+
+    def test_csv_columns(self) -> None:
+        output = io.StringIO()
+        with CsvExportWriter(output) as writer:
+            writer.write_rows([{"a": 1}, {"a": 2, "b": 3}])
+            with pytest.raises(ValueError):
+                writer.write_rows([{"a": 4, "c": 5}])
+        assert output.getvalue().splitlines()[:3] == ["a,b", "1,", "2,3"]
+
+        output = io.StringIO()
+        with CsvExportWriter(output, ["a"]) as writer:
+            writer.write_rows([{"a": 1, "b": 2}])
+        assert output.getvalue().splitlines() == ["a", "1"]
+
+    async def test_export_readings_chunks(self, api: AsyncMock) -> None:
+        writer = ListWriter()
+        count = await async_export_readings(
+            api,
+            writer,
+            range(1, 26),
+            concurrency=4,
+            chunk_size=10,
+            queue_size=2,
+        )
+
+        assert count == 24
+        assert [len(chunk) for chunk in writer.chunks] == [10, 10, 4]
+
+    async def test_export_all_meters(self, api: AsyncMock) -> None:
+        writer = ListWriter()
+        count = await async_export_readings(api, writer)
+
+        assert count == 1
+        assert writer.chunks[0][0]["meter_id"] == 12345
+
+    @pytest.mark.parametrize("fail_writer", [False, True])
+    async def test_export_failure_stops_workers(self, fail_writer: bool) -> None:
+        api = AsyncMock()
+
+        async def _readings(meter_id: int) -> dict[str, Any]:
+            await asyncio.sleep(0.001)
+            if meter_id == 3 and not fail_writer:
+                raise RuntimeError("crash")
+            return {"readings": [{"value": meter_id}]}
+
+        api.async_get_meter_readings.side_effect = _readings
+        writer = ListWriter()
+        if fail_writer:
+            writer.write_rows = lambda rows: 1 / 0  # type: ignore[method-assign]
+        tasks = asyncio.all_tasks()
+
+        with pytest.raises(ZeroDivisionError if fail_writer else RuntimeError):
+            await async_export_readings(
+                api, writer, range(100), concurrency=4, chunk_size=1, queue_size=1
+            )
+        calls = api.async_get_meter_readings.await_count
+        await asyncio.sleep(0.05)
+        assert api.async_get_meter_readings.await_count == calls < 100
+        assert asyncio.all_tasks() == tasks
+
+    async def test_export_parquet(self, api: AsyncMock, tmp_path: Path) -> None:
+        pq = pytest.importorskip("pyarrow.parquet")
+        path = tmp_path / "readings.parquet"
+        with ParquetExportWriter(path) as writer:
+            await async_export_readings(api, writer, range(1, 6), chunk_size=2)
+
+        assert pq.read_table(path).num_rows == 5
+
+    def test_parquet_requires_pyarrow(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setitem(sys.modules, "pyarrow", None)
+        with pytest.raises(ImportError, match="pyarrow"):
+            ParquetExportWriter(tmp_path / "readings.parquet")
@@ -0,0 +1,102 @@
+"""Tests for aiotaipit hedging module."""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+import pytest
+
+from aiotaipit import (
+    AbstractTaipitTransport,
+    SimpleTaipitAuth,
+    TaipitApi,
+    TaipitApiError,
+    TaipitHedgingPolicy,
+    TaipitResponse,
+)
+from tests.conftest import make_token
+
+
+class DelayTransport(AbstractTaipitTransport):
+    """Transport answering after the next delay of the list."""
+
+    def __init__(self) -> None:
+        self.delays: list[float] = []
+        self.calls = 0
+        self.cancelled = 0
+
+    async def async_request(
+        self, method: str, url: str, **kwargs: Any
+    ) -> TaipitResponse:
+        delay = self.delays.pop(0) if self.delays else 0.0
+        self.calls += 1
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        status = 500 if delay < 0 else 200
+        return TaipitResponse(status, {}, str(self.calls).encode())
+
+
+def _api(transport: DelayTransport, hedging: TaipitHedgingPolicy) -> TaipitApi:
+    auth = SimpleTaipitAuth(
+        "user",
+        "password",
+        None,
+        token=make_token(),
+        transport=transport,
+        hedging=hedging,
+    )
+    return TaipitApi(auth)
+
+
+class TestHedging:
+    async def test_hedge_wins(self) -> None:
+        transport = DelayTransport()
+        hedging = TaipitHedgingPolicy(min_samples=5, budget=0.5)
+        api = _api(transport, hedging)
+        for _ in range(5):
+            await api.async_get_meter_info(1)
+        assert hedging.get_delay() is not None
+        assert hedging.hedged == 0
+
+        transport.delays = [5.0, 0.0]
+        started = time.monotonic()
+        assert await api.async_get_meter_info(1) == 7
+        assert time.monotonic() - started < 1
+        await asyncio.sleep(0)
+        assert transport.cancelled == 1
+        assert hedging.get_metrics()["hedged"] == 1
+        assert hedging.hedge_wins == 1
+
+    async def test_budget(self) -> None:
+        transport = DelayTransport()
+        hedging = TaipitHedgingPolicy(min_samples=1, budget=0.5, max_tokens=1)
+        api = _api(transport, hedging)
+        await api.async_get_meter_readings(1)
+
+        transport.delays = [0.05, 0.05, 0.05]
+        await api.async_get_meter_readings(1)
+        assert hedging.hedged == 1
+        await api.async_get_meter_readings(1)
+        assert hedging.hedged == 1
+
+    async def test_failed_first_request(self) -> None:
+        transport = DelayTransport()
+        hedging = TaipitHedgingPolicy(min_samples=1, budget=1)
+        api = _api(transport, hedging)
+        await api.async_get_meter_readings(1)
+
+        transport.delays = [-1, 0.05]
+        with pytest.raises(TaipitApiError):
+            await api.async_get_meter_readings(1)
+        assert hedging.hedged == 0
+
+    def test_applies(self) -> None:
+        hedging = TaipitHedgingPolicy()
+        assert hedging.applies("GET", "api/bmd/all")
+        assert hedging.applies("get", "api/meter/get-id")
+        assert not hedging.applies("POST", "api/bmd/all")
+        assert not hedging.applies("GET", "api/meter/list-all")
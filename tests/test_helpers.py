@@ -1,7 +1,23 @@
 """Tests for aiotaipit helpers module."""
 from __future__ import annotations
 
+from unittest.mock import AsyncMock
+
+import pytest
+
 from aiotaipit import helpers
+from aiotaipit.const import METER_MODELS, REGIONS
+from tests.conftest import load_fixture
+
+
+@pytest.fixture
+def index(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Isolate the process-wide reference index."""
+    monkeypatch.setattr(
+        helpers, "_INDEX", helpers._ReferenceIndex(REGIONS, METER_MODELS)
+    )
+    monkeypatch.setattr(helpers, "_settings_merged", False)
+    monkeypatch.setattr(helpers, "_settings_lock", None)
 
 
 class TestHelpers:
@@ -12,3 +28,66 @@ class TestHelpers:
     def test_model_names(self):
         assert helpers.get_model_name(21) == ('НЕВА', 'МТ 124 (Wi-Fi)')
         assert helpers.get_model_name(0) == (None, '0')
+
+    def test_bulk_regions(self):
+        assert helpers.get_region_names([77, 78, 133]) == [
+            'Москва',
+            'Санкт-Петербург',
+            '133',
+        ]
+
+    def test_bulk_model_names(self):
+        assert helpers.get_model_names((21, 0)) == [
+            ('НЕВА', 'МТ 124 (Wi-Fi)'),
+            (None, '0'),
+        ]
+
+    def test_region_id(self):
+        assert helpers.get_region_id('Ростовская область') == 61
+        assert helpers.get_region_id('  ростовская   ОБЛАСТЬ ') == 61
+        assert helpers.get_region_id('Неизвестная область') is None
+
+    def test_model_ids(self):
+        assert helpers.get_model_ids('Берегун') == (13, 14)
+        assert helpers.get_model_ids('берегун') == (13, 14)
+        assert helpers.get_model_ids('Unknown') == ()
+
+    def test_match_endpoint(self):
+        values = {"api/": 1, "api/bmd": 2}
+        assert helpers.match_endpoint("api/bmd/all", values, 0) == 2
+        assert helpers.match_endpoint("api/meter", values, 0) == 1
+        assert helpers.match_endpoint("token", values, 0) == 0
+
+
+@pytest.mark.usefixtures("index")
+class TestMergeSettings:
+    def test_merge_settings(self):
+        helpers.merge_settings({
+            "regions": [{"id": 99, "name": "Новый регион"}],
+            "meterTypes": [
+                {"id": 16, "name": "Something else"},
+                {"id": 100, "name": "НЕВА МТ 999"},
+                {"id": 101, "name": "Другой"},
+            ],
+        })
+
+        assert helpers.get_region_name(99) == 'Новый регион'
+        assert helpers.get_region_id('новый регион') == 99
+        assert helpers.get_model_name(16) == ('НЕВА', 'МТ 114 (Wi-Fi)')
+        assert helpers.get_model_name(100) == ('НЕВА', 'МТ 999')
+        assert helpers.get_model_name(101) == (None, 'Другой')
+        assert 100 in helpers.get_model_ids('НЕВА')
+
+    async def test_async_merge_settings_once(self):
+        api = AsyncMock()
+        api.async_get_settings.return_value = load_fixture(
+            "settings_response.json"
+        )
+
+        await helpers.async_merge_settings(api)
+        await helpers.async_merge_settings(api)
+
+        api.async_get_settings.assert_awaited_once()
+
+        await helpers.async_merge_settings(api, force=True)
+        assert api.async_get_settings.await_count == 2
@@ -0,0 +1,114 @@
+"""Tests for aiotaipit hub module."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock
+
+from aiotaipit import (
+    MeterEventType,
+    OverflowPolicy,
+    TaipitApiError,
+    TaipitMeterHub,
+)
+
+
+def _meter(meter_id: int, value: float) -> dict:
+    return {"id": meter_id, "ecometerdata": {"lastReading": {"energy_a": value}}}
+
+
+class TestMeterHub:
+    async def test_fan_out(self) -> None:
+        polls = [
+            [_meter(1, 1.0), _meter(2, 1.0)],
+            [_meter(1, 2.0), _meter(2, 1.0), _meter(3, 0.0)],
+            [_meter(1, 2.0), _meter(3, 0.0)],
+        ]
+        api = AsyncMock()
+        api.async_get_meters.side_effect = polls + [polls[-1]] * 100
+        hub = TaipitMeterHub(poll_interval=0.01)
+
+        first = await hub.async_subscribe(api)
+        second = await hub.async_subscribe(api)
+        assert set(first.snapshot) == {1, 2}
+        assert second.snapshot == first.snapshot
+
+        events = [await first.async_get() for _ in range(3)]
+        assert [(event.type, event.meter_id) for event in events] == [
+            (MeterEventType.UPDATED, 1),
+            (MeterEventType.ADDED, 3),
+            (MeterEventType.REMOVED, 2),
+        ]
+        assert events[0].meter == _meter(1, 2.0)
+        assert [(await second.async_get()).meter_id for _ in range(3)] == [1, 3, 2]
+
+        late = await hub.async_subscribe(api)
+        assert set(late.snapshot) == {1, 3}
+
+        await hub.async_close()
+        assert first.closed
+        assert await late.async_get() is None
+        assert [event async for event in second] == []
+        assert api.async_get_meters.await_count < 100
+
+    async def test_overflow_policies(self) -> None:
+        values = iter(range(1000))
+        api = AsyncMock()
+        api.async_get_meters.side_effect = lambda: [_meter(1, next(values))]
+        hub = TaipitMeterHub(poll_interval=0)
+
+        dropping = await hub.async_subscribe(
+            api, maxsize=2, policy=OverflowPolicy.DROP_OLDEST
+        )
+        blocking = await hub.async_subscribe(
+            api, maxsize=2, policy=OverflowPolicy.BLOCK
+        )
+        await asyncio.sleep(0.05)
+        assert dropping.dropped > 0
+        assert blocking.dropped == 0
+
+        first = await blocking.async_get()
+        second = await blocking.async_get()
+        assert first is not None and second is not None
+        assert (
+            second.meter["ecometerdata"]["lastReading"]["energy_a"]
+            == first.meter["ecometerdata"]["lastReading"]["energy_a"] + 1
+        )
+
+        blocking.close()
+        dropping.close()
+        await asyncio.sleep(0)
+        assert hub._accounts == {}
+
+    async def test_account_key(self) -> None:
+        first_api, second_api, other_api = AsyncMock(), AsyncMock(), AsyncMock()
+        for api in (first_api, second_api, other_api):
+            api.async_get_meters.return_value = [_meter(1, 1.0)]
+        hub = TaipitMeterHub(poll_interval=10)
+
+        first = await hub.async_subscribe(first_api, account="user")
+        second = await hub.async_subscribe(second_api, account="user")
+        other = await hub.async_subscribe(other_api)
+        assert second.snapshot == first.snapshot == other.snapshot
+        assert first_api.async_get_meters.await_count == 1
+        assert second_api.async_get_meters.await_count == 0
+        assert other_api.async_get_meters.await_count == 1
+
+        first.close()
+        second.close()
+        third = await hub.async_subscribe(second_api, account="user")
+        assert second_api.async_get_meters.await_count == 1
+        third.close()
+        other.close()
+        await hub.async_close()
+
+    async def test_failed_poll(self) -> None:
+        api = AsyncMock()
+        api.async_get_meters.side_effect = [TaipitApiError("down"), [_meter(1, 1)]]
+        hub = TaipitMeterHub(poll_interval=0.01)
+
+        subscription = await hub.async_subscribe(api)
+        assert subscription.snapshot == {}
+        event = await asyncio.wait_for(subscription.async_get(), 1)
+        assert event is not None
+        assert event.type is MeterEventType.ADDED
+        subscription.close()
@@ -0,0 +1,74 @@
+"""Tests for aiotaipit incremental module."""
+from __future__ import annotations
+
+from aioresponses import aioresponses
+from yarl import URL
+
+from aiotaipit import (
+    MemoryReadingsStore,
+    TaipitApi,
+    TaipitIncrementalReadings,
+)
+from aiotaipit.const import DEFAULT_BASE_URL
+
+API_URL = f"{DEFAULT_BASE_URL}/api"
+METER_ID = 12345
+READINGS_URL = f"{API_URL}/bmd/all?id={METER_ID}"
+
+
+def _readings(*dates: str) -> dict:
+    return {
+        "id": METER_ID,
+        "readings": [{"date": date, "value": 1.0} for date in dates],
+    }
+
+
+class TestIncrementalReadings:
+    async def test_new_readings_only(
+        self, mock_api: TaipitApi, session_mock: aioresponses
+    ) -> None:
+        session_mock.get(READINGS_URL, payload=_readings("2026-02-01", "2026-02-02"))
+        session_mock.get(
+            READINGS_URL, payload=_readings("2026-02-01", "2026-02-02", "2026-02-03")
+        )
+        store = MemoryReadingsStore()
+        incremental = TaipitIncrementalReadings(mock_api, store)
+
+        first = await incremental.async_get_new_readings(METER_ID)
+        second = await incremental.async_get_new_readings(METER_ID)
+
+        assert [r["date"] for r in first] == ["2026-02-01", "2026-02-02"]
+        assert [r["date"] for r in second] == ["2026-02-03"]
+        state = await store.async_get_state(METER_ID)
+        assert state["last_date"] == "2026-02-03"
+
+    async def test_unchanged_body(
+        self, mock_api: TaipitApi, session_mock: aioresponses
+    ) -> None:
+        session_mock.get(READINGS_URL, payload=_readings("2026-02-01"), repeat=True)
+        incremental = TaipitIncrementalReadings(mock_api)
+
+        assert len(await incremental.async_get_new_readings(METER_ID)) == 1
+        assert await incremental.async_get_new_readings(METER_ID) == []
+
+    async def test_conditional_headers(
+        self, mock_api: TaipitApi, session_mock: aioresponses
+    ) -> None:
+        session_mock.get(
+            READINGS_URL,
+            payload=_readings("2026-02-01"),
+            headers={
+                "ETag": '"abc"',
+                "Last-Modified": "Sun, 01 Feb 2026 00:00:00 GMT",
+            },
+        )
+        session_mock.get(READINGS_URL, status=304)
+        incremental = TaipitIncrementalReadings(mock_api)
+
+        await incremental.async_get_new_readings(METER_ID)
+        assert await incremental.async_get_new_readings(METER_ID) == []
+
+        calls = session_mock.requests[("GET", URL(READINGS_URL))]
+        headers = calls[1].kwargs["headers"]
+        assert headers["If-None-Match"] == '"abc"'
+        assert headers["If-Modified-Since"] == "Sun, 01 Feb 2026 00:00:00 GMT"
@@ -0,0 +1,119 @@
+"""Tests for aiotaipit limiter module."""
+from __future__ import annotations
+
+import asyncio
+import io
+from unittest.mock import AsyncMock
+
+import pytest
+from aiohttp import ClientResponseError
+
+from aiotaipit import (
+    NdjsonExportWriter,
+    TaipitAdaptiveLimiter,
+    TaipitApiError,
+    TaipitDeadlineExceeded,
+    TaipitTimeoutError,
+    async_export_readings,
+)
+from aiotaipit.limiter import is_overload
+
+
+def _api_error(status: int) -> TaipitApiError:
+    error = TaipitApiError(str(status))
+    error.__cause__ = ClientResponseError(None, (), status=status)
+    return error
+
+
+class TestAdaptiveLimiter:
+    def test_is_overload(self) -> None:
+        assert is_overload(TaipitTimeoutError("timeout"))
+        assert not is_overload(TaipitDeadlineExceeded("deadline"))
+        assert is_overload(TimeoutError())
+        assert is_overload(_api_error(429))
+        assert is_overload(_api_error(503))
+        assert not is_overload(_api_error(404))
+        assert not is_overload(ValueError())
+
+    async def test_additive_increase(self) -> None:
+        limiter = TaipitAdaptiveLimiter(initial_limit=2, max_limit=4)
+        for _ in range(20):
+            async with limiter.async_slot():
+                pass
+        assert limiter.limit == 4
+        assert limiter.get_metrics()["increases"] == 2
+        assert limiter.in_flight == 0
+
+    async def test_no_increase_above_target(self) -> None:
+        limiter = TaipitAdaptiveLimiter(initial_limit=1, target_latency=0.001)
+        for _ in range(3):
+            async with limiter.async_slot():
+                await asyncio.sleep(0.01)
+        assert limiter.limit == 1
+        assert limiter.get_p95_latency() >= 0.01
+
+    async def test_multiplicative_decrease(self) -> None:
+        limiter = TaipitAdaptiveLimiter(initial_limit=16, target_latency=60)
+        for error in (_api_error(503), _api_error(429), _api_error(404)):
+            with pytest.raises(TaipitApiError):
+                async with limiter.async_slot():
+                    raise error
+        assert limiter.limit == 8
+        assert limiter.get_metrics()["decreases"] == 1
+
+        limiter._last_decrease -= 60
+        with pytest.raises(TaipitTimeoutError):
+            async with limiter.async_slot():
+                raise TaipitTimeoutError("timeout")
+        assert limiter.limit == 4
+
+        limiter._last_decrease -= 60
+        with pytest.raises(TaipitDeadlineExceeded):
+            async with limiter.async_slot():
+                raise TaipitDeadlineExceeded("deadline")
+        assert limiter.limit == 4
+
+    async def test_limits_in_flight(self) -> None:
+        limiter = TaipitAdaptiveLimiter(initial_limit=2, max_limit=2)
+        running = peak = 0
+
+        async def _request() -> None:
+            nonlocal running, peak
+            async with limiter.async_slot():
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(_request() for _ in range(10)))
+        assert peak == 2
+        assert limiter.get_metrics()["waiting"] == 0
+
+    async def test_cancel_on_release(self) -> None:
+        limiter = TaipitAdaptiveLimiter(initial_limit=1, max_limit=1)
+        async with limiter.async_slot():
+            task = asyncio.create_task(limiter.async_slot().__aenter__())
+            await asyncio.sleep(0)
+            # cancelled in the same tick the slot is released
+            task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        metrics = limiter.get_metrics()
+        assert metrics["waiting"] == 0
+        assert metrics["in_flight"] == 0
+
+    def test_invalid_limits(self) -> None:
+        with pytest.raises(ValueError):
+            TaipitAdaptiveLimiter(initial_limit=5, max_limit=4)
+
+    async def test_export_with_limiter(self) -> None:
+        api = AsyncMock()
+        api.async_get_meter_readings.side_effect = lambda meter_id: {
+            "readings": [{"energy_a": meter_id}]
+        }
+        limiter = TaipitAdaptiveLimiter(initial_limit=1, max_limit=3)
+        writer = NdjsonExportWriter(io.StringIO())
+
+        rows = await async_export_readings(api, writer, range(30), limiter=limiter)
+        assert rows == 30
+        assert limiter.limit == 3
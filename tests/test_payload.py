@@ -0,0 +1,56 @@
+"""Tests for aiotaipit payload module."""
+from __future__ import annotations
+
+import json
+import logging
+
+import pytest
+
+from aiotaipit import TaipitPayloadLogger, TaipitResponse
+from aiotaipit.payload import count_items
+
+
+def _response(data: object) -> TaipitResponse:
+    return TaipitResponse(200, {}, json.dumps(data).encode())
+
+
+class TestPayloadLogger:
+    def test_count_items(self) -> None:
+        assert count_items([1, 2, 3]) == 3
+        assert count_items({"readings": [1, 2], "meter": {}}) == {"readings": 2}
+        assert count_items({"a": 1, "b": 2}) == 2
+        assert count_items(None) is None
+
+    def test_truncated_and_sampled(self, caplog: pytest.LogCaptureFixture) -> None:
+        payload_logger = TaipitPayloadLogger(max_body=10, sample_rate=2)
+        data = {"readings": [{"energy_a": 1.0}] * 1000}
+        response = _response(data)
+
+        with caplog.at_level(logging.DEBUG, logger="aiotaipit"):
+            assert payload_logger.is_enabled()
+            for _ in range(4):
+                payload_logger.log_response("GET", "api/bmd/all", response, data)
+
+        assert len(caplog.records) == 2
+        record = caplog.records[0]
+        assert record.taipit == {
+            "method": "GET",
+            "url": "api/bmd/all",
+            "status": 200,
+            "size": len(response.body),
+            "items": {"readings": 1000},
+        }
+        assert record.getMessage().endswith(
+            f"body={response.body[:10].decode()}..."
+        )
+
+    def test_disabled(self, caplog: pytest.LogCaptureFixture) -> None:
+        payload_logger = TaipitPayloadLogger()
+        with caplog.at_level(logging.INFO, logger="aiotaipit"):
+            assert not payload_logger.is_enabled()
+            payload_logger.log_response("GET", "api", _response([]), [])
+        assert not caplog.records
+
+    def test_invalid_sample_rate(self) -> None:
+        with pytest.raises(ValueError):
+            TaipitPayloadLogger(sample_rate=0)
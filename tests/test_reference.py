@@ -0,0 +1,112 @@
+"""Tests for aiotaipit reference module."""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+from aiotaipit import TaipitApiError, TaipitReferenceData, helpers
+from aiotaipit.const import METER_MODELS, REGIONS, SECTIONS_REFERENCE
+
+SETTINGS = {
+    "regions": [{"id": 99, "name": "Новый регион"}],
+    "meterTypesFull": [{"id": 100, "name": "НЕВА МТ 999"}],
+    "controllers": [{"id": 5, "name": "Wi-Fi"}],
+}
+
+
+@pytest.fixture(autouse=True)
+def index(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Isolate the process-wide reference index."""
+    monkeypatch.setattr(
+        helpers, "_INDEX", helpers._ReferenceIndex(REGIONS, METER_MODELS)
+    )
+
+
+@pytest.fixture
+def api() -> AsyncMock:
+    """Create an API mock returning reference settings."""
+    _api = AsyncMock()
+    _api.async_get_settings.return_value = SETTINGS
+    return _api
+
+
+class TestReferenceData:
+    def test_static_fallback(self, api: AsyncMock) -> None:
+        reference = TaipitReferenceData(api)
+        assert reference.is_stale
+        assert reference.get_region_name(61) == 'Ростовская область'
+        assert reference.get_model_name(100) == (None, '100')
+
+    async def test_load_from_cloud(self, api: AsyncMock, tmp_path: Path) -> None:
+        snapshot_path = tmp_path / "reference.json"
+        reference = TaipitReferenceData(api, snapshot_path=snapshot_path)
+
+        await reference.async_load()
+        await reference.async_load()
+
+        api.async_get_settings.assert_awaited_once_with(
+            SECTIONS_REFERENCE, refresh=True
+        )
+        assert not reference.is_stale
+        assert reference.get_region_name(99) == 'Новый регион'
+        assert reference.get_model_name(100) == ('НЕВА', 'МТ 999')
+        assert reference.get_model_name(21) == ('НЕВА', 'МТ 124 (Wi-Fi)')
+        assert reference.get_controller(5) == {"id": 5, "name": "Wi-Fi"}
+        assert helpers.get_model_name(100) == ('НЕВА', 'МТ 999')
+
+        snapshot = json.loads(snapshot_path.read_text(encoding="utf-8"))
+        assert snapshot["settings"] == SETTINGS
+
+    async def test_load_from_snapshot(
+        self, api: AsyncMock, tmp_path: Path
+    ) -> None:
+        snapshot_path = tmp_path / "reference.json"
+        snapshot_path.write_text(
+            json.dumps({"updated_at": time.time(), "settings": SETTINGS}),
+            encoding="utf-8",
+        )
+        reference = TaipitReferenceData(api, snapshot_path=snapshot_path)
+
+        await reference.async_load()
+
+        api.async_get_settings.assert_not_awaited()
+        assert reference.get_region_name(99) == 'Новый регион'
+
+    async def test_stale_snapshot_on_error(
+        self, api: AsyncMock, tmp_path: Path
+    ) -> None:
+        snapshot_path = tmp_path / "reference.json"
+        snapshot_path.write_text(
+            json.dumps({"updated_at": 0, "settings": SETTINGS}),
+            encoding="utf-8",
+        )
+        api.async_get_settings.side_effect = TaipitApiError("down")
+        reference = TaipitReferenceData(api, snapshot_path=snapshot_path)
+
+        await reference.async_load()
+
+        assert reference.is_stale
+        assert reference.get_region_name(99) == 'Новый регион'
+
+    async def test_error_without_snapshot(self, api: AsyncMock) -> None:
+        api.async_get_settings.side_effect = TaipitApiError("down")
+        reference = TaipitReferenceData(api)
+
+        with pytest.raises(TaipitApiError):
+            await reference.async_load()
+
+    async def test_background_refresh(self, api: AsyncMock) -> None:
+        reference = TaipitReferenceData(api, ttl=0.01)
+
+        await reference.async_start()
+        first_update = reference.updated_at
+        await asyncio.sleep(0.05)
+        await reference.async_stop()
+
+        assert api.async_get_settings.await_count > 1
+        assert reference.updated_at > first_update
@@ -0,0 +1,93 @@
+"""Tests for aiotaipit registry module."""
+from __future__ import annotations
+
+import math
+from typing import Any
+
+from aiotaipit import TaipitMeterRegistry, get_model_name, get_region_name
+from tests.conftest import load_fixture
+
+
+def _meter(meter_id: int, **kwargs: Any) -> dict[str, Any]:
+    meter = {
+        "id": meter_id,
+        "metername": "Счётчик",
+        "sn": f"SN{meter_id:03}",
+        "type": 16,
+        "status": 1,
+        "ecometerdata": {"lastReading": {"energy_a": float(meter_id)}},
+    }
+    meter.update(kwargs)
+    return meter
+
+
+class TestMeterRegistry:
+    def test_fixture_round_trip(self) -> None:
+        meters = load_fixture("meters_response.json")
+        registry = TaipitMeterRegistry(meters)
+
+        assert len(registry) == 1
+        assert 12345 in registry
+        assert registry.get(12345) == meters[0]
+        assert registry.get(1) is None
+        assert registry.get_energy(12345, "energy_t1_a") == 800.0
+        assert registry.get_model_name(12345) == get_model_name(16)
+        assert registry.get_region_name(12345) is None
+
+    def test_interned_strings(self) -> None:
+        registry = TaipitMeterRegistry(
+            [_meter(1, metername="".join(["Сч", "ётчик"])), _meter(2)]
+        )
+        assert registry.get(1)["metername"] is registry.get(2)["metername"]
+
+    def test_missing_fields(self) -> None:
+        registry = TaipitMeterRegistry([{"id": 1, "regionId": 77}])
+        assert registry.get(1) == {
+            "id": 1,
+            "metername": None,
+            "sn": None,
+            "type": None,
+            "status": None,
+            "regionId": 77,
+        }
+        assert math.isnan(registry.get_energy(1))
+        assert registry.get_region_name(1) == get_region_name(77)
+
+    def test_secondary_indexes(self) -> None:
+        registry = TaipitMeterRegistry(
+            [_meter(1), _meter(2, type=5), _meter(3, status=0)]
+        )
+        assert registry.ids_by_type(16) == {1, 3}
+        assert registry.ids_by_status(1) == {1, 2}
+
+        assert registry.set_meter(_meter(1, type=5, status=0))
+        assert not registry.set_meter(_meter(1, type=5, status=0))
+        assert registry.ids_by_type(16) == {3}
+        assert registry.ids_by_type(5) == {1, 2}
+        assert registry.ids_by_status(1) == {2}
+
+    def test_remove(self) -> None:
+        registry = TaipitMeterRegistry([_meter(i) for i in range(1, 5)])
+        assert registry.remove_meter(2)
+        assert not registry.remove_meter(2)
+        assert len(registry) == 3
+        assert sorted(registry) == [1, 3, 4]
+        assert registry.get(4) == _meter(4)
+        assert registry.ids_by_type(16) == {1, 3, 4}
+
+    def test_apply_snapshot(self) -> None:
+        registry = TaipitMeterRegistry([_meter(i) for i in range(1, 6)])
+        changes = registry.apply_snapshot(
+            [
+                _meter(1),
+                _meter(2, ecometerdata={"lastReading": {"energy_a": 10.0}}),
+                _meter(4, status=2),
+                _meter(6),
+            ]
+        )
+
+        assert changes == {"added": 1, "updated": 2, "removed": 2}
+        assert sorted(registry) == [1, 2, 4, 6]
+        assert registry.get_energy(2) == 10.0
+        assert registry.ids_by_status(2) == {4}
+        assert registry.get(6) == _meter(6)
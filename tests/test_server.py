@@ -0,0 +1,178 @@
+"""Tests for aiotaipit server module."""
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import aiohttp
+import pytest
+from aiohttp import ClientResponseError
+from aiohttp.test_utils import TestServer
+
+from aiotaipit import (
+    SimpleTaipitAuth,
+    TaipitApi,
+    TaipitApiError,
+    TaipitAuthInvalidClient,
+    TaipitAuthInvalidGrant,
+    TaipitResponse,
+    TaipitServer,
+)
+from tests.conftest import load_fixture
+
+
+def _response(data: object, headers: dict | None = None) -> TaipitResponse:
+    return TaipitResponse(200, headers or {}, json.dumps(data).encode())
+
+
+class TestServerMode:
+    async def test_clients_share_cached_upstream(self) -> None:
+        meters = load_fixture("meters_response.json")
+        upstream = AsyncMock()
+        started = asyncio.Event()
+
+        async def _get_raw(path: str, **kwargs: object) -> TaipitResponse:
+            started.set()
+            await asyncio.sleep(0.05)
+            return _response(meters)
+
+        upstream.async_get_raw.side_effect = _get_raw
+        server = TaipitServer(upstream, client_id="local", client_secret="secret")
+
+        async with (
+            TestServer(server.create_app()) as test_server,
+            aiohttp.ClientSession() as session,
+        ):
+            base_url = str(test_server.make_url("")).rstrip("/")
+            apis = [
+                TaipitApi(
+                    SimpleTaipitAuth(
+                        "u",
+                        "p",
+                        session,
+                        base_url=base_url,
+                        client_id="local",
+                        client_secret="secret",
+                    )
+                )
+                for _ in range(3)
+            ]
+            results = await asyncio.gather(
+                *(api.async_get_meters() for api in apis)
+            )
+            assert results == [meters] * 3
+            assert await apis[0].async_get_meters() == meters
+
+        upstream.async_get_raw.assert_awaited_once_with(
+            "meter/list-all", params={}
+        )
+        metrics = server.get_metrics()
+        assert metrics["misses"] == 1
+        assert metrics["hits"] + metrics["coalesced"] == 3
+
+    async def test_params_etag_and_errors(self) -> None:
+        upstream = AsyncMock()
+        upstream.async_get_raw.return_value = _response(
+            {"id": 1}, {"ETag": '"v1"', "Content-Type": "application/json"}
+        )
+        server = TaipitServer(upstream, access_token="secret", cache_ttl=0)
+
+        async with (
+            TestServer(server.create_app()) as test_server,
+            aiohttp.ClientSession() as session,
+        ):
+            headers = {"Authorization": "Bearer secret"}
+            url = test_server.make_url("/api/bmd/all")
+            async with session.get(url, params={"id": "1"}, headers=headers) as resp:
+                assert resp.status == 200
+                assert await resp.json() == {"id": 1}
+            async with session.get(
+                url, params={"id": "1"}, headers={**headers, "If-None-Match": '"v1"'}
+            ) as resp:
+                assert resp.status == 304
+            async with session.get(url) as resp:
+                assert resp.status == 401
+            async with session.get(
+                test_server.make_url("/api/unknown"), headers=headers
+            ) as resp:
+                assert resp.status == 404
+
+            error = TaipitApiError("not found")
+            error.__cause__ = ClientResponseError(None, (), status=404)
+            upstream.async_get_raw.side_effect = error
+            async with session.get(
+                test_server.make_url("/api/meter/get-id"), headers=headers
+            ) as resp:
+                assert resp.status == 404
+            error = TaipitApiError("unauthorized")
+            error.__cause__ = ClientResponseError(None, (), status=401)
+            upstream.async_get_raw.side_effect = error
+            async with session.get(
+                test_server.make_url("/api/meter/get-id"), headers=headers
+            ) as resp:
+                assert resp.status == 502
+            upstream.async_get_raw.side_effect = TaipitApiError("down")
+            async with session.get(
+                test_server.make_url("/api/meter/get-id"), headers=headers
+            ) as resp:
+                assert resp.status == 502
+
+        upstream.async_get_raw.assert_any_await("bmd/all", params={"id": "1"})
+
+    async def test_cache_evicts_least_recently_used(self) -> None:
+        upstream = AsyncMock()
+        upstream.async_get_raw.side_effect = lambda path, params: _response(
+            {"path": path}
+        )
+        server = TaipitServer(upstream, cache_ttl=60, max_entries=2)
+
+        for path in ("meter/list-all", "user/getuser", "meter/list-all"):
+            await server.async_get(path)
+        await server.async_get("warnings/list")
+        assert upstream.async_get_raw.await_count == 3
+        await server.async_get("meter/list-all")
+        assert upstream.async_get_raw.await_count == 3
+        await server.async_get("user/getuser")
+        assert upstream.async_get_raw.await_count == 4
+
+    async def test_token_endpoint_rejects_unknown_clients(self) -> None:
+        upstream = AsyncMock()
+        secured = TaipitServer(
+            upstream, access_token="token", client_id="local", client_secret="secret"
+        )
+        disabled = TaipitServer(upstream, access_token="token")
+
+        async with aiohttp.ClientSession() as session:
+            for server, client_secret in (
+                (secured, "wrong"),
+                (secured, "ѕесret"),
+                (disabled, "secret"),
+            ):
+                async with TestServer(server.create_app()) as test_server:
+                    base_url = str(test_server.make_url("")).rstrip("/")
+                    auth = SimpleTaipitAuth(
+                        "u",
+                        "p",
+                        session,
+                        base_url=base_url,
+                        client_id="local",
+                        client_secret=client_secret,
+                    )
+                    with pytest.raises(TaipitAuthInvalidClient):
+                        await auth.async_get_access_token()
+
+            async with TestServer(secured.create_app()) as test_server:
+                base_url = str(test_server.make_url("")).rstrip("/")
+                auth = SimpleTaipitAuth(
+                    "u",
+                    "p",
+                    session,
+                    base_url=base_url,
+                    client_id="local",
+                    client_secret="secret",
+                )
+                assert await auth.async_get_access_token() == "token"
+                with pytest.raises(TaipitAuthInvalidGrant):
+                    await auth._async_refresh_token({"refresh_token": "guess"})
+        upstream.async_get_raw.assert_not_awaited()
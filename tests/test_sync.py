@@ -0,0 +1,118 @@
+"""Tests for aiotaipit sync module."""
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+import pytest
+from aioresponses import aioresponses
+
+from aiotaipit import TaipitAdaptiveLimiter, TaipitApiError, TaipitSyncApi
+from aiotaipit.const import DEFAULT_BASE_URL
+from tests.conftest import load_fixture, make_token
+
+API_URL = f"{DEFAULT_BASE_URL}/api"
+METER_ID = 12345
+
+
+@pytest.fixture
+def sync_api() -> TaipitSyncApi:
+    """Create a TaipitSyncApi with a pre-loaded token."""
+    with TaipitSyncApi(
+        "test@example.com",
+        "test",
+        token=make_token(),
+    ) as api:
+        yield api
+
+
+class TestTaipitSyncApi:
+    def test_get_meters(
+        self, sync_api: TaipitSyncApi, session_mock: aioresponses
+    ) -> None:
+        session_mock.get(
+            f"{API_URL}/meter/list-all",
+            payload=load_fixture("meters_response.json"),
+        )
+        data = sync_api.get_meters()
+
+        assert data[0]["id"] == METER_ID
+
+    def test_error(
+        self, sync_api: TaipitSyncApi, session_mock: aioresponses
+    ) -> None:
+        session_mock.get(f"{API_URL}/meter/list-all", status=500)
+        with pytest.raises(TaipitApiError):
+            sync_api.get_meters()
+
+    def test_batch_readings(
+        self, sync_api: TaipitSyncApi, session_mock: aioresponses
+    ) -> None:
+        for meter_id in (1, 2):
+            session_mock.get(
+                f"{API_URL}/bmd/all?id={meter_id}",
+                payload={"id": meter_id, "readings": []},
+            )
+        data = sync_api.get_meters_readings([1, 2, 1])
+
+        assert data == {
+            1: {"id": 1, "readings": []},
+            2: {"id": 2, "readings": []},
+        }
+
+    def test_batch_with_limiter(self, session_mock: aioresponses) -> None:
+        limiter = TaipitAdaptiveLimiter(initial_limit=4)
+        for meter_id in (1, 2):
+            session_mock.get(f"{API_URL}/bmd/all?id={meter_id}", status=503)
+        with TaipitSyncApi(
+            "test@example.com",
+            "test",
+            token=make_token(),
+            limiter=limiter,
+        ) as api, pytest.raises(TaipitApiError):
+            api.get_meters_readings([1, 2])
+
+        assert limiter.limit == 2
+
+    def test_many_threads(
+        self, sync_api: TaipitSyncApi, session_mock: aioresponses
+    ) -> None:
+        session_mock.get(
+            f"{API_URL}/meter/get-id?id={METER_ID}",
+            payload=load_fixture("meter_info_response.json"),
+            repeat=True,
+        )
+        with ThreadPoolExecutor(8) as executor:
+            results = list(
+                executor.map(sync_api.get_meter_info, [METER_ID] * 32)
+            )
+
+        assert len(results) == 32
+        assert all(result["id"] == METER_ID for result in results)
+        assert sync_api._thread is not None
+
+    def test_close(self) -> None:
+        api = TaipitSyncApi("test@example.com", "test")
+        api.start()
+        thread = api._thread
+        api.close()
+        api.close()
+
+        assert thread is not None and not thread.is_alive()
+
+    def test_close_cancels_pending_calls(self) -> None:
+        api = TaipitSyncApi("test@example.com", "test")
+        started = threading.Event()
+
+        async def _hang(_: object) -> None:
+            started.set()
+            await asyncio.sleep(60)
+
+        with ThreadPoolExecutor(1) as executor:
+            call = executor.submit(api._run, _hang)
+            assert started.wait(5)
+            api.close()
+            with pytest.raises(CancelledError):
+                call.result(5)
+        assert not api._pending
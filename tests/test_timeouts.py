@@ -0,0 +1,135 @@
+"""Tests for aiotaipit timeouts module."""
+from __future__ import annotations
+
+import asyncio
+
+import aiohttp
+import pytest
+from aiohttp import ClientTimeout
+from aioresponses import aioresponses
+
+from aiotaipit import (
+    SimpleTaipitAuth,
+    TaipitDeadlineExceeded,
+    TaipitPriorityDispatcher,
+    TaipitTimeoutError,
+    get_remaining_time,
+    taipit_deadline,
+)
+from aiotaipit.const import DEFAULT_BASE_URL
+from aiotaipit.timeouts import limit_timeout, select_timeout
+from tests.conftest import make_token
+
+API_URL = f"{DEFAULT_BASE_URL}/api"
+
+
+class TestDeadline:
+    def test_no_deadline(self) -> None:
+        assert get_remaining_time() is None
+        with taipit_deadline(None):
+            assert get_remaining_time() is None
+
+    def test_nested_deadline(self) -> None:
+        with taipit_deadline(10):
+            with taipit_deadline(100):
+                assert get_remaining_time() <= 10
+            with taipit_deadline(1):
+                assert get_remaining_time() <= 1
+        assert get_remaining_time() is None
+
+    def test_limit_timeout(self) -> None:
+        timeout = ClientTimeout(total=30, connect=5, sock_read=10)
+        assert limit_timeout(timeout) is timeout
+        with taipit_deadline(2):
+            limited = limit_timeout(timeout)
+            assert limited.total <= 2
+            assert limited.connect == 5
+            assert limited.sock_read == 10
+            assert limit_timeout(None).total <= 2
+        with taipit_deadline(0), pytest.raises(TaipitDeadlineExceeded):
+            limit_timeout(timeout)
+
+    def test_select_timeout(self) -> None:
+        default = ClientTimeout(total=30)
+        readings = ClientTimeout(total=60)
+        meter = ClientTimeout(total=5)
+        endpoints = {"api/bmd": readings, "api/meter": meter}
+        assert select_timeout("api/bmd/all", default, endpoints) is readings
+        assert select_timeout("api/meter/get-id", default, endpoints) is meter
+        assert select_timeout("api/user/getuser", default, endpoints) is default
+
+
+class TestRequestTimeouts:
+    async def test_deadline_fails_fast(self, session_mock: aioresponses) -> None:
+        async with aiohttp.ClientSession() as session:
+            auth = SimpleTaipitAuth("user", "pass", session, token=make_token())
+            with taipit_deadline(0), pytest.raises(TaipitDeadlineExceeded):
+                await auth.request("GET", "api/meter/list-all")
+
+        assert not session_mock.requests
+
+    async def test_deadline_fails_fast_on_token(
+        self, session_mock: aioresponses
+    ) -> None:
+        async with aiohttp.ClientSession() as session:
+            auth = SimpleTaipitAuth("user", "pass", session)
+            with taipit_deadline(0), pytest.raises(TaipitDeadlineExceeded):
+                await auth.async_get_access_token()
+
+        assert not session_mock.requests
+
+    async def test_deadline_limits_token_lock(
+        self, session_mock: aioresponses
+    ) -> None:
+        async with aiohttp.ClientSession() as session:
+            auth = SimpleTaipitAuth("user", "pass", session, token=make_token())
+            async with auth._lock:
+                with taipit_deadline(0.01), pytest.raises(TaipitDeadlineExceeded):
+                    await auth.request("GET", "api/meter/list-all")
+            assert not auth._lock.locked()
+
+        assert not session_mock.requests
+
+    async def test_deadline_limits_dispatcher_slot(
+        self, session_mock: aioresponses
+    ) -> None:
+        dispatcher = TaipitPriorityDispatcher(1)
+        async with aiohttp.ClientSession() as session:
+            auth = SimpleTaipitAuth(
+                "user", "pass", session, token=make_token(), dispatcher=dispatcher
+            )
+            async with dispatcher.async_slot():
+                with taipit_deadline(0.01), pytest.raises(TaipitDeadlineExceeded):
+                    await auth.request("GET", "api/meter/list-all")
+                assert dispatcher.queue_depth() == 0
+        assert dispatcher.in_flight == 0
+
+        assert not session_mock.requests
+
+    async def test_endpoint_timeout_passed(
+        self, session_mock: aioresponses
+    ) -> None:
+        session_mock.get(f"{API_URL}/bmd/all?id=1", payload={})
+        timeout = ClientTimeout(total=60, connect=5)
+        async with aiohttp.ClientSession() as session:
+            auth = SimpleTaipitAuth(
+                "user",
+                "pass",
+                session,
+                token=make_token(),
+                timeout=ClientTimeout(total=10),
+                endpoint_timeouts={"api/bmd": timeout},
+            )
+            await auth.request("GET", "api/bmd/all", params={"id": 1})
+
+        (call,) = next(iter(session_mock.requests.values()))
+        assert call.kwargs["timeout"] == timeout
+
+    async def test_timeout_wrapped(self, session_mock: aioresponses) -> None:
+        session_mock.get(
+            f"{API_URL}/meter/list-all", exception=asyncio.TimeoutError()
+        )
+        async with aiohttp.ClientSession() as session:
+            auth = SimpleTaipitAuth("user", "pass", session, token=make_token())
+            with pytest.raises(TaipitTimeoutError):
+                await auth.request("GET", "api/meter/list-all")
@@ -0,0 +1,201 @@
+"""Tests for aiotaipit transport module."""
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import re
+import time
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from aioresponses import aioresponses
+from multidict import CIMultiDict, CIMultiDictProxy
+
+from aiotaipit import (
+    AbstractTaipitTransport,
+    AiohttpTransport,
+    HttpxTransport,
+    MemoryTransport,
+    RecordingTransport,
+    ReplayTransport,
+    SimpleTaipitAuth,
+    TaipitApi,
+    TaipitApiError,
+    TaipitResponse,
+    TaipitTimeoutError,
+)
+from aiotaipit.const import DEFAULT_BASE_URL, DEFAULT_TOKEN_URL
+from aiotaipit.transport import _mask_body, raise_for_status
+from tests.conftest import load_fixture
+
+TOKEN_URL_PATTERN = re.compile(
+    re.escape(f"{DEFAULT_BASE_URL}/{DEFAULT_TOKEN_URL}") + r"(\?.*)?"
+)
+API_URL = f"{DEFAULT_BASE_URL}/api"
+
+
+class TestRecordReplay:
+    async def test_record_and_replay(
+        self, tmp_path: Path, session_mock: aioresponses
+    ) -> None:
+        path = tmp_path / "traffic.ndjson.gz"
+        meters = load_fixture("meters_response.json")
+        readings = load_fixture("meter_readings_response.json")
+        session_mock.get(
+            TOKEN_URL_PATTERN, payload=load_fixture("token_response.json")
+        )
+        session_mock.get(f"{API_URL}/meter/list-all", payload=meters)
+        session_mock.get(f"{API_URL}/bmd/all?id=1", payload=readings)
+
+        async with aiohttp.ClientSession() as session:
+            recorder = RecordingTransport(AiohttpTransport(session), path)
+            api = TaipitApi(
+                SimpleTaipitAuth("user", "secret-password", None, transport=recorder)
+            )
+            assert await api.async_get_meters() == meters
+            assert await api.async_get_meter_readings(1) == readings
+            await recorder.async_close()
+
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            entries = [json.loads(line) for line in file]
+        assert len(entries) == 3
+        assert entries[0]["params"]["password"] == "***"
+        assert "secret-password" not in json.dumps(entries)
+        assert json.loads(entries[0]["body"])["access_token"] == "***"
+        assert "new_refresh_token" not in json.dumps(entries)
+        assert entries[2]["params"] == {"id": "1"}
+        assert entries[2]["elapsed"] >= 0
+
+        replay = ReplayTransport(path, time_scale=0)
+        api = TaipitApi(
+            SimpleTaipitAuth("user", "other-password", None, transport=replay)
+        )
+        assert await api.async_get_meters() == meters
+        assert await api.async_get_meter_readings(1) == readings
+        assert await api.async_get_meters() == meters
+        with pytest.raises(TaipitApiError):
+            await api.async_get_meter_readings(2)
+
+    async def test_replay_time_scale_and_status(self, tmp_path: Path) -> None:
+        path = tmp_path / "traffic.ndjson.gz"
+        entry = {
+            "method": "GET",
+            "url": "http://test/api/meter/list-all",
+            "params": {},
+            "offset": 0,
+            "elapsed": 0.2,
+            "status": 500,
+            "headers": {},
+            "body_b64": "AAE=",
+        }
+        with gzip.open(path, "wt", encoding="utf-8") as file:
+            file.write(json.dumps(entry) + "\n")
+
+        replay = ReplayTransport(path, time_scale=0.25)
+        started = time.monotonic()
+        response = await replay.async_request("get", entry["url"])
+        assert 0.04 <= time.monotonic() - started < 0.2
+        assert response.body == b"\x00\x01"
+
+        with pytest.raises(aiohttp.ClientResponseError) as err:
+            raise_for_status("GET", entry["url"], response)
+        assert err.value.status == 500
+        raise_for_status("GET", entry["url"], TaipitResponse(304, {}, b""))
+
+    async def test_record_repeated_headers(self, tmp_path: Path) -> None:
+        path = tmp_path / "traffic.ndjson.gz"
+        headers = CIMultiDict([("Set-Cookie", "a=1"), ("Set-Cookie", "b=2")])
+
+        class _CookieTransport(AbstractTaipitTransport):
+            async def async_request(
+                self, method: str, url: str, **kwargs: Any
+            ) -> TaipitResponse:
+                return TaipitResponse(200, CIMultiDictProxy(headers), b"[]")
+
+        recorder = RecordingTransport(_CookieTransport(), path)
+        await recorder.async_request("GET", "http://test/api")
+        await recorder.async_close()
+
+        replay = ReplayTransport(path, time_scale=0)
+        response = await replay.async_request("GET", "http://test/api")
+        assert response.headers.getall("set-cookie") == ["a=1", "b=2"]
+
+    def test_mask_body(self) -> None:
+        body = b'{"readings":  [1, 2]}'
+        assert _mask_body(body) is body
+        assert json.loads(_mask_body(b'{"access_token": "t", "a": 1}')) == {
+            "access_token": "***",
+            "a": 1,
+        }
+
+    def test_session_or_transport_required(self) -> None:
+        with pytest.raises(ValueError):
+            SimpleTaipitAuth("user", "password", None)
+
+
+class TestMemoryTransport:
+    async def test_requests(self) -> None:
+        transport = MemoryTransport()
+        transport.add(
+            "GET",
+            f"{DEFAULT_BASE_URL}/{DEFAULT_TOKEN_URL}",
+            payload=load_fixture("token_response.json"),
+        )
+        transport.add("GET", f"{API_URL}/meter/list-all", payload=[{"id": 1}])
+        transport.add("GET", f"{API_URL}/bmd/all", status=503)
+        api = TaipitApi(
+            SimpleTaipitAuth("user", "password", None, transport=transport)
+        )
+
+        assert await api.async_get_meters() == [{"id": 1}]
+        with pytest.raises(TaipitApiError, match="503"):
+            await api.async_get_meter_readings(1)
+        with pytest.raises(TaipitApiError, match="404"):
+            await api.async_get_tariff(1)
+        assert transport.requests[0][2]["password"] == "***"
+        assert transport.requests[2] == ("GET", f"{API_URL}/bmd/all", {"id": "1"})
+
+
+class TestHttpxTransport:
+    async def test_requests(self) -> None:
+        pytest.importorskip("httpx")
+
+        async def _meters(request: web.Request) -> web.Response:
+            assert request.headers["Authorization"] == "Bearer new_access_token"
+            return web.json_response([{"id": 1}])
+
+        async def _slow(request: web.Request) -> web.Response:
+            await asyncio.sleep(1)
+            return web.json_response({})
+
+        async def _token(request: web.Request) -> web.Response:
+            assert request.query["grant_type"] == "password"
+            return web.json_response(load_fixture("token_response.json"))
+
+        app = web.Application()
+        app.router.add_get(f"/{DEFAULT_TOKEN_URL}", _token)
+        app.router.add_get("/api/meter/list-all", _meters)
+        app.router.add_get("/api/bmd/all", _slow)
+
+        async with TestServer(app) as server:
+            transport = HttpxTransport()
+            auth = SimpleTaipitAuth(
+                "user",
+                "password",
+                None,
+                base_url=str(server.make_url("")).rstrip("/"),
+                transport=transport,
+                endpoint_timeouts={"api/bmd/all": aiohttp.ClientTimeout(total=0.1)},
+            )
+            api = TaipitApi(auth)
+            assert await api.async_get_meters() == [{"id": 1}]
+            with pytest.raises(TaipitTimeoutError):
+                await api.async_get_meter_readings(1)
+            with pytest.raises(TaipitApiError, match="404"):
+                await api.async_get_tariff(1)
+            await transport.async_close()